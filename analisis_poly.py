@@ -0,0 +1,333 @@
+"""
+Analizador de calidad de polinomios CRC
+Para un polinomio y varias longitudes de mensaje calcula la distribución de pesos de
+los patrones de error indetectables (las palabras código de peso 2..PESO_MAX), la
+distancia de Hamming mínima y la probabilidad de error no detectado en función de la
+BER. En lugar de enumerar patrones usa la tabla de síndromes s_i = x^i mod g y
+encuentro a mitad de camino sobre los pesos; los resultados se guardan en disco por
+(polinomio, longitud)
+"""
+import itertools
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+PESO_MAX = 4
+PESOS_SOPORTADOS = range(2, 7)
+# Costes máximos de los pesos 5 y 6 (pares en memoria / consultas por búsqueda binaria):
+# por encima se trunca la longitud analizada para ese peso
+LIMITE_PARES = 1 << 24
+LIMITE_CONSULTAS = 1 << 28
+_BITS_POSICION = 24  # las claves (síndrome << 24 | posición) admiten palabras de hasta 2^24 bits
+LONGITUDES_POR_DEFECTO = [8, 64, 256, 1500]  # bytes de mensaje (1500 = MTU Ethernet)
+BER_POR_DEFECTO = [1e-3, 1e-4, 1e-5, 1e-6, 1e-7]
+DIRECTORIO_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache_poly')
+
+
+@dataclass(frozen=True)
+class AnalisisPolinomio:
+    poly: int
+    bits_mensaje: int
+    pesos: dict  # peso -> número de palabras código (patrones indetectables); None = no calculado
+    ejemplo: tuple = None  # posiciones de un patrón indetectable de peso mínimo
+
+    @property
+    def grado(self) -> int:
+        return self.poly.bit_length() - 1
+
+    @property
+    def bits_palabra(self) -> int:
+        return self.bits_mensaje + self.grado
+
+    @property
+    def distancia_minima(self) -> int:
+        """Distancia de Hamming mínima, o cota inferior si no hay palabras de peso <= al máximo calculado."""
+        for peso in sorted(self.pesos):
+            if self.pesos[peso] is None:
+                return peso
+            if self.pesos[peso] > 0:
+                return peso
+        return max(self.pesos) + 1
+
+    @property
+    def distancia_exacta(self) -> bool:
+        d = self.distancia_minima
+        return self.pesos.get(d) is not None and self.pesos[d] > 0
+
+    @property
+    def truncado(self) -> bool:
+        """True si algún peso no se calculó para esta longitud (límites de coste)."""
+        return any(a is None for a in self.pesos.values())
+
+    def prob_no_detectado(self, p: float) -> float:
+        """P(error no detectado) en un BSC con BER `p`: suma de A_w p^w (1-p)^(n-w).
+
+        Solo incluye los pesos calculados, así que es una cota inferior; a BER baja
+        el término de peso mínimo domina.
+        """
+        n = self.bits_palabra
+        return sum(a * p ** w * (1 - p) ** (n - w) for w, a in self.pesos.items() if a)
+
+
+def sindromes(poly: int, n: int) -> np.ndarray:
+    """s_i = x^i mod g para i < n (el síndrome de un error en el bit i de la palabra)."""
+    grado = poly.bit_length() - 1
+    alto = 1 << grado
+    s = np.empty(n, dtype=np.uint64)
+    r = 1
+    for i in range(n):
+        s[i] = r
+        r <<= 1
+        if r & alto:
+            r ^= poly
+    return s
+
+
+def _claves(valores: np.ndarray, posiciones: np.ndarray) -> np.ndarray:
+    return (valores << np.uint64(_BITS_POSICION)) | posiciones.astype(np.uint64)
+
+
+def _contar(claves: np.ndarray, valores: np.ndarray, desde, hasta) -> np.ndarray:
+    """Cuántas claves tienen valor `valores` y posición en [desde, hasta)."""
+    return (np.searchsorted(claves, _claves(valores, np.asarray(hasta)))
+            - np.searchsorted(claves, _claves(valores, np.asarray(desde))))
+
+
+class IndiceSindromes:
+    """Tabla hash (direccionamiento abierto, en NumPy) síndrome -> primera posición.
+
+    Como g(0) = 1, x es invertible módulo g y s_i = s_j si y solo si i = j módulo el
+    periodo e de x: las apariciones de un síndrome forman la progresión p0 + k*e, así
+    que basta guardar p0 para contar en cualquier intervalo de posiciones.
+    """
+    _MULTIPLICADOR = np.uint64(0x9E3779B97F4A7C15)
+
+    def __init__(self, s: np.ndarray):
+        repeticiones = np.flatnonzero(s[1:] == s[0])
+        self.periodo = int(repeticiones[0]) + 1 if len(repeticiones) else len(s)
+        valores = s[:self.periodo]
+        self.bits = max(4, (2 * len(valores) - 1).bit_length())
+        self.claves = np.zeros(1 << self.bits, dtype=np.uint64)
+        self.posiciones = np.full(1 << self.bits, -1, dtype=np.int64)
+        pendientes = np.arange(len(valores), dtype=np.int64)
+        huecos = self._hash(valores)
+        while len(pendientes):
+            huecos &= (1 << self.bits) - 1
+            libres = self.posiciones[huecos] == -1
+            # entre los que caen en el mismo hueco libre entra el primero
+            _, primeros = np.unique(huecos, return_index=True)
+            entra = np.zeros(len(pendientes), dtype=bool)
+            entra[primeros] = True
+            entra &= libres
+            self.claves[huecos[entra]] = valores[pendientes[entra]]
+            self.posiciones[huecos[entra]] = pendientes[entra]
+            pendientes, huecos = pendientes[~entra], huecos[~entra] + 1
+
+    def _hash(self, valores: np.ndarray) -> np.ndarray:
+        return ((valores * self._MULTIPLICADOR) >> np.uint64(64 - self.bits)).astype(np.int64)
+
+    def primera_posicion(self, valores: np.ndarray) -> np.ndarray:
+        """p0 de cada valor (-1 si no es un síndrome)."""
+        resultado = np.full(len(valores), -1, dtype=np.int64)
+        pendientes = np.arange(len(valores))
+        huecos = self._hash(valores)
+        while len(pendientes):
+            huecos &= (1 << self.bits) - 1
+            posiciones = self.posiciones[huecos]
+            acierto = (posiciones >= 0) & (self.claves[huecos] == valores[pendientes])
+            resultado[pendientes[acierto]] = posiciones[acierto]
+            sigue = ~acierto & (posiciones >= 0)  # hueco ocupado por otra clave: siguiente hueco
+            pendientes, huecos = pendientes[sigue], huecos[sigue] + 1
+        return resultado
+
+    def contar(self, valores: np.ndarray, desde, hasta) -> np.ndarray:
+        """Cuántas posiciones i en [desde, hasta) tienen s_i == valor, para cada valor."""
+        p0 = self.primera_posicion(valores)
+        e = self.periodo
+        n = -((p0 - hasta) // e) + ((p0 - desde) // e)  # ceil((hasta-p0)/e) - ceil((desde-p0)/e)
+        return np.where(p0 >= 0, np.maximum(n, 0), 0)
+
+
+def limite_peso(peso: int, longitud: int) -> int:
+    """Mayor extensión (en bits) analizable para `peso` dentro de los límites de coste."""
+    if peso == 5:
+        return min(longitud, int((2 * LIMITE_PARES) ** 0.5))
+    if peso == 6:
+        return min(longitud, int((6 * LIMITE_CONSULTAS) ** (1 / 3)), int((2 * LIMITE_PARES) ** 0.5))
+    return longitud
+
+
+def espectro_extensiones(s: np.ndarray, peso: int, longitud: int) -> np.ndarray:
+    """N[D]: palabras código de `peso` con su primer bit en 0 y el último en D (D < longitud).
+
+    Toda palabra código es un desplazamiento de una que empieza en el bit 0, así que
+    A_w(n) = suma de N[D] * (n - D) para D < n. Con t_D = s_0 ^ s_D, N[D] cuenta los
+    subconjuntos de w-2 posiciones de (0, D) cuyos síndromes suman t_D:
+      w=3: un síndrome (búsqueda en IndiceSindromes)
+      w=4: pares, como síndrome(b) ^ síndrome(a < b) (encuentro a mitad de camino)
+      w=5/6: una o dos posiciones contra una tabla de pares ordenada
+    """
+    n = np.zeros(longitud, dtype=np.int64)
+    if longitud < peso:
+        return n
+    s = s[:longitud]
+    pos = np.arange(longitud, dtype=np.int64)
+    t = s ^ s[0]
+    if peso == 2:
+        n[1:] = t[1:] == 0
+        return n
+    if peso <= 4:
+        indice = IndiceSindromes(s)
+        if peso == 3:
+            n[2:] = indice.contar(t[2:], 1, pos[2:])
+            return n
+        for d in range(3, longitud):
+            n[d] = int(indice.contar(t[d] ^ s[2:d], 1, pos[2:d]).sum())
+        return n
+    # Pesos 5 y 6: tabla de pares (a < b) con clave síndrome(a) ^ síndrome(b) << 24 | b
+    b = np.concatenate([np.full(i - 1, i, dtype=np.int64) for i in range(2, longitud)])
+    a = np.concatenate([np.arange(1, i, dtype=np.int64) for i in range(2, longitud)])
+    pares = np.sort(_claves(s[a] ^ s[b], b))
+    del a, b
+    for d in range(4, longitud):
+        if peso == 5:
+            # el tercer bit c (3 <= c < d) con un par por debajo de él
+            n[d] = int(_contar(pares, t[d] ^ s[3:d], 0, pos[3:d]).sum())
+        else:
+            # dos bits c < e por encima del par (3 <= c < e < d)
+            total = 0
+            for e in range(4, d):
+                total += int(_contar(pares, t[d] ^ s[e] ^ s[3:e], 0, pos[3:e]).sum())
+            n[d] = total
+    return n
+
+
+def distribucion_pesos(extensiones: np.ndarray, n: int) -> int:
+    """A_w(n) a partir de N[D] (ver `espectro_extensiones`)."""
+    d = np.arange(min(n, len(extensiones)), dtype=np.int64)
+    return int((extensiones[:len(d)] * (n - d)).sum())
+
+
+def _buscar_ejemplo(s: np.ndarray, peso: int, extension: int) -> tuple:
+    """Posiciones de un patrón de `peso` que empieza en 0 y acaba en `extension`."""
+    objetivo = int(s[0] ^ s[extension])
+    internos = range(1, extension)
+    if peso == 2:
+        return (0, extension)
+    indice = {}
+    for i in internos:
+        indice.setdefault(int(s[i]), []).append(i)
+    if peso == 3:
+        return (0, indice[objetivo][0], extension)
+    # pesos 4..6: prefijos de peso-3 posiciones y el último interno por índice
+    for prefijo in itertools.combinations(internos, peso - 3):
+        resto = objetivo
+        for i in prefijo:
+            resto ^= int(s[i])
+        for c in indice.get(resto, []):
+            if c > prefijo[-1]:
+                return (0, *prefijo, c, extension)
+    return None
+
+
+def analizar_polinomio(poly: int, longitudes_bits: list, peso_max: int = PESO_MAX,
+                       cache: str = DIRECTORIO_CACHE) -> list:
+    """Analiza `poly` para cada longitud de mensaje (en bits) y devuelve un AnalisisPolinomio por longitud.
+
+    Las extensiones se calculan una sola vez hasta la palabra más larga pedida y
+    sirven para todas las longitudes. Si el polinomio tiene un número par de
+    términos (factor x+1) los pesos impares son 0 y no se calculan. Con `cache`
+    (directorio; None = sin caché) reutiliza los análisis ya hechos.
+    """
+    grado = poly.bit_length() - 1
+    if not 1 <= grado <= 32 or not poly & 1:
+        raise ValueError("El análisis requiere un polinomio de grado 1 a 32 con término independiente")
+    if peso_max not in PESOS_SOPORTADOS:
+        raise ValueError(f"peso_max debe estar entre {PESOS_SOPORTADOS[0]} y {PESOS_SOPORTADOS[-1]}")
+    resultados = {m: cargar_cache(cache, poly, m, peso_max) for m in longitudes_bits} if cache else {}
+    pendientes = [m for m in longitudes_bits if resultados.get(m) is None]
+    if pendientes:
+        longitud = max(pendientes) + grado
+        if longitud >= 1 << _BITS_POSICION:
+            raise ValueError("Palabra demasiado larga para el análisis")
+        s = sindromes(poly, longitud)
+        par = bin(poly).count('1') % 2 == 0
+        extensiones = {}
+        for peso in range(2, peso_max + 1):
+            if par and peso % 2:
+                extensiones[peso] = np.zeros(longitud, dtype=np.int64)
+            else:
+                extensiones[peso] = espectro_extensiones(s, peso, limite_peso(peso, longitud))
+        for m in pendientes:
+            n = m + grado
+            pesos = {w: distribucion_pesos(e, n) if n <= len(e) else None for w, e in extensiones.items()}
+            ejemplo = None
+            for w, e in extensiones.items():
+                if pesos[w]:
+                    ejemplo = _buscar_ejemplo(s, w, int(np.flatnonzero(e[:n])[0]))
+                    break
+            resultados[m] = AnalisisPolinomio(poly, m, pesos, ejemplo)
+            if cache:
+                guardar_cache(cache, resultados[m], peso_max)
+    return [resultados[m] for m in longitudes_bits]
+
+
+def _ruta_cache(directorio: str, poly: int, bits_mensaje: int) -> str:
+    return os.path.join(directorio, f"{poly:x}_{bits_mensaje}.json")
+
+
+def cargar_cache(directorio: str, poly: int, bits_mensaje: int, peso_max: int):
+    """Análisis guardado de (poly, longitud), o None si no existe o se calculó con menos pesos."""
+    try:
+        with open(_ruta_cache(directorio, poly, bits_mensaje), encoding='utf-8') as f:
+            datos = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if datos.get('peso_max', 0) < peso_max:
+        return None
+    pesos = {int(w): a for w, a in datos['pesos'].items() if int(w) <= peso_max}
+    ejemplo = tuple(datos['ejemplo']) if datos.get('ejemplo') else None
+    if ejemplo is not None and len(ejemplo) > peso_max:
+        ejemplo = None
+    return AnalisisPolinomio(poly, bits_mensaje, pesos, ejemplo)
+
+
+def guardar_cache(directorio: str, analisis: AnalisisPolinomio, peso_max: int):
+    """Guarda un análisis en `directorio` (un JSON por polinomio y longitud)."""
+    os.makedirs(directorio, exist_ok=True)
+    datos = {'poly': analisis.poly, 'bits_mensaje': analisis.bits_mensaje, 'peso_max': peso_max,
+             'pesos': {str(w): a for w, a in analisis.pesos.items()},
+             'ejemplo': list(analisis.ejemplo) if analisis.ejemplo else None}
+    with open(_ruta_cache(directorio, analisis.poly, analisis.bits_mensaje), 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+
+
+def imprimir_analisis(nombre: str, analisis: list, ber: list, tiempo_ms: float = None):
+    """Imprime la distancia mínima, la distribución de pesos y P(no detectado) por longitud."""
+    poly = analisis[0].poly if analisis else 0
+    cabecera = f"Análisis de {nombre} (0x{poly:X}, grado {poly.bit_length() - 1})"
+    if tiempo_ms is not None:
+        cabecera += f" en {tiempo_ms:.1f} ms"
+    print(cabecera)
+    pesos = sorted(analisis[0].pesos) if analisis else []
+    print(f"{'Mensaje':>12} {'Palabra':>8} {'HD':>4} " + " ".join(f"{f'A{w}':>14}" for w in pesos))
+    for a in analisis:
+        hd = f"{a.distancia_minima}" if a.distancia_exacta else f">={a.distancia_minima}"
+        columnas = " ".join(f"{'-' if a.pesos[w] is None else a.pesos[w]:>14}" for w in pesos)
+        print(f"{a.bits_mensaje // 8:>7} bytes {a.bits_palabra:8} {hd:>4} {columnas}")
+    print(f"\nP(error no detectado) por BER (cota 2^-r = {2.0 ** -(poly.bit_length() - 1):.2e}):")
+    print(f"{'Mensaje':>12} " + " ".join(f"{p:>11.0e}" for p in ber))
+    for a in analisis:
+        if a.distancia_exacta:
+            print(f"{a.bits_mensaje // 8:>7} bytes " + " ".join(f"{a.prob_no_detectado(p):11.3e}" for p in ber))
+        else:
+            print(f"{a.bits_mensaje // 8:>7} bytes   sin patrones de peso <= {max(a.pesos)} (aumentar --peso-max)")
+    print("Solo se suman los pesos calculados: con n*BER cerca de 1 o más es una cota inferior")
+    for a in analisis:
+        if a.ejemplo:
+            print(f"Patrón indetectable de peso {len(a.ejemplo)} en {a.bits_mensaje // 8} bytes: bits {list(a.ejemplo)}")
+            break
+    if any(a.truncado for a in analisis):
+        print("'-': peso no calculado a esa longitud (límites de coste); P(no detectado) es entonces una cota inferior")
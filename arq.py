@@ -0,0 +1,275 @@
+"""
+Simulador de enlace por eventos discretos con ARQ: parada y espera, retroceso N y repetición selectiva
+El emisor envía tramas con CRC por un enlace de tasa y retardo de propagación dados; el
+canal (BSC o Gilbert–Elliott) decide qué tramas llegan bien, cuáles descarta el CRC y
+cuáles pasan corruptas sin ser detectadas (canal.CanalTramas, por bloques en NumPy). Los
+eventos (fin de transmisión, llegada de trama, llegada de ACK, vencimiento de temporizador)
+son tuplas en un montículo heapq: no hay hilos ni tareas por trama, y los temporizadores
+cancelados no se sacan del montículo sino que se ignoran al vencer. Los ACK viajan por un
+canal de retorno sin errores y no compiten por el enlace de ida
+"""
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import canal
+from index import POLINOMIO_CRC
+
+PROTOCOLO_PARADA_ESPERA = 'sw'
+PROTOCOLO_RETROCESO_N = 'gbn'
+PROTOCOLO_REPETICION_SELECTIVA = 'sr'
+PROTOCOLOS = {
+    PROTOCOLO_PARADA_ESPERA: "Parada y espera",
+    PROTOCOLO_RETROCESO_N: "Retroceso N",
+    PROTOCOLO_REPETICION_SELECTIVA: "Repetición selectiva",
+}
+
+_ID_ARQ = 6  # espacio de semillas propio (ver canal._IDS_CODEC)
+# Resultados del canal que se generan de una vez
+TRAMAS_POR_BLOQUE = 1 << 16
+PERCENTILES = (50, 95, 99)
+
+# Tipos de evento (el orden de llegada desempata los eventos simultáneos)
+_FIN_TRANSMISION = 0
+_LLEGA_TRAMA = 1
+_LLEGA_ACK = 2
+_VENCE_TEMPORIZADOR = 3
+
+
+@dataclass(frozen=True)
+class ParametrosEnlace:
+    """Enlace punto a punto: tasa de la línea, retardo de propagación y formato de trama."""
+    tasa_bps: float = 10e6      # bits por segundo de la línea de ida
+    retardo_s: float = 0.25     # propagación en un sentido (satélite geoestacionario ~250 ms)
+    bytes_trama: int = 1024     # bytes de datos por trama (más el CRC)
+    bits_ack: int = 64          # tamaño del ACK en el canal de retorno
+    temporizador_s: float = None  # None: ida y vuelta + una trama (`temporizador`)
+
+    def __post_init__(self):
+        if self.tasa_bps <= 0 or self.retardo_s < 0 or self.bytes_trama < 1 or self.bits_ack < 0:
+            raise ValueError("El enlace necesita tasa > 0, retardo >= 0, tramas de al menos 1 byte y ACK >= 0 bits")
+        if self.temporizador_s is not None and self.temporizador_s <= 0:
+            raise ValueError("El temporizador de retransmisión debe ser positivo")
+
+    def tiempo_trama(self, grado_crc: int) -> float:
+        """Segundos que ocupa en la línea una trama con un CRC de `grado_crc` bits."""
+        return (8 * self.bytes_trama + grado_crc) / self.tasa_bps
+
+    @property
+    def tiempo_ack(self) -> float:
+        return self.bits_ack / self.tasa_bps
+
+    def temporizador(self, grado_crc: int) -> float:
+        """Espera desde el fin de una transmisión hasta retransmitir si no llega su ACK."""
+        if self.temporizador_s is not None:
+            return self.temporizador_s
+        return 2 * self.retardo_s + self.tiempo_ack + self.tiempo_trama(grado_crc)
+
+
+@dataclass(frozen=True)
+class ResultadoARQ:
+    """Contadores y latencias de una simulación de `simular`."""
+    protocolo: str
+    ventana: int
+    tramas: int
+    bits_datos_trama: int
+    transmisiones: int
+    descartadas: int          # copias recibidas que el CRC detectó como erróneas
+    no_detectadas: int        # tramas entregadas con errores que el CRC no vio
+    temporizadores: int       # vencimientos que provocaron retransmisión
+    eventos: int
+    tiempo_s: float           # tiempo simulado hasta la última entrega
+    tiempo_ms: float          # tiempo real de la simulación
+    latencias: np.ndarray = field(repr=False, compare=False)  # por trama: 1.ª transmisión -> entrega
+
+    @property
+    def retransmisiones(self) -> int:
+        return self.transmisiones - self.tramas
+
+    @property
+    def goodput_bps(self) -> float:
+        """Bits de datos entregados sin errores por segundo simulado."""
+        if self.tiempo_s == 0:
+            return 0.0
+        return (self.tramas - self.no_detectadas) * self.bits_datos_trama / self.tiempo_s
+
+    def percentil_latencia(self, q: float) -> float:
+        """Percentil `q` (0-100) de la latencia de entrega, en segundos."""
+        return float(np.percentile(self.latencias, q)) if len(self.latencias) else 0.0
+
+
+def _resultados_canal(canal_tramas: canal.CanalTramas):
+    """Resultado (canal.TRAMA_*) de cada transmisión sucesiva, generados por bloques."""
+    while True:
+        yield from canal_tramas.siguientes(TRAMAS_POR_BLOQUE).tolist()
+
+
+def simular(protocolo: str, n_tramas: int, enlace: ParametrosEnlace = ParametrosEnlace(), ventana: int = 8,
+            p: float = 0.0, parametros_canal: canal.ParametrosGilbertElliott = None,
+            poly: int = POLINOMIO_CRC, semilla: int = None) -> ResultadoARQ:
+    """Transfiere `n_tramas` tramas con `protocolo` y devuelve los contadores y latencias.
+
+    El emisor siempre tiene datos (fuente saturada): transmite en cuanto la línea queda
+    libre y la ventana lo permite. Parada y espera es la ventana de una trama. En
+    retroceso N el receptor solo acepta la trama esperada, confirma con ACK acumulativo
+    y un único temporizador (el de la trama más antigua) hace reenviar toda la ventana;
+    en repetición selectiva el receptor guarda las tramas fuera de orden dentro de la
+    ventana, cada trama tiene su ACK y su temporizador, y solo se reenvían las que
+    vencen. Los números de secuencia no se reducen módulo 2^k.
+
+    Args:
+        protocolo: PROTOCOLO_PARADA_ESPERA, PROTOCOLO_RETROCESO_N o PROTOCOLO_REPETICION_SELECTIVA
+        n_tramas: Tramas a entregar
+        enlace: Tasa, retardo, tamaño de trama y temporizador
+        ventana: Tramas sin confirmar como máximo (se ignora en parada y espera)
+        p: BER del canal binario simétrico (si no hay `parametros_canal`)
+        parametros_canal: Canal de Gilbert–Elliott en lugar del BSC
+        poly: Polinomio del CRC de cada trama
+        semilla: Semilla del canal (None = aleatoria)
+    """
+    if protocolo not in PROTOCOLOS:
+        raise ValueError(f"Protocolo desconocido: {protocolo} (use {', '.join(PROTOCOLOS)})")
+    if protocolo == PROTOCOLO_PARADA_ESPERA:
+        ventana = 1
+    if ventana < 1:
+        raise ValueError("La ventana debe ser de al menos una trama")
+    selectivo = protocolo == PROTOCOLO_REPETICION_SELECTIVA
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    grado = poly.bit_length() - 1
+    t_trama = enlace.tiempo_trama(grado)
+    retorno = enlace.tiempo_ack + enlace.retardo_s
+    retardo = enlace.retardo_s
+    espera = enlace.temporizador(grado)
+    rng = np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(_ID_ARQ,)))
+    siguiente_resultado = _resultados_canal(
+        canal.CanalTramas(8 * enlace.bytes_trama + grado, poly, p, parametros_canal, rng)).__next__
+    inicio = time.perf_counter()
+
+    eventos = []
+    orden = itertools.count()
+    primera = [None] * n_tramas  # inicio de la primera transmisión de cada trama
+    latencias = [0.0] * n_tramas
+    # Emisor
+    base = siguiente = 0               # más antigua sin confirmar / próxima nueva (o a reenviar en GBN)
+    confirmada = bytearray(n_tramas)   # SR: ACK recibido
+    intentos = [0] * n_tramas if selectivo else None  # SR: distingue temporizadores viejos
+    pendientes = deque()               # SR: tramas vencidas a reenviar
+    generacion = 0                     # GBN: el temporizador vigente es el de esta generación
+    temporizador_activo = False
+    linea_libre = True
+    # Receptor
+    esperada = 0
+    recibida = bytearray(n_tramas)     # SR: 1 + resultado de la copia guardada (0 = ninguna)
+    transmisiones = descartadas = no_detectadas = vencidos = procesados = 0
+    ahora = 0.0
+
+    def transmitir():
+        # Pone en la línea la próxima trama que toque, si la hay
+        nonlocal siguiente, linea_libre, transmisiones, descartadas, temporizador_activo
+        while pendientes and confirmada[pendientes[0]]:
+            pendientes.popleft()  # confirmada mientras esperaba su turno
+        if pendientes:
+            trama = pendientes.popleft()
+        elif siguiente < n_tramas and siguiente < base + ventana:
+            trama = siguiente
+            siguiente += 1
+        else:
+            return
+        if primera[trama] is None:
+            primera[trama] = ahora
+        transmisiones += 1
+        linea_libre = False
+        fin = ahora + t_trama
+        heapq.heappush(eventos, (fin, next(orden), _FIN_TRANSMISION, 0, 0))
+        resultado = siguiente_resultado()
+        if resultado == canal.TRAMA_DETECTADA:
+            descartadas += 1  # el receptor la descarta: no hace falta programar su llegada
+        else:
+            heapq.heappush(eventos, (fin + retardo, next(orden), _LLEGA_TRAMA, trama, resultado))
+        if selectivo:
+            intentos[trama] += 1
+            heapq.heappush(eventos, (fin + espera, next(orden), _VENCE_TEMPORIZADOR, trama, intentos[trama]))
+        elif not temporizador_activo:
+            temporizador_activo = True
+            heapq.heappush(eventos, (fin + espera, next(orden), _VENCE_TEMPORIZADOR, 0, generacion))
+
+    def entregar(trama, resultado):
+        nonlocal no_detectadas
+        latencias[trama] = ahora - primera[trama]
+        if resultado == canal.TRAMA_NO_DETECTADA:
+            no_detectadas += 1
+
+    if n_tramas:
+        transmitir()
+    while esperada < n_tramas:
+        ahora, _, tipo, trama, dato = heapq.heappop(eventos)
+        procesados += 1
+        if tipo == _FIN_TRANSMISION:
+            linea_libre = True
+        elif tipo == _LLEGA_TRAMA:
+            if selectivo:
+                if esperada <= trama < esperada + ventana and not recibida[trama]:
+                    recibida[trama] = 1 + dato
+                    while esperada < n_tramas and recibida[esperada]:
+                        entregar(esperada, recibida[esperada] - 1)
+                        esperada += 1
+                ack = trama
+            else:
+                if trama == esperada:
+                    entregar(trama, dato)
+                    esperada += 1
+                ack = esperada  # acumulativo: todas las anteriores recibidas
+            heapq.heappush(eventos, (ahora + retorno, next(orden), _LLEGA_ACK, ack, 0))
+        elif tipo == _LLEGA_ACK:
+            if selectivo:
+                confirmada[trama] = 1
+                while base < siguiente and confirmada[base]:
+                    base += 1
+            elif trama > base:
+                base = trama
+                generacion += 1
+                temporizador_activo = base < siguiente
+                if temporizador_activo:
+                    heapq.heappush(eventos, (ahora + espera, next(orden), _VENCE_TEMPORIZADOR, 0, generacion))
+        elif selectivo:
+            if not confirmada[trama] and dato == intentos[trama]:
+                vencidos += 1
+                pendientes.append(trama)
+        elif dato == generacion:
+            # Retroceso N: se vuelve a enviar desde la más antigua sin confirmar
+            vencidos += 1
+            generacion += 1
+            temporizador_activo = False
+            siguiente = base
+        if linea_libre:
+            transmitir()
+
+    return ResultadoARQ(
+        protocolo=protocolo, ventana=ventana, tramas=n_tramas, bits_datos_trama=8 * enlace.bytes_trama,
+        transmisiones=transmisiones, descartadas=descartadas, no_detectadas=no_detectadas,
+        temporizadores=vencidos, eventos=procesados, tiempo_s=ahora,
+        tiempo_ms=(time.perf_counter() - inicio) * 1000.0, latencias=np.array(latencias))
+
+
+def ventana_minima(enlace: ParametrosEnlace, poly: int = POLINOMIO_CRC) -> int:
+    """Tramas que caben en un ida y vuelta: la ventana con la que la línea no se detiene sin errores."""
+    grado = poly.bit_length() - 1
+    t_trama = enlace.tiempo_trama(grado)
+    return int(np.ceil((t_trama + 2 * enlace.retardo_s + enlace.tiempo_ack) / t_trama))
+
+
+def imprimir_resultados(resultados: list, enlace: ParametrosEnlace):
+    """Una fila por simulación: retransmisiones, goodput, eficiencia y percentiles de latencia."""
+    print(f"{'Protocolo':22} {'Ventana':>7} {'Transm.':>10} {'Retransm.':>10} {'Venc.':>8} {'Descart.':>9} "
+          f"{'No det.':>7} {'Goodput Mb/s':>12} {'Efic.':>6} "
+          + " ".join(f"{f'p{q} ms':>9}" for q in PERCENTILES) + f" {'Eventos/s':>10}")
+    for r in resultados:
+        eventos_s = r.eventos / (r.tiempo_ms / 1000.0) if r.tiempo_ms else 0.0
+        print(f"{PROTOCOLOS[r.protocolo]:22} {r.ventana:7d} {r.transmisiones:10d} {r.retransmisiones:10d} "
+              f"{r.temporizadores:8d} {r.descartadas:9d} {r.no_detectadas:7d} {r.goodput_bps / 1e6:12.3f} "
+              f"{r.goodput_bps / enlace.tasa_bps * 100:5.1f}% "
+              + " ".join(f"{r.percentil_latencia(q) * 1000:9.1f}" for q in PERCENTILES) + f" {eventos_s:10.0f}")
@@ -0,0 +1,525 @@
+"""
+Suite de benchmarks de rendimiento para CRC y Hamming(12,8)
+Mide cada implementación (bit a bit, tabla, vectorizada con NumPy y paralela) sobre
+entradas de tamaño realista, con calentamiento, repeticiones y estadísticas
+(mediana, p95, MB/s, ns/byte), separando codificar, inyectar y decodificar.
+Los resultados se guardan en JSON y se comparan con una línea base
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import index
+import modelos_crc
+
+try:
+    import numpy as np
+    import canal
+    import paralelo
+    import vectorizado
+except ImportError:  # las implementaciones vectorizada y paralela requieren numpy
+    np = None
+
+CODEC_CRC = 'crc'
+CODEC_HAMMING = 'ham'
+CODEC_MENSAJE = 'crc_mensaje'  # CRC de un mensaje largo: tabla vs slicing-by-N
+CODECS = [CODEC_CRC, CODEC_HAMMING, CODEC_MENSAJE]
+
+IMPL_BIT_A_BIT = 'bit_a_bit'
+IMPL_TABLA = 'tabla'
+IMPL_VECTORIZADO = 'vectorizado'
+IMPL_PARALELO = 'paralelo'
+IMPLEMENTACIONES = [IMPL_BIT_A_BIT, IMPL_TABLA, IMPL_VECTORIZADO, IMPL_PARALELO]
+# Solo crc_mensaje: algoritmo estándar del catálogo con la tabla en Python o con la rutina en C
+IMPL_MODELO_PYTHON = 'modelo-python'
+IMPL_MODELO_C = 'modelo-c'
+
+ETAPA_CODIFICAR = 'codificar'
+ETAPA_INYECTAR = 'inyectar'
+ETAPA_DECODIFICAR = 'decodificar'
+ETAPA_TOTAL = 'total'
+ETAPAS = [ETAPA_CODIFICAR, ETAPA_INYECTAR, ETAPA_DECODIFICAR, ETAPA_TOTAL]
+
+TAMANOS_POR_DEFECTO = [64 * 1024, 1024 * 1024, 8 * 1024 * 1024]
+# Tamaño máximo por implementación escalar (las demás no tienen límite): por encima
+# el tiempo de la suite lo dominarían los bucles de Python sin aportar información
+LIMITE_BYTES = {IMPL_BIT_A_BIT: 64 * 1024, IMPL_TABLA: 1024 * 1024}
+UMBRAL_REGRESION = 0.10
+SEMILLA_BENCH = 12345
+
+# Campos que identifican una medición al compararla con la línea base
+CLAVE_MEDICION = ('codec', 'implementacion', 'etapa', 'tamano')
+
+
+def medir_repeticiones(funcion, repeticiones: int = 5, calentamiento: int = 1, detener=None) -> list:
+    """Ejecuta `funcion` `calentamiento` veces sin medir y devuelve los tiempos (s) de `repeticiones`.
+
+    Con `detener` (threading.Event) se deja de ejecutar entre repeticiones en cuanto se activa.
+    """
+    for _ in range(calentamiento):
+        if detener is not None and detener.is_set():
+            return []
+        funcion()
+    tiempos = []
+    for _ in range(max(1, repeticiones)):
+        if detener is not None and detener.is_set():
+            break
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def percentil(valores: list, p: float) -> float:
+    """Percentil `p` (0..100) por rango más cercano."""
+    ordenados = sorted(valores)
+    rango = max(1, math.ceil(p / 100.0 * len(ordenados)))
+    return ordenados[rango - 1]
+
+
+def estadisticas(tiempos: list, n_bytes: int) -> dict:
+    """Mediana, p95, mínimo (ms), MB/s y ns/byte de una serie de tiempos en segundos."""
+    ordenados = sorted(tiempos)
+    mitad = len(ordenados) // 2
+    mediana = ordenados[mitad] if len(ordenados) % 2 else (ordenados[mitad - 1] + ordenados[mitad]) / 2
+    return {
+        'repeticiones': len(tiempos),
+        'mediana_ms': mediana * 1000.0,
+        'p95_ms': percentil(ordenados, 95) * 1000.0,
+        'min_ms': ordenados[0] * 1000.0,
+        'mb_s': n_bytes / mediana / (1024 * 1024) if mediana > 0 else 0.0,
+        'ns_byte': mediana * 1e9 / n_bytes if n_bytes else 0.0,
+    }
+
+
+def datos_prueba(tamano: int, semilla: int = SEMILLA_BENCH) -> bytes:
+    """Entrada reproducible de `tamano` bytes aleatorios."""
+    return random.Random(semilla).getrandbits(8 * tamano).to_bytes(tamano, 'little') if tamano else b''
+
+
+def _estado_vacio(n: int) -> dict:
+    return {
+        'crc': {'total': n, 'procesados': 0, 'detectados': 0, 'no_detectados': 0, 'tiempo_ms': 0.0},
+        'ham': {'total': n, 'procesados': 0, 'corregidos': 0, 'no_corregibles': 0, 'correctos': 0, 'tiempo_ms': 0.0},
+    }
+
+
+def disponible(implementacion: str) -> bool:
+    """Indica si `implementacion` puede ejecutarse (vectorizado y paralelo requieren numpy)."""
+    return np is not None or implementacion not in (IMPL_VECTORIZADO, IMPL_PARALELO)
+
+
+def etapas_crc(implementacion: str, datos: bytes, poly: int, tipo_error: str, semilla: int,
+               executor: ProcessPoolExecutor = None, parametros_canal=None) -> dict:
+    """Devuelve {etapa: función sin argumentos} para el CRC por byte de `implementacion`.
+
+    Cada etapa trabaja sobre la salida precalculada de la anterior, así que los
+    tiempos no se mezclan: 'inyectar' incluye generar las máscaras (coste del
+    canal) y 'decodificar' solo la verificación. 'total' es el motor completo
+    equivalente (index.procesar_crc, vectorizado.procesar_crc_lote o
+    paralelo.ejecutar_paralelo); la implementación paralela solo tiene 'total'.
+    `parametros_canal` solo se usa con TIPO_ERROR_GILBERT.
+    """
+    degree = poly.bit_length() - 1
+    ancho = 8 + degree
+    lock = threading.Lock()
+    if implementacion == IMPL_PARALELO:
+        return {ETAPA_TOTAL: lambda: paralelo.ejecutar_paralelo(datos, paralelo.CODEC_CRC, poly=poly, tipo_error=tipo_error,
+                                                                 semilla=semilla, executor=executor,
+                                                                 parametros_canal=parametros_canal)}
+    if implementacion == IMPL_VECTORIZADO:
+        arreglo = np.frombuffer(datos, dtype=np.uint8)
+        tabla = vectorizado.tabla_crc_np(poly)
+        tipo = tabla.dtype.type
+        mascara_crc = tipo((1 << degree) - 1)
+
+        def codificar():
+            return (arreglo.astype(tipo) << tipo(degree)) | np.take(tabla, arreglo)
+
+        paquetes = codificar()
+
+        def inyectar():
+            bloques = list(canal.bloques_mascaras(tipo_error, ancho, len(paquetes), canal.CODEC_CRC, semilla,
+                                                  parametros_canal))
+            return paquetes ^ (np.concatenate(bloques) if bloques else np.zeros(0, dtype=tipo))
+
+        recibidos = inyectar()
+
+        def decodificar():
+            return int(np.count_nonzero(np.take(tabla, recibidos >> tipo(degree)) != (recibidos & mascara_crc)))
+
+        def total():
+            return vectorizado.procesar_crc_lote(datos, _estado_vacio(len(datos)), lock, poly=poly,
+                                                 tipo_error=tipo_error, semilla=semilla,
+                                                 parametros_canal=parametros_canal)
+
+    else:
+        usar_tabla = implementacion == IMPL_TABLA
+        if usar_tabla and not 8 <= degree <= 32:
+            return {}  # sin tabla por byte para este grado: procesar_crc usaría la división larga
+        tabla = index.obtener_tabla_crc(poly) if usar_tabla else None
+        mascara_crc = (1 << degree) - 1
+
+        if usar_tabla:
+            def codificar():
+                return [(b << degree) | tabla[b] for b in datos]
+
+            def verificar(recibidos):
+                return sum(1 for r in recibidos if tabla[r >> degree] != (r & mascara_crc))
+        else:
+            def codificar():
+                return [(b << degree) | index.calcular_crc(b, poly=poly, usar_tabla=False) for b in datos]
+
+            def verificar(recibidos):
+                return sum(1 for r in recibidos if not index.verificar_crc(r, poly=poly, usar_tabla=False))
+
+        paquetes = codificar()
+
+        def inyectar():
+            return inyectar_lista(paquetes, ancho, tipo_error, semilla, CODEC_CRC, parametros_canal)
+
+        recibidos = inyectar()
+
+        def decodificar():
+            return verificar(recibidos)
+
+        if usar_tabla:
+            def total():
+                return index.procesar_crc(datos, _estado_vacio(len(datos)), lock, poly=poly,
+                                          tipo_error=tipo_error, parametros_canal=parametros_canal, semilla=semilla)
+        else:
+            def total():
+                return verificar(inyectar_lista(codificar(), ancho, tipo_error, semilla, CODEC_CRC, parametros_canal))
+
+    return {ETAPA_CODIFICAR: codificar, ETAPA_INYECTAR: inyectar, ETAPA_DECODIFICAR: decodificar, ETAPA_TOTAL: total}
+
+
+def inyectar_lista(palabras: list, ancho: int, tipo_error: str, semilla: int, codec: str,
+                   parametros_canal=None) -> list:
+    """Aplica a `palabras` las máscaras de `index.fuente_mascaras` (versión escalar del canal)."""
+    mascaras = index.fuente_mascaras(tipo_error, ancho, len(palabras), codec, semilla, parametros_canal)
+    return [p ^ m for p, m in zip(palabras, mascaras)]
+
+
+def etapas_hamming(implementacion: str, datos: bytes, tipo_error: str, semilla: int,
+                   executor: ProcessPoolExecutor = None, parametros_canal=None) -> dict:
+    """Equivalente de `etapas_crc` para Hamming(12,8)."""
+    lock = threading.Lock()
+    if implementacion == IMPL_PARALELO:
+        return {ETAPA_TOTAL: lambda: paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=tipo_error,
+                                                                 semilla=semilla, executor=executor,
+                                                                 parametros_canal=parametros_canal)}
+    if implementacion == IMPL_VECTORIZADO:
+        arreglo = np.frombuffer(datos, dtype=np.uint8)
+        tabla_cod, tabla_datos, tabla_estado = vectorizado.tablas_hamming_np()
+
+        def codificar():
+            return np.take(tabla_cod, arreglo)
+
+        codigos = codificar()
+
+        def inyectar():
+            bloques = list(canal.bloques_mascaras(tipo_error, 12, len(codigos), canal.CODEC_HAMMING, semilla,
+                                                  parametros_canal))
+            return codigos ^ (np.concatenate(bloques) if bloques else np.zeros(0, dtype=np.uint16))
+
+        recibidos = inyectar()
+
+        def decodificar():
+            return np.take(tabla_datos, recibidos), np.take(tabla_estado, recibidos)
+
+        def total():
+            return vectorizado.procesar_hamming_lote(datos, _estado_vacio(len(datos)), lock,
+                                                     tipo_error=tipo_error, semilla=semilla,
+                                                     parametros_canal=parametros_canal)
+
+    else:
+        usar_tabla = implementacion == IMPL_TABLA
+        tabla_cod = index.tabla_codificacion_hamming()
+        tabla_dec = index.tabla_decodificacion_hamming()
+
+        if usar_tabla:
+            def codificar():
+                return [tabla_cod[b] for b in datos]
+
+            def decodificar_palabras(recibidos):
+                return [tabla_dec[r] for r in recibidos]
+        else:
+            def codificar():
+                return [index.codificar_hamming(b) for b in datos]
+
+            def decodificar_palabras(recibidos):
+                return [index.decodificar_corregir_hamming(r) for r in recibidos]
+
+        codigos = codificar()
+
+        def inyectar():
+            return inyectar_lista(codigos, 12, tipo_error, semilla, CODEC_HAMMING, parametros_canal)
+
+        recibidos = inyectar()
+
+        def decodificar():
+            return decodificar_palabras(recibidos)
+
+        if usar_tabla:
+            def total():
+                return index.procesar_hamming(datos, _estado_vacio(len(datos)), lock, tipo_error=tipo_error,
+                                              parametros_canal=parametros_canal, semilla=semilla)
+        else:
+            def total():
+                return decodificar_palabras(inyectar_lista(codificar(), 12, tipo_error, semilla, CODEC_HAMMING,
+                                                           parametros_canal))
+
+    return {ETAPA_CODIFICAR: codificar, ETAPA_INYECTAR: inyectar, ETAPA_DECODIFICAR: decodificar, ETAPA_TOTAL: total}
+
+
+def modelo_acelerado(poly: int):
+    """Algoritmo del catálogo con este polinomio y rutina en C (None si no hay)."""
+    return next((m for m in modelos_crc.CATALOGO_CRC.values()
+                 if m.polinomio == poly and m.backend != modelos_crc.BACKEND_PYTHON), None)
+
+
+def etapas_mensaje(implementacion: str, datos: bytes, poly: int) -> dict:
+    """CRC de `datos` como un único mensaje: bit a bit, tabla o slicing-by-N ('slicing-4/8/16').
+
+    Las implementaciones en Python no delegan en C; 'modelo-python' y 'modelo-c'
+    miden el algoritmo del catálogo con rutina en C para `poly`, si lo hay.
+    """
+    if implementacion in (IMPL_MODELO_PYTHON, IMPL_MODELO_C):
+        modelo = modelo_acelerado(poly)
+        if modelo is None:
+            return {}
+        acelerado = implementacion == IMPL_MODELO_C
+        return {ETAPA_TOTAL: lambda: modelo.calcular(datos, acelerado)}
+    if implementacion == IMPL_BIT_A_BIT:
+        return {ETAPA_TOTAL: lambda: index._crc_mensaje_bit_a_bit(datos, poly)}
+    if implementacion == IMPL_TABLA:
+        return {ETAPA_TOTAL: lambda: index.crc_mensaje(datos, poly, acelerado=False)}
+    n = int(implementacion.split('-')[1])
+    return {ETAPA_TOTAL: lambda: index.crc_mensaje_slicing(datos, poly, n, acelerado=False)}
+
+
+def implementaciones_codec(codec: str) -> list:
+    if codec == CODEC_MENSAJE:
+        return [IMPL_BIT_A_BIT, IMPL_TABLA, 'slicing-4', 'slicing-8', 'slicing-16',
+                IMPL_MODELO_PYTHON, IMPL_MODELO_C]
+    return IMPLEMENTACIONES
+
+
+def ejecutar_suite(tamanos: list = None, codecs: list = None, implementaciones: list = None,
+                   etapas: list = None, poly: int = None, tipo_error: str = index.TIPO_ERROR_UN_BIT,
+                   repeticiones: int = 5, calentamiento: int = 1, semilla: int = SEMILLA_BENCH,
+                   trabajadores: int = None, sin_limites: bool = False, datos: bytes = None,
+                   parametros_canal=None, informar=None, detener=None) -> list:
+    """Mide cada (codec, implementación, etapa, tamaño) y devuelve una fila por medición.
+
+    Args:
+        tamanos: Tamaños de entrada en bytes (por defecto TAMANOS_POR_DEFECTO)
+        codecs, implementaciones, etapas: Filtros (None = todos)
+        poly: Polinomio CRC (por defecto CRC-8 para 'crc' y CRC-32 para 'crc_mensaje')
+        semilla: Fija la entrada y las máscaras de error (mismas entre ejecuciones)
+        sin_limites: No aplicar LIMITE_BYTES a las implementaciones escalares
+        datos: Entrada explícita (sustituye a `tamanos`)
+        parametros_canal: Parámetros de TIPO_ERROR_GILBERT (None = valores por defecto)
+        informar: Función opcional llamada con cada fila al terminar de medirla
+        detener: threading.Event opcional; si se activa, la suite para entre repeticiones
+            y devuelve las filas completas medidas hasta entonces
+    """
+    codecs = codecs or CODECS
+    entradas = [datos] if datos is not None else [datos_prueba(t, semilla) for t in (tamanos or TAMANOS_POR_DEFECTO)]
+    usa_paralelo = np is not None and (implementaciones is None or IMPL_PARALELO in implementaciones) \
+        and any(c != CODEC_MENSAJE for c in codecs)
+    executor = ProcessPoolExecutor(max_workers=trabajadores or os.cpu_count()) if usa_paralelo else None
+    filas = []
+    try:
+        for entrada in entradas:
+            for codec in codecs:
+                for implementacion in implementaciones_codec(codec):
+                    if implementaciones is not None and implementacion not in implementaciones \
+                            and implementacion in IMPLEMENTACIONES:
+                        continue
+                    if not disponible(implementacion):
+                        continue
+                    limite = LIMITE_BYTES.get(implementacion)
+                    if limite is not None and len(entrada) > limite and not sin_limites:
+                        continue
+                    if codec == CODEC_CRC:
+                        funciones = etapas_crc(implementacion, entrada, poly or index.POLINOMIO_CRC,
+                                               tipo_error, semilla, executor, parametros_canal)
+                    elif codec == CODEC_HAMMING:
+                        funciones = etapas_hamming(implementacion, entrada, tipo_error, semilla, executor, parametros_canal)
+                    else:
+                        funciones = etapas_mensaje(implementacion, entrada, poly or index.POLINOMIOS_CRC['CRC-32'])
+                    for etapa, funcion in funciones.items():
+                        if etapas is not None and etapa not in etapas:
+                            continue
+                        tiempos = medir_repeticiones(funcion, repeticiones, calentamiento, detener)
+                        if detener is not None and detener.is_set():
+                            return filas
+                        fila = {'codec': codec, 'implementacion': implementacion, 'etapa': etapa,
+                                'tamano': len(entrada), **estadisticas(tiempos, len(entrada))}
+                        filas.append(fila)
+                        if informar is not None:
+                            informar(fila)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return filas
+
+
+def metadatos(semilla: int = SEMILLA_BENCH, tipo_error: str = index.TIPO_ERROR_UN_BIT) -> dict:
+    """Entorno de la medición, guardado junto a los resultados."""
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__ if np is not None else None,
+        'plataforma': platform.platform(),
+        'nucleos': os.cpu_count(),
+        'semilla': semilla,
+        'tipo_error': tipo_error,
+    }
+
+
+def guardar_resultados(filas: list, ruta: str, meta: dict = None):
+    """Guarda las mediciones (y los metadatos) en JSON."""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump({'meta': meta or metadatos(), 'resultados': filas}, f, indent=2)
+
+
+def cargar_resultados(ruta: str) -> list:
+    """Lee las mediciones de un JSON de `guardar_resultados`."""
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)['resultados']
+
+
+def comparar(filas: list, base: list, umbral: float = UMBRAL_REGRESION) -> list:
+    """Compara la mediana de cada medición con la de la línea base.
+
+    Returns:
+        Una fila por medición presente en ambas, con 'base_ms', 'actual_ms',
+        'cambio' (fracción, positivo = más lento) y 'regresion' (cambio > umbral).
+    """
+    referencia = {tuple(f[c] for c in CLAVE_MEDICION): f for f in base}
+    comparacion = []
+    for fila in filas:
+        anterior = referencia.get(tuple(fila[c] for c in CLAVE_MEDICION))
+        if anterior is None or anterior['mediana_ms'] <= 0:
+            continue
+        cambio = fila['mediana_ms'] / anterior['mediana_ms'] - 1.0
+        comparacion.append({**{c: fila[c] for c in CLAVE_MEDICION}, 'base_ms': anterior['mediana_ms'],
+                            'actual_ms': fila['mediana_ms'], 'cambio': cambio, 'regresion': cambio > umbral})
+    return comparacion
+
+
+def formatear_tamano(n: int) -> str:
+    for unidad, factor in (('MiB', 1 << 20), ('KiB', 1 << 10)):
+        if n >= factor and n % factor == 0:
+            return f"{n // factor} {unidad}"
+    return f"{n} B"
+
+
+def imprimir_encabezado():
+    print(f"{'Codec':12} {'Implementación':14} {'Etapa':12} {'Tamaño':>9} {'Mediana ms':>11} "
+          f"{'p95 ms':>10} {'MB/s':>9} {'ns/byte':>9}")
+
+
+def imprimir_fila(fila: dict):
+    print(f"{fila['codec']:12} {fila['implementacion']:14} {fila['etapa']:12} {formatear_tamano(fila['tamano']):>9} "
+          f"{fila['mediana_ms']:11.3f} {fila['p95_ms']:10.3f} {fila['mb_s']:9.2f} {fila['ns_byte']:9.1f}")
+
+
+def imprimir_comparacion(comparacion: list, umbral: float):
+    print(f"\nComparación con la línea base (umbral de regresión: +{umbral * 100:.0f}%)")
+    for c in comparacion:
+        marca = "REGRESIÓN" if c['regresion'] else ""
+        print(f"{c['codec']:12} {c['implementacion']:14} {c['etapa']:12} {formatear_tamano(c['tamano']):>9} "
+              f"{c['base_ms']:11.3f} -> {c['actual_ms']:11.3f} ms {c['cambio'] * 100:+7.1f}% {marca}")
+
+
+def _tamano(texto: str) -> int:
+    """Convierte '64K', '1M', '8MiB' o '4096' a bytes."""
+    s = texto.strip().upper().removesuffix('IB').removesuffix('B')
+    factores = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    if s and s[-1] in factores:
+        return int(float(s[:-1]) * factores[s[-1]])
+    return int(float(s))
+
+
+def crear_parser(parser: argparse.ArgumentParser = None) -> argparse.ArgumentParser:
+    """Opciones de la suite (también usadas por el subcomando `index.py bench`)."""
+    if parser is None:
+        parser = argparse.ArgumentParser(description="Suite de benchmarks CRC / Hamming por implementación y etapa")
+        parser.add_argument("--poly", type=str, default=None, choices=list(index.POLINOMIOS_CRC),
+                            help="Polinomio CRC (por defecto CRC-8 por byte y CRC-32 para crc_mensaje)")
+    parser.add_argument("--tamanos", type=_tamano, nargs="+", default=None,
+                        help="Tamaños de entrada (ej. 64K 1M 8M; por defecto 64K 1M 8M)")
+    parser.add_argument("--codecs", nargs="+", choices=CODECS, default=None, help="Codecs a medir (por defecto todos)")
+    parser.add_argument("--implementaciones", nargs="+", choices=IMPLEMENTACIONES, default=None,
+                        help="Implementaciones a medir (por defecto todas las disponibles)")
+    parser.add_argument("--etapas", nargs="+", choices=ETAPAS, default=None, help="Etapas a medir (por defecto todas)")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones medidas por etapa")
+    parser.add_argument("--calentamiento", type=int, default=1, help="Ejecuciones previas sin medir")
+    parser.add_argument("--error-type", type=str, default=index.TIPO_ERROR_UN_BIT,
+                        choices=[index.TIPO_ERROR_UN_BIT, index.TIPO_ERROR_DOS_BITS, index.TIPO_ERROR_RAFAGA,
+                                 index.TIPO_ERROR_GILBERT],
+                        help="Modelo de error de la etapa inyectar")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos de la implementación paralela")
+    parser.add_argument("--sin-limites", action="store_true",
+                        help="Mide también las implementaciones escalares en tamaños por encima de su límite")
+    parser.add_argument("--json", type=str, default=None, help="Guarda los resultados en este archivo JSON")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="JSON de una ejecución anterior: sale con código 1 si alguna mediana empeora más que --umbral")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION,
+                        help="Empeoramiento relativo tolerado frente a la línea base (0.10 = 10%%)")
+    return parser
+
+
+def ejecutar(args, poly: int = None, datos: bytes = None, parametros_canal=None) -> int:
+    """Ejecuta la suite con las opciones de `crear_parser` y devuelve el código de salida."""
+    if args.implementaciones and not all(disponible(i) for i in args.implementaciones):
+        print("Las implementaciones vectorizado y paralelo requieren numpy (pip install numpy).")
+        return 2
+    if args.error_type == index.TIPO_ERROR_GILBERT and np is None:
+        print("El canal de Gilbert–Elliott requiere numpy (pip install numpy).")
+        return 2
+    base = None
+    if args.baseline:
+        try:
+            base = cargar_resultados(args.baseline)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"No se puede leer la línea base: {e}")
+            return 2
+    imprimir_encabezado()
+    filas = ejecutar_suite(args.tamanos, args.codecs, args.implementaciones, args.etapas, poly=poly,
+                           tipo_error=args.error_type, repeticiones=args.repeticiones,
+                           calentamiento=args.calentamiento, trabajadores=args.trabajadores,
+                           sin_limites=args.sin_limites, datos=datos, parametros_canal=parametros_canal,
+                           informar=imprimir_fila)
+    if args.json:
+        guardar_resultados(filas, args.json, metadatos(tipo_error=args.error_type))
+        print(f"Resultados guardados en {args.json}")
+    if base is not None:
+        comparacion = comparar(filas, base, args.umbral)
+        imprimir_comparacion(comparacion, args.umbral)
+        regresiones = sum(c['regresion'] for c in comparacion)
+        if regresiones:
+            print(f"{regresiones} regresiones por encima del umbral")
+            return 1
+        print("Sin regresiones")
+    return 0
+
+
+def main(argv: list = None) -> int:
+    args = crear_parser().parse_args(argv)
+    return ejecutar(args, poly=index.POLINOMIOS_CRC[args.poly] if args.poly else None)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,519 @@
+"""
+Inyección de errores por lotes, modelos de canal y barrido de BER para CRC vs Hamming(12,8)
+Las máscaras de error de todos los modelos (`TIPO_ERROR_*`) se generan por bloques con
+un `numpy.random.Generator` y los codecs las consumen como arreglo o como iterador.
+Canal binario simétrico (BSC): cada bit transmitido se invierte de forma independiente
+con probabilidad p. Canal de Gilbert–Elliott: dos estados (bueno / malo) con su propia
+BER que producen ráfagas de longitud aleatoria a lo largo de todo el flujo de bits.
+Las posiciones de error se generan en bloque a partir de saltos geométricos, sin una
+llamada al generador por bit
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+import index
+from index import POLINOMIO_CRC, TIPO_ERROR_GILBERT
+
+CODEC_CRC = 'crc'
+CODEC_HAMMING = 'ham'
+CODEC_RS = 'rs'  # Reed–Solomon, ver reed_solomon.py
+CODEC_CONV = 'conv'  # convolucional, ver convolucional.py
+_IDS_CODEC = {CODEC_CRC: 0, CODEC_HAMMING: 1, CODEC_RS: 4, CODEC_CONV: 5}  # 2, 3, 6 y 7: barrido BSC, hamming.py, arq.py y tramas.py
+# Primer elemento de la spawn_key de los barridos: separa sus flujos de los de paralelo.py
+_ID_BARRIDO_BSC = 2
+
+# Máscaras generadas por bloque al consumirlas como iterador
+TAMANO_BLOQUE_MASCARAS = 1 << 16
+
+# Cache de tablas de máscaras: (tipo_error, ancho_bits) -> arreglo NumPy
+_tablas_mascaras_np = {}
+
+# Palabras de código por tarea del barrido (fijo: la partición no depende de los procesos)
+PALABRAS_POR_FRAGMENTO = 1 << 20
+
+# Bits a 1 de cada byte, para contar bits de datos erróneos
+_POPCOUNT_BYTE = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+CAMPOS_BARRIDO = ['p', 'bits_datos',
+                  'crc_palabras_error', 'crc_no_detectados', 'crc_tasa_no_detectado',
+                  'crc_ber_residual', 'crc_goodput',
+                  'ham_palabras_error', 'ham_no_corregibles', 'ham_mal_corregidos',
+                  'ham_ber_residual', 'ham_goodput']
+_CAMPOS_ENTEROS = {'bits_datos', 'crc_palabras_error', 'crc_no_detectados',
+                   'ham_palabras_error', 'ham_no_corregibles', 'ham_mal_corregidos'}
+
+
+def tipo_para_ancho(ancho_bits: int):
+    """Menor tipo entero sin signo de NumPy que aloja `ancho_bits` bits."""
+    if ancho_bits <= 16:
+        return np.uint16
+    if ancho_bits <= 32:
+        return np.uint32
+    if ancho_bits <= 64:
+        return np.uint64
+    raise ValueError(f"Palabras de {ancho_bits} bits no caben en un entero de 64 bits")
+
+
+def tabla_mascaras_np(tipo_error: str, ancho_bits: int) -> np.ndarray:
+    """`index.tabla_mascaras` como arreglo NumPy del tipo adecuado (cacheada)."""
+    clave = (tipo_error, ancho_bits)
+    tabla = _tablas_mascaras_np.get(clave)
+    if tabla is None:
+        tabla = np.array(index.tabla_mascaras(tipo_error, ancho_bits), dtype=tipo_para_ancho(ancho_bits))
+        _tablas_mascaras_np[clave] = tabla
+    return tabla
+
+
+def generar_mascaras(tipo_error: str, ancho_bits: int, n: int, rng: np.random.Generator) -> np.ndarray:
+    """Genera `n` máscaras de error de `ancho_bits` bits, una por palabra.
+
+    Modelos de una palabra (un bit, dos bits, ráfaga de 3): todas las máscaras del
+    modelo son equiprobables, así que basta con un sorteo de índices en bloque
+    sobre `tabla_mascaras_np`. TIPO_ERROR_GILBERT tiene memoria: usar `FuenteMascaras`.
+    """
+    if tipo_error == TIPO_ERROR_GILBERT:
+        raise ValueError("El canal de Gilbert–Elliott tiene estado: use FuenteMascaras")
+    tabla = tabla_mascaras_np(tipo_error, ancho_bits)
+    return np.take(tabla, rng.integers(0, len(tabla), n, dtype=np.uint32))
+
+
+def posiciones_bsc(n_bits: int, p: float, rng: np.random.Generator) -> np.ndarray:
+    """Posiciones (ordenadas, int64) de los bits invertidos por un BSC en `n_bits` bits.
+
+    La distancia entre dos errores consecutivos de un BSC sigue una distribución
+    geométrica de parámetro p, así que basta con generar los saltos y acumularlos:
+    el coste es proporcional al número de errores (≈ n_bits·p), no a `n_bits`.
+    """
+    if p <= 0.0 or n_bits <= 0:
+        return np.empty(0, dtype=np.int64)
+    if p >= 1.0:
+        return np.arange(n_bits, dtype=np.int64)
+    esperado = n_bits * p
+    lote = int(esperado + 6 * np.sqrt(esperado)) + 16
+    partes = []
+    siguiente = 0  # primera posición posible del próximo error
+    while siguiente < n_bits:
+        posiciones = np.cumsum(rng.geometric(p, lote)) + (siguiente - 1)
+        partes.append(posiciones)
+        siguiente = int(posiciones[-1]) + 1
+    posiciones = np.concatenate(partes)
+    return posiciones[:np.searchsorted(posiciones, n_bits)]
+
+
+def mascaras_desde_posiciones(posiciones: np.ndarray, ancho_bits: int) -> tuple:
+    """Agrupa posiciones de bit (ordenadas) del flujo en máscaras por palabra de `ancho_bits` bits.
+
+    El bit 0 del flujo es el más significativo de la palabra 0 (orden de transmisión).
+
+    Returns:
+        (índices de las palabras con algún error, máscara de error de cada una)
+    """
+    tipo = tipo_para_ancho(ancho_bits)
+    if len(posiciones) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=tipo)
+    palabras, bits = np.divmod(posiciones, ancho_bits)
+    valores = np.left_shift(np.uint64(1), (ancho_bits - 1 - bits).astype(np.uint64))
+    # Las posiciones vienen ordenadas: cada palabra empieza donde cambia el índice
+    inicios = np.flatnonzero(np.concatenate(([True], palabras[1:] != palabras[:-1])))
+    # Las posiciones son distintas, así que la suma de potencias de una palabra es su OR
+    return palabras[inicios], np.add.reduceat(valores, inicios).astype(tipo)
+
+
+def mascaras_densas(posiciones: np.ndarray, ancho_bits: int, n_palabras: int) -> np.ndarray:
+    """Como `mascaras_desde_posiciones`, pero con una máscara (0 si no hay error) por palabra."""
+    indices, mascaras = mascaras_desde_posiciones(posiciones, ancho_bits)
+    densas = np.zeros(n_palabras, dtype=mascaras.dtype)
+    densas[indices] = mascaras
+    return densas
+
+
+@dataclass(frozen=True)
+class ParametrosGilbertElliott:
+    """Parámetros del canal de Gilbert–Elliott (todas las probabilidades son por bit)."""
+    p_buena_mala: float = 1e-3  # probabilidad de pasar del estado bueno al malo
+    p_mala_buena: float = 0.1   # probabilidad de volver del estado malo al bueno
+    ber_buena: float = 0.0      # BER dentro del estado bueno
+    ber_mala: float = 0.5       # BER dentro del estado malo (ráfaga)
+
+    def __post_init__(self):
+        if not (0.0 < self.p_buena_mala <= 1.0 and 0.0 < self.p_mala_buena <= 1.0):
+            raise ValueError("Las probabilidades de transición deben estar en (0, 1]")
+        if not (0.0 <= self.ber_buena <= 1.0 and 0.0 <= self.ber_mala <= 1.0):
+            raise ValueError("Las BER de cada estado deben estar en [0, 1]")
+
+    @property
+    def prob_mala(self) -> float:
+        """Fracción del tiempo que el canal pasa en el estado malo (distribución estacionaria)."""
+        return self.p_buena_mala / (self.p_buena_mala + self.p_mala_buena)
+
+    @property
+    def ber_media(self) -> float:
+        """BER media a largo plazo."""
+        return self.prob_mala * self.ber_mala + (1 - self.prob_mala) * self.ber_buena
+
+    @property
+    def duracion_media_mala(self) -> float:
+        """Longitud media (bits) de una estancia en el estado malo."""
+        return 1.0 / self.p_mala_buena
+
+
+class CanalGilbertElliott:
+    """Canal de Gilbert–Elliott con estado, aplicado sobre el flujo de bits transmitido.
+
+    Las estancias en cada estado tienen longitud geométrica, así que se generan
+    todas de una vez; dentro de cada estado los errores se colocan como en un BSC
+    con la BER de ese estado. El estado se conserva entre llamadas, de modo que
+    pedir máscaras por bloques equivale a pedir el flujo entero de una vez. Un
+    canal nuevo arranca en un estado tomado de la distribución estacionaria.
+    """
+
+    def __init__(self, parametros: ParametrosGilbertElliott = None, rng: np.random.Generator = None):
+        self.parametros = parametros or ParametrosGilbertElliott()
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.malo = bool(self.rng.random() < self.parametros.prob_mala)
+
+    def estancias(self, n_bits: int) -> tuple:
+        """Divide los próximos `n_bits` bits en estancias alternas y avanza el estado.
+
+        Returns:
+            (inicio, longitud, es_mala) de cada estancia, como arreglos
+        """
+        if n_bits <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0, dtype=bool)
+        par = self.parametros
+        p_actual, p_otro = (par.p_mala_buena, par.p_buena_mala) if self.malo else (par.p_buena_mala, par.p_mala_buena)
+        ciclos = int(n_bits / (1.0 / p_actual + 1.0 / p_otro) * 1.1) + 8
+        partes = []
+        cubiertos = 0
+        while cubiertos < n_bits:
+            # Estancias alternas: pares en el estado actual, impares en el otro
+            longitudes = np.empty(2 * ciclos, dtype=np.int64)
+            longitudes[0::2] = self.rng.geometric(p_actual, ciclos)
+            longitudes[1::2] = self.rng.geometric(p_otro, ciclos)
+            partes.append(longitudes)
+            cubiertos += int(longitudes.sum())
+        longitudes = np.concatenate(partes)
+        finales = np.cumsum(longitudes)
+        ultima = int(np.searchsorted(finales, n_bits))
+        longitudes = longitudes[:ultima + 1]
+        inicios = finales[:ultima + 1] - longitudes
+        es_mala = (np.arange(ultima + 1) % 2 == 1) != self.malo
+        # Si la última estancia sigue más allá de n_bits, el canal continúa en su estado
+        # (la duración restante vuelve a ser geométrica); si acaba justo, cambia
+        self.malo = bool(es_mala[-1]) if finales[ultima] > n_bits else not bool(es_mala[-1])
+        longitudes[-1] = n_bits - inicios[-1]
+        return inicios, longitudes, es_mala
+
+    def posiciones(self, n_bits: int) -> np.ndarray:
+        """Posiciones (ordenadas) de los bits invertidos en los próximos `n_bits` bits."""
+        inicios, longitudes, es_mala = self.estancias(n_bits)
+        partes = []
+        for seleccion, ber in ((~es_mala, self.parametros.ber_buena), (es_mala, self.parametros.ber_mala)):
+            inicio_sel, longitud_sel = inicios[seleccion], longitudes[seleccion]
+            # BSC sobre las estancias de este estado puestas una tras otra; luego se
+            # traduce cada posición virtual a su posición real en el flujo
+            virtuales = posiciones_bsc(int(longitud_sel.sum()), ber, self.rng)
+            finales_virtuales = np.cumsum(longitud_sel)
+            estancia = np.searchsorted(finales_virtuales, virtuales, side='right')
+            partes.append(virtuales + (inicio_sel - (finales_virtuales - longitud_sel))[estancia])
+        return np.sort(np.concatenate(partes))
+
+    def mascaras(self, ancho_bits: int, n_palabras: int) -> np.ndarray:
+        """Máscaras de error de las próximas `n_palabras` palabras de `ancho_bits` bits."""
+        return mascaras_densas(self.posiciones(n_palabras * ancho_bits), ancho_bits, n_palabras)
+
+
+def rng_fragmento(semilla: int, codec: str, indice: int) -> np.random.Generator:
+    """Generador independiente para el fragmento `indice` de `codec`.
+
+    Se deriva con `SeedSequence(semilla, spawn_key=(codec, indice))`, de modo que
+    los flujos no se solapan entre codecs ni entre fragmentos.
+    """
+    secuencia = np.random.SeedSequence(semilla, spawn_key=(_IDS_CODEC[codec], indice))
+    return np.random.default_rng(secuencia)
+
+
+def semilla_aleatoria() -> int:
+    """Semilla raíz nueva (128 bits de entropía del sistema) para cuando no se fija una."""
+    return np.random.SeedSequence().entropy
+
+
+def bloques_mascaras(tipo_error: str, ancho_bits: int, n: int, codec: str, semilla: int,
+                     parametros_canal: ParametrosGilbertElliott = None, indice_inicial: int = 0,
+                     intercalador=None, tamano_fragmento: int = None):
+    """Genera las máscaras de `n` palabras consecutivas de `codec` como arreglos por bloque.
+
+    Es el esquema de siembra común a todos los motores: la entrada se parte en
+    fragmentos de `tamano_fragmento` palabras (None = index.TAMANO_FRAGMENTO), el fragmento i usa
+    `rng_fragmento(semilla, codec, indice_inicial + i)` y dentro de él se piden
+    bloques de TAMANO_BLOQUE_MASCARAS. Así las máscaras de cada palabra solo
+    dependen de la semilla y de su posición, no del motor ni de los procesos.
+
+    Con `intercalador` (intercalado.Intercalador) el canal actúa igual, pero en el
+    orden de transmisión: las máscaras de cada fragmento se desintercalan antes de
+    entregarlas. La realización del canal es la misma que sin intercalar.
+    """
+    fragmento = tamano_fragmento if tamano_fragmento is not None else index.TAMANO_FRAGMENTO
+    for i, desde in enumerate(range(0, n, fragmento), start=indice_inicial):
+        fuente = FuenteMascaras(tipo_error, ancho_bits, rng_fragmento(semilla, codec, i), parametros_canal)
+        restantes = min(fragmento, n - desde)
+        inicios = range(0, restantes, TAMANO_BLOQUE_MASCARAS)
+        bloques = (fuente.siguientes(min(TAMANO_BLOQUE_MASCARAS, restantes - d)) for d in inicios)
+        if intercalador is not None:
+            mascaras = intercalador.desintercalar_mascaras(np.concatenate(list(bloques)), ancho_bits)
+            bloques = (mascaras[d:d + TAMANO_BLOQUE_MASCARAS] for d in inicios)
+        yield from bloques
+
+
+def mascaras_flujo(tipo_error: str, ancho_bits: int, n: int, codec: str, semilla: int,
+                   parametros_canal: ParametrosGilbertElliott = None, indice_inicial: int = 0,
+                   intercalador=None):
+    """Las mismas máscaras que `bloques_mascaras`, una a una como enteros de Python."""
+    for bloque in bloques_mascaras(tipo_error, ancho_bits, n, codec, semilla, parametros_canal, indice_inicial,
+                                   intercalador):
+        yield from bloque.tolist()
+
+
+class FuenteMascaras:
+    """Fuente de máscaras de error de un modelo para un flujo de palabras de `ancho_bits` bits.
+
+    `siguientes(n)` devuelve las próximas `n` máscaras como arreglo (motores NumPy);
+    iterar sobre la fuente entrega enteros de Python generados por bloques de
+    TAMANO_BLOQUE_MASCARAS (motor escalar). Las dos vías avanzan el mismo flujo.
+    """
+
+    def __init__(self, tipo_error: str, ancho_bits: int, rng: np.random.Generator = None,
+                 parametros_canal: ParametrosGilbertElliott = None):
+        self.tipo_error = tipo_error
+        self.ancho_bits = ancho_bits
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.canal = CanalGilbertElliott(parametros_canal, self.rng) if tipo_error == TIPO_ERROR_GILBERT else None
+
+    def siguientes(self, n: int) -> np.ndarray:
+        """Máscaras de las próximas `n` palabras."""
+        if self.canal is not None:
+            return self.canal.mascaras(self.ancho_bits, n)
+        return generar_mascaras(self.tipo_error, self.ancho_bits, n, self.rng)
+
+    def __iter__(self):
+        while True:
+            yield from self.siguientes(TAMANO_BLOQUE_MASCARAS).tolist()
+
+
+# Resultado de una trama con CRC tras el canal (CanalTramas)
+TRAMA_CORRECTA = 0
+TRAMA_DETECTADA = 1     # con errores que el CRC detecta: el receptor la descarta
+TRAMA_NO_DETECTADA = 2  # con errores que el CRC no ve: se entrega corrupta
+
+
+class CanalTramas:
+    """Canal (BSC o Gilbert–Elliott) para tramas de `bits_trama` bits protegidas con un CRC.
+
+    El CRC es lineal: una trama recibida con error e pasa la comprobación si y solo si
+    e es múltiplo de g(x), es decir, si la suma (XOR) de los síndromes x^i mod g de sus
+    bits erróneos es 0. Así el resultado de cada trama sale de las posiciones de error
+    del canal sin calcular ningún CRC, y el coste no depende del tamaño de la trama
+    sino del número de errores. Las tramas se transmiten una tras otra sobre el mismo
+    flujo de bits, así que las ráfagas de Gilbert–Elliott pueden cruzar tramas.
+    """
+
+    def __init__(self, bits_trama: int, poly: int = POLINOMIO_CRC, p: float = 0.0,
+                 parametros_canal: ParametrosGilbertElliott = None, rng: np.random.Generator = None):
+        import analisis_poly
+        if not 0.0 <= p <= 1.0:
+            raise ValueError("La probabilidad de error de bit debe estar en [0, 1]")
+        self.bits_trama = bits_trama
+        self.p = p
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.canal = CanalGilbertElliott(parametros_canal, self.rng) if parametros_canal is not None else None
+        # Síndrome de un error en el bit j de la trama (j = 0 es el primero transmitido, x^(n-1))
+        self._sindromes = analisis_poly.sindromes(poly, bits_trama)[::-1].copy()
+
+    def posiciones(self, n_tramas: int) -> np.ndarray:
+        """Posiciones (ordenadas) de los bits invertidos en las próximas `n_tramas` tramas."""
+        return self.posiciones_bits(n_tramas * self.bits_trama)
+
+    def posiciones_bits(self, n_bits: int) -> np.ndarray:
+        """Posiciones (ordenadas) de los bits invertidos en los próximos `n_bits` bits del flujo."""
+        if self.canal is not None:
+            return self.canal.posiciones(n_bits)
+        return posiciones_bsc(n_bits, self.p, self.rng)
+
+    def siguientes(self, n_tramas: int) -> np.ndarray:
+        """Resultado (TRAMA_*) de cada una de las próximas `n_tramas` tramas, como uint8."""
+        return self.resultados(self.posiciones(n_tramas), n_tramas)
+
+    def resultados(self, posiciones: np.ndarray, n_tramas: int) -> np.ndarray:
+        """Resultado (TRAMA_*) de cada trama a partir de las posiciones de error del flujo."""
+        resultados = np.full(n_tramas, TRAMA_CORRECTA, dtype=np.uint8)
+        if len(posiciones) == 0:
+            return resultados
+        tramas, bits = np.divmod(posiciones, self.bits_trama)
+        inicios = np.flatnonzero(np.concatenate(([True], tramas[1:] != tramas[:-1])))
+        sindrome = np.bitwise_xor.reduceat(self._sindromes[bits], inicios)
+        resultados[tramas[inicios]] = np.where(sindrome == 0, TRAMA_NO_DETECTADA, TRAMA_DETECTADA)
+        return resultados
+
+
+def rng_barrido(semilla: int, indice_p: int, codec: str, indice: int) -> np.random.Generator:
+    """Generador del fragmento `indice` de `codec` en el punto `indice_p` del barrido."""
+    clave = (_ID_BARRIDO_BSC, indice_p, _IDS_CODEC[codec], indice)
+    return np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=clave))
+
+
+def _fragmento_bsc(p: float, n_palabras: int, poly: int, semilla: int, indice_p: int, indice: int) -> dict:
+    """Trabajo de un proceso: pasa `n_palabras` palabras de cada codec por un BSC(p).
+
+    Ambos códigos son lineales y la decodificación también lo es respecto del
+    error, así que el resultado de una palabra depende solo de su máscara: se
+    evalúan únicamente las palabras que recibieron algún error.
+    """
+    import vectorizado
+    degree = poly.bit_length() - 1
+    ancho_crc = 8 + degree
+
+    # CRC: el error pasa inadvertido si la propia máscara es una palabra de código válida
+    tabla = vectorizado.tabla_crc_np(poly)
+    tipo = tabla.dtype.type
+    rng = rng_barrido(semilla, indice_p, CODEC_CRC, indice)
+    _, mascaras = mascaras_desde_posiciones(posiciones_bsc(n_palabras * ancho_crc, p, rng), ancho_crc)
+    errores_datos = mascaras >> tipo(degree)
+    no_detecta = np.take(tabla, errores_datos) == (mascaras & tipo((1 << degree) - 1))
+    crc_bits_residuales = int(np.take(_POPCOUNT_BYTE, errores_datos[no_detecta]).sum())
+
+    # Hamming: el dato entregado para `codigo ^ e` es `dato ^ tabla_datos[e]`
+    _, tabla_datos, tabla_estado = vectorizado.tablas_hamming_np()
+    rng = rng_barrido(semilla, indice_p, CODEC_HAMMING, indice)
+    _, mascaras_ham = mascaras_desde_posiciones(posiciones_bsc(n_palabras * 12, p, rng), 12)
+    errores_ham = np.take(tabla_datos, mascaras_ham)
+    senalado = np.take(tabla_estado, mascaras_ham) == vectorizado.ESTADO_NO_CORREGIBLE
+    dato_erroneo = errores_ham != 0
+
+    return {
+        'palabras': n_palabras,
+        'crc_palabras_error': len(mascaras),
+        'crc_no_detectados': int(np.count_nonzero(no_detecta)),
+        'crc_bits_residuales': crc_bits_residuales,
+        'ham_palabras_error': len(mascaras_ham),
+        'ham_no_corregibles': int(np.count_nonzero(senalado)),
+        'ham_mal_corregidos': int(np.count_nonzero(dato_erroneo & ~senalado)),
+        'ham_bits_residuales': int(np.take(_POPCOUNT_BYTE, errores_ham).sum()),
+        'ham_entregados_ok': n_palabras - int(np.count_nonzero(dato_erroneo | senalado)),
+    }
+
+
+def _fila_barrido(p: float, partes: list, poly: int) -> dict:
+    """Combina los contadores de los fragmentos de un punto en una fila del barrido."""
+    suma = {clave: sum(parte[clave] for parte in partes) for clave in partes[0]}
+    n = suma['palabras']
+    degree = poly.bit_length() - 1
+    bits_datos = n * 8
+    return {
+        'p': p,
+        'bits_datos': bits_datos,
+        'crc_palabras_error': suma['crc_palabras_error'],
+        'crc_no_detectados': suma['crc_no_detectados'],
+        'crc_tasa_no_detectado': suma['crc_no_detectados'] / n if n else 0.0,
+        'crc_ber_residual': suma['crc_bits_residuales'] / bits_datos if n else 0.0,
+        # Solo se aprovechan las palabras que llegan intactas (las detectadas se descartan)
+        'crc_goodput': (n - suma['crc_palabras_error']) * 8 / (n * (8 + degree)) if n else 0.0,
+        'ham_palabras_error': suma['ham_palabras_error'],
+        'ham_no_corregibles': suma['ham_no_corregibles'],
+        'ham_mal_corregidos': suma['ham_mal_corregidos'],
+        'ham_ber_residual': suma['ham_bits_residuales'] / bits_datos if n else 0.0,
+        'ham_goodput': suma['ham_entregados_ok'] * 8 / (n * 12) if n else 0.0,
+    }
+
+
+def barrido_bsc(probabilidades, bits_datos: int = 10**7, poly: int = POLINOMIO_CRC,
+                semilla: int = None, trabajadores: int = None,
+                executor: ProcessPoolExecutor = None) -> list:
+    """Simula CRC y Hamming(12,8) sobre un BSC para cada p de `probabilidades`.
+
+    Cada byte de datos viaja en su propia palabra de código (8+grado bits para CRC,
+    12 para Hamming), como en la simulación principal. Los puntos y sus fragmentos
+    se reparten entre procesos; con la misma `semilla` el resultado no depende del
+    número de trabajadores.
+
+    Args:
+        probabilidades: Probabilidades de inversión de bit a simular
+        bits_datos: Bits de datos por punto y por codec (se redondea a bytes)
+        poly: Polinomio CRC (grado 8 a 56)
+        semilla: Semilla raíz (None = aleatoria)
+        trabajadores: Número de procesos (None = os.cpu_count(); 1 = en este proceso)
+        executor: Pool ya creado para reutilizarlo (opcional)
+
+    Returns:
+        Una fila (dict con las claves de CAMPOS_BARRIDO) por probabilidad.
+    """
+    if semilla is None:
+        semilla = np.random.SeedSequence().entropy
+    n_palabras = bits_datos // 8
+    tareas = []
+    for indice_p, p in enumerate(probabilidades):
+        for indice, desde in enumerate(range(0, n_palabras, PALABRAS_POR_FRAGMENTO)):
+            tareas.append((float(p), min(PALABRAS_POR_FRAGMENTO, n_palabras - desde), poly, semilla, indice_p, indice))
+
+    if executor is None and trabajadores == 1:
+        partes = [_fragmento_bsc(*tarea) for tarea in tareas]
+    else:
+        propio = executor is None
+        if propio:
+            executor = ProcessPoolExecutor(max_workers=trabajadores or os.cpu_count())
+        try:
+            partes = list(executor.map(_fragmento_bsc, *zip(*tareas))) if tareas else []
+        finally:
+            if propio:
+                executor.shutdown()
+
+    filas = []
+    for indice_p, p in enumerate(probabilidades):
+        del_punto = [parte for tarea, parte in zip(tareas, partes) if tarea[4] == indice_p]
+        if del_punto:
+            filas.append(_fila_barrido(float(p), del_punto, poly))
+    return filas
+
+
+def probabilidades_log(exponente_min: float, exponente_max: float, puntos: int) -> list:
+    """`puntos` probabilidades espaciadas logarítmicamente entre 10^min y 10^max."""
+    return [float(p) for p in np.logspace(exponente_min, exponente_max, puntos)]
+
+
+def guardar_barrido(filas: list, ruta: str):
+    """Escribe las filas en CSV o JSON según la extensión de `ruta` (.json o cualquier otra = CSV)."""
+    if ruta.lower().endswith('.json'):
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump(filas, f, indent=2)
+        return
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.DictWriter(f, fieldnames=CAMPOS_BARRIDO)
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+
+def cargar_barrido(ruta: str) -> list:
+    """Lee un barrido guardado con `guardar_barrido` (CSV o JSON)."""
+    if ruta.lower().endswith('.json'):
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    with open(ruta, newline='', encoding='utf-8') as f:
+        return [{clave: (int(valor) if clave in _CAMPOS_ENTEROS else float(valor)) for clave, valor in fila.items()}
+                for fila in csv.DictReader(f)]
+
+
+def imprimir_barrido(filas: list, tiempo_ms: float = None):
+    """Imprime el barrido como tabla."""
+    if tiempo_ms is not None and filas:
+        bits = sum(fila['bits_datos'] for fila in filas)
+        print(f"Barrido BSC: {len(filas)} puntos, {bits} bits de datos por codec en {tiempo_ms:.1f} ms")
+    print(f"{'p':>10} {'CRC no det./pal.':>17} {'CRC BER resid.':>15} {'CRC goodput':>12} "
+          f"{'Ham BER resid.':>15} {'Ham no corr.':>13} {'Ham goodput':>12}")
+    for fila in filas:
+        print(f"{fila['p']:10.3e} {fila['crc_tasa_no_detectado']:17.3e} {fila['crc_ber_residual']:15.3e} "
+              f"{fila['crc_goodput']:12.4f} {fila['ham_ber_residual']:15.3e} {fila['ham_no_corregibles']:13d} "
+              f"{fila['ham_goodput']:12.4f}")
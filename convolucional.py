@@ -0,0 +1,282 @@
+"""
+Código convolucional K=7 (171, 133 octal) de tasa 1/2 y perforado a 2/3 y 3/4, con Viterbi
+El código del estándar (satélite, DVB-S, 802.11): 64 estados, cada bit de entrada produce
+dos bits (generadores 171 y 133 en octal) y la perforación elimina algunos para subir la
+tasa. El decodificador es Viterbi de decisión dura con las posiciones perforadas como
+borrones (no suman métrica). El paso sumar-comparar-seleccionar trabaja sobre los 64
+estados a la vez como mariposas (32 pares de estados predecesores) y, además, sobre muchas
+ventanas del flujo en paralelo: cada ventana de BITS_POR_VENTANA bits se decodifica con
+PROFUNDIDAD_TRACEBACK bits de arranque y otros tantos de traceback, solapados con las
+vecinas, así la memoria de supervivientes está acotada sea cual sea la longitud del flujo
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import canal
+import index
+from index import Resultado, TIPO_ERROR_UN_BIT, TIPO_ERROR_DOS_BITS, TIPO_ERROR_RAFAGA, TIPO_ERROR_GILBERT
+
+LONGITUD_RESTRICCION = 7
+GENERADORES = (0o171, 0o133)
+ESTADOS = 1 << (LONGITUD_RESTRICCION - 1)
+# Bits de entrada que decodifica cada ventana y profundidad de traceback (arranque y final)
+BITS_POR_VENTANA = 2048
+PROFUNDIDAD_TRACEBACK = 96
+# Ventanas que avanzan a la vez por el trellis (acota la memoria de supervivientes)
+VENTANAS_POR_LOTE = 1024
+
+# Patrones de perforación (fila 0: salida del generador 171, fila 1: del 133), como en DVB-S
+PERFORACIONES = {
+    index.FEC_CONV_1_2: ((1,), (1,)),
+    index.FEC_CONV_2_3: ((1, 1), (1, 0)),
+    index.FEC_CONV_3_4: ((1, 0, 1), (1, 1, 0)),
+}
+
+
+def _salidas_rama() -> np.ndarray:
+    """Par de bits de salida (o171·2 + o133) de la rama estado -> entrada 0, para cada estado."""
+    registro = np.arange(ESTADOS)  # entrada 0 en el bit 6: el registro es el propio estado
+    salidas = [np.array([bin(int(r) & g).count('1') & 1 for r in registro]) for g in GENERADORES]
+    return (salidas[0] << 1) | salidas[1]
+
+
+_SALIDA_PAR = _salidas_rama()[0::2]  # salida de la rama (estado par 2j, entrada 0) de cada mariposa j
+
+
+@dataclass(frozen=True)
+class CodigoConvolucional:
+    """Código K=7 (171, 133) con un patrón de perforación (PERFORACIONES).
+
+    El flujo de cada mensaje empieza en el estado 0 y se termina con K-1 ceros de cola,
+    así el decodificador también acaba en el estado 0.
+    """
+    nombre_corto: str
+    _patron: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.nombre_corto not in PERFORACIONES:
+            raise ValueError(f"Perforación desconocida: {self.nombre_corto}")
+        # Máscara (periodo, 2) de bits transmitidos, en el orden de transmisión (o171, o133)
+        object.__setattr__(self, '_patron', np.array(PERFORACIONES[self.nombre_corto], dtype=bool).T)
+
+    @property
+    def periodo(self) -> int:
+        return len(self._patron)
+
+    @property
+    def tasa(self) -> float:
+        """Bits de datos por bit transmitido (sin contar la cola)."""
+        return self.periodo / int(self._patron.sum())
+
+    @property
+    def nombre(self) -> str:
+        return f"Conv. K=7 tasa {self.periodo}/{int(self._patron.sum())}"
+
+    def mascara_transmitidos(self, n_entrada: int) -> np.ndarray:
+        """Matriz (n_entrada, 2) de los bits que se transmiten tras perforar."""
+        return np.tile(self._patron, (-(-n_entrada // self.periodo), 1))[:n_entrada]
+
+    def codificar_bits(self, bits: np.ndarray) -> np.ndarray:
+        """Bits transmitidos (uint8 0/1) de `bits` más la cola de K-1 ceros."""
+        entrada = np.concatenate((np.zeros(LONGITUD_RESTRICCION - 1, dtype=np.uint8), bits,
+                                  np.zeros(LONGITUD_RESTRICCION - 1, dtype=np.uint8)))
+        n = len(bits) + LONGITUD_RESTRICCION - 1
+        salidas = np.zeros((n, 2), dtype=np.uint8)
+        for columna, generador in enumerate(GENERADORES):
+            # El bit 6 del generador multiplica la entrada actual y el bit 0 la de hace 6 pasos
+            for retardo in range(LONGITUD_RESTRICCION):
+                if generador >> (LONGITUD_RESTRICCION - 1 - retardo) & 1:
+                    salidas[:, columna] ^= entrada[LONGITUD_RESTRICCION - 1 - retardo:][:n]
+        return salidas[self.mascara_transmitidos(n)]
+
+    def codificar(self, datos: bytes) -> np.ndarray:
+        """Bits transmitidos (uint8 0/1) de `datos`, bit más significativo primero."""
+        return self.codificar_bits(np.unpackbits(np.frombuffer(datos, dtype=np.uint8)))
+
+    def decodificar_bits(self, recibidos: np.ndarray, n_bits: int,
+                         profundidad: int = PROFUNDIDAD_TRACEBACK) -> np.ndarray:
+        """Viterbi de decisión dura: los `n_bits` bits de datos de `recibidos` (salida de `codificar_bits`)."""
+        n = n_bits + LONGITUD_RESTRICCION - 1
+        transmitidos = self.mascara_transmitidos(n)
+        # Métrica de rama por paso y por par de salida (o171·2 + o133): bits que no coinciden,
+        # sin contar los perforados
+        unos = np.zeros((n, 2), dtype=np.int16)
+        unos[transmitidos] = recibidos
+        ceros = transmitidos - unos  # 1 donde se recibió un 0 (no perforado)
+        rama = np.empty((n, 4), dtype=np.int16)
+        rama[:, 0] = unos[:, 0] + unos[:, 1]
+        rama[:, 1] = unos[:, 0] + ceros[:, 1]
+        rama[:, 2] = ceros[:, 0] + unos[:, 1]
+        rama[:, 3] = ceros[:, 0] + ceros[:, 1]
+        # Ventanas solapadas: cada una decodifica BITS_POR_VENTANA pasos con `profundidad` pasos
+        # antes y después. Fuera del flujo se rellena como si llegaran ceros sin error: es lo que
+        # emite el codificador en el estado 0, así el principio y la cola fuerzan ese estado
+        ventanas = -(-n // BITS_POR_VENTANA)
+        relleno = np.tile(np.array([0, 1, 1, 2], dtype=np.int16), (ventanas * BITS_POR_VENTANA + 2 * profundidad, 1))
+        relleno[profundidad:profundidad + n] = rama
+        pasos = BITS_POR_VENTANA + 2 * profundidad
+        solapadas = np.lib.stride_tricks.as_strided(
+            relleno, shape=(ventanas, pasos, 4),
+            strides=(BITS_POR_VENTANA * relleno.strides[0], relleno.strides[0], relleno.strides[1]), writeable=False)
+        bits = np.empty((ventanas, BITS_POR_VENTANA), dtype=np.uint8)
+        for desde in range(0, ventanas, VENTANAS_POR_LOTE):
+            bits[desde:desde + VENTANAS_POR_LOTE] = _viterbi_ventanas(solapadas[desde:desde + VENTANAS_POR_LOTE],
+                                                                     profundidad)
+        return bits.reshape(-1)[:n_bits]
+
+    def decodificar(self, recibidos: np.ndarray, longitud: int) -> bytes:
+        """Inversa de `codificar`: los `longitud` bytes de datos."""
+        return np.packbits(self.decodificar_bits(recibidos, 8 * longitud)).tobytes()
+
+
+def _viterbi_ventanas(rama: np.ndarray, profundidad: int) -> np.ndarray:
+    """Viterbi sobre varias ventanas a la vez; `rama` es (ventanas, pasos, 4).
+
+    Devuelve los bits de entrada de los pasos [profundidad, pasos - profundidad) de cada
+    ventana, con el traceback desde el mejor estado del último paso. Las métricas se
+    guardan por estado (filas) y ventana (columnas): cada operación recorre filas contiguas.
+    """
+    ventanas, pasos, _ = rama.shape
+    rama = np.ascontiguousarray(rama.transpose(1, 2, 0))  # (pasos, 4, ventanas)
+    # Cada paso suma como mucho 2 a la métrica: int16 basta para ventanas de hasta 16K pasos
+    metricas = np.zeros((ESTADOS, ventanas), dtype=np.int16)
+    nuevas = np.empty_like(metricas)
+    decisiones = np.empty((pasos, ESTADOS // 8, ventanas), dtype=np.uint8)
+    decision = np.empty((ESTADOS, ventanas), dtype=bool)
+    mitad = ESTADOS // 2
+    for paso in range(pasos):
+        # Mariposa j: los estados 2j y 2j+1 pasan a j (entrada 0) y a j+32 (entrada 1).
+        # La rama 2j->j emite _SALIDA_PAR[j] y 2j+1->j su complemento (métrica = bits
+        # válidos - métrica), y al revés hacia j+32
+        metrica_rama = rama[paso]
+        directa = np.take(metrica_rama, _SALIDA_PAR, axis=0)
+        cruzada = (metrica_rama[0] + metrica_rama[3]) - directa
+        pares, impares = metricas[0::2], metricas[1::2]
+        desde_par, desde_impar = pares + directa, impares + cruzada
+        np.less(desde_impar, desde_par, out=decision[:mitad])
+        np.minimum(desde_par, desde_impar, out=nuevas[:mitad])
+        desde_par, desde_impar = pares + cruzada, impares + directa
+        np.less(desde_impar, desde_par, out=decision[mitad:])
+        np.minimum(desde_par, desde_impar, out=nuevas[mitad:])
+        decisiones[paso] = np.packbits(decision, axis=0)
+        metricas, nuevas = nuevas, metricas
+    # Traceback: la decisión dice si el predecesor era el estado impar de la mariposa
+    columnas = np.arange(ventanas)
+    estado = np.argmin(metricas, axis=0)
+    bits = np.empty((ventanas, pasos - 2 * profundidad), dtype=np.uint8)
+    for paso in range(pasos - 1, profundidad - 1, -1):
+        if paso < pasos - profundidad:
+            bits[:, paso - profundidad] = estado >> (LONGITUD_RESTRICCION - 2)
+        impar = (decisiones[paso, estado >> 3, columnas] >> (7 - (estado & 7))) & 1
+        estado = ((estado & (mitad - 1)) << 1) | impar
+    return bits
+
+
+CODIGOS_CONV = {nombre: CodigoConvolucional(nombre) for nombre in PERFORACIONES}
+
+
+def posiciones_error(tipo_error: str, codigo: CodigoConvolucional, n_bytes: int, rng: np.random.Generator,
+                     parametros_canal=None) -> np.ndarray:
+    """Posiciones (ordenadas) de los bits transmitidos invertidos por el canal en un fragmento.
+
+    Como con los demás codecs, los modelos de una palabra ponen un evento por byte de
+    datos: un bit, dos bits distintos o una ráfaga de 3 bits dentro de los bits
+    transmitidos que produce ese byte. El canal de Gilbert–Elliott recorre todo el flujo.
+    """
+    n = 8 * n_bytes + LONGITUD_RESTRICCION - 1
+    transmitidos = codigo.mascara_transmitidos(n).sum(axis=1)
+    total = int(transmitidos.sum())
+    if tipo_error == TIPO_ERROR_GILBERT:
+        return canal.CanalGilbertElliott(parametros_canal, rng).posiciones(total)
+    limites = np.concatenate(([0], np.cumsum(transmitidos)))[0:8 * n_bytes + 1:8]
+    inicio, ancho = limites[:-1], np.diff(limites)
+    if tipo_error == TIPO_ERROR_DOS_BITS:
+        primero = rng.integers(0, ancho)
+        segundo = rng.integers(0, ancho - 1)
+        posiciones = np.stack((primero, segundo + (segundo >= primero)), axis=1) + inicio[:, None]
+    elif tipo_error == TIPO_ERROR_RAFAGA:
+        posiciones = (rng.integers(0, ancho - 2) + inicio)[:, None] + np.arange(3)
+    else:  # TIPO_ERROR_UN_BIT
+        posiciones = (rng.integers(0, ancho) + inicio)[:, None]
+    return np.sort(posiciones.reshape(-1))
+
+
+def procesar_conv_lote(bytes_data: bytes, estado: dict = None, lock: threading.Lock = None,
+                       codigo: CodigoConvolucional = CODIGOS_CONV[index.FEC_CONV_1_2],
+                       tipo_error: str = TIPO_ERROR_UN_BIT, semilla: int = None, parametros_canal=None,
+                       indice_inicial: int = 0, perfil: bool = False, intercalador=None,
+                       tamano_fragmento: int = None) -> Resultado:
+    """Simula `codigo` como `reed_solomon.procesar_rs_lote` y devuelve el mismo `Resultado`.
+
+    Cada fragmento común (`tamano_fragmento` bytes, por defecto index.TAMANO_FRAGMENTO)
+    es un flujo terminado con su propio generador
+    `canal.rng_fragmento(semilla, CODEC_CONV, indice_inicial + i)`.
+    Viterbi no señala fallos: `corregidos` son los bytes con errores de canal en sus
+    bits que salen bien y `no_corregibles` los bytes que salen mal. Con `intercalador`
+    la unidad es siempre el bit transmitido.
+    """
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    reportador = index.ReportadorProgreso(estado, lock, 'ham') if estado is not None else None
+    medicion = index.PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+    inicio = marca = time.perf_counter()
+    datos = np.frombuffer(bytes_data, dtype=np.uint8)
+    total = len(datos)
+    corregidos = no_corregibles = correctos = 0
+    bits_transmitidos = 0
+
+    tamano_fragmento = tamano_fragmento if tamano_fragmento is not None else index.TAMANO_FRAGMENTO
+    for i, desde in enumerate(range(0, total, tamano_fragmento), start=indice_inicial):
+        fragmento = datos[desde:desde + tamano_fragmento]
+        posiciones = posiciones_error(tipo_error, codigo, len(fragmento),
+                                      canal.rng_fragmento(semilla, canal.CODEC_CONV, i), parametros_canal)
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca, llamadas=0)
+        transmitidos = codigo.codificar_bits(np.unpackbits(fragmento))
+        bits_transmitidos += len(transmitidos)
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CODIFICAR, marca)
+        if intercalador is not None:
+            posiciones = np.sort(intercalador.posiciones_originales(posiciones, len(transmitidos)))
+        recibidos = transmitidos.copy()
+        recibidos[posiciones] ^= 1
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca)
+        decodificados = np.packbits(codigo.decodificar_bits(recibidos, 8 * len(fragmento)))
+        # Bytes de datos cuyos bits transmitidos recibieron algún error
+        limites = np.concatenate(([0], np.cumsum(codigo.mascara_transmitidos(8 * len(fragmento)).sum(axis=1))))
+        con_error = np.zeros(len(fragmento), dtype=bool)
+        con_error[np.searchsorted(limites[8::8], posiciones[posiciones < limites[-1]], side='right')] = True
+        mal = decodificados != fragmento
+        cor = int(np.count_nonzero(con_error & ~mal))
+        no_cor = int(np.count_nonzero(mal))
+        corregidos += cor
+        no_corregibles += no_cor
+        correctos += len(fragmento) - cor - no_cor
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_DECODIFICAR, marca)
+        if reportador is not None and desde + len(fragmento) >= reportador.proximo:
+            reportador.publicar(desde + len(fragmento), corregidos=corregidos,
+                                no_corregibles=no_corregibles, correctos=correctos)
+            if medicion is not None:
+                marca = medicion.sumar(index.ETAPA_PROGRESO, marca)
+
+    if reportador is not None:
+        reportador.publicar(total, corregidos=corregidos, no_corregibles=no_corregibles, correctos=correctos)
+    fin = time.perf_counter()
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
+    return Resultado(
+        total=total,
+        procesados=total,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=f"corregidos: {corregidos}, no_corregibles: {no_corregibles}",
+        corregidos=corregidos,
+        no_corregibles=no_corregibles,
+        overhead_bits=bits_transmitidos - 8 * total,
+        perfil=medicion
+    )
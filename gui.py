@@ -5,6 +5,7 @@ from tkinter import ttk, messagebox
 from tkinter.scrolledtext import ScrolledText
 
 # Reuse functions from index.py by importing it as a module
+import bench
 import index
 
 # Intentar importar visualización (opcional)
@@ -52,6 +53,8 @@ class App(tk.Tk):
         self.sleep_entry = ttk.Entry(frm, width=8)
         self.sleep_entry.grid(column=1, row=2, sticky=tk.W)
         self.sleep_entry.insert(0, "2")
+        self.perfil_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(frm, text="Perfil por etapas", variable=self.perfil_var).grid(column=2, row=2, columnspan=2, sticky=tk.W)
 
         # Row: Byte / Iters for benchmark - actualizar row numbers
         ttk.Label(frm, text="Modo byte (opcional):").grid(column=0, row=3, sticky=tk.W)
@@ -113,6 +116,8 @@ class App(tk.Tk):
         self.stop_btn.config(state=tk.NORMAL)
         self.log.delete("1.0", tk.END)
         self._stop_event.clear()
+        self._resultado_crc = None
+        self._resultado_ham = None
         texto = self.text_entry.get()
         poly_s = self.poly_combo.get().strip()
         error_type = self.error_combo.get().strip()
@@ -145,7 +150,8 @@ class App(tk.Tk):
             return
 
         # Start worker thread
-        self._worker = threading.Thread(target=self.worker_task, args=(texto, poly, sleep_ms, byte_s, iters, error_type), daemon=True)
+        self._worker = threading.Thread(target=self.worker_task, args=(texto, poly, sleep_ms, byte_s, iters, error_type,
+                                                                      self.perfil_var.get()), daemon=True)
         self._worker.start()
         self.after(100, self.ui_update)
 
@@ -199,6 +205,7 @@ class App(tk.Tk):
                     self.metrics_panel.insert(tk.END, f"CRC final:\n  procesados={proc_crc}/{total_crc}\n  tiempo={t_crc:.3f} ms\n  detectados={det}\n\n")
                     self.metrics_panel.insert(tk.END, f"Hamming final:\n  procesados={proc_ham}/{total_ham}\n  tiempo={t_ham:.3f} ms\n  corregidos={cor}\n  no_corregibles={no_corr}\n\n")
                     self.metrics_panel.insert(tk.END, f"Ganador: {winner}\n")
+                    self.mostrar_perfiles()
             except Exception:
                 pass
         if self._worker and self._worker.is_alive() and not self._stop_event.is_set():
@@ -226,10 +233,20 @@ class App(tk.Tk):
                     else:
                         winner = "Empate"
                     self.lbl_summary.config(text=f"Resumen: Más rápido = {winner}")
+                self.mostrar_perfiles()
             except Exception:
                 pass
 
-    def worker_task(self, texto, poly, sleep_ms, byte_s, iters, error_type):
+    def mostrar_perfiles(self):
+        """Añade al panel de métricas el desglose por etapa de los resultados con perfil."""
+        for nombre, res in (("CRC", self._resultado_crc), ("Hamming", self._resultado_ham)):
+            if res is None or res.perfil is None or f"Perfil {nombre}:" in self.metrics_panel.get('1.0', tk.END):
+                continue
+            self.metrics_panel.insert(tk.END, f"\nPerfil {nombre}: throughput codec {res.throughput_codec:.3f} MB/s\n")
+            for linea in res.perfil.lineas():
+                self.metrics_panel.insert(tk.END, f"  {linea}\n")
+
+    def worker_task(self, texto, poly, sleep_ms, byte_s, iters, error_type, perfil=False):
         # If byte_s specified, run benchmark
         if byte_s != "":
             try:
@@ -240,49 +257,35 @@ class App(tk.Tk):
                 self.log.insert(tk.END, "Byte inválido\n")
                 return
             self.log.insert(tk.END, f"Benchmark por byte: valor={b}, iter={iters}\n")
-            inicio_crc = time.perf_counter()
-            for i in range(iters):
-                if self._stop_event.is_set():
-                    break
-                crc = index.calcular_crc(b, poly=poly)
-                paquete = (b << (poly.bit_length() - 1)) | crc
-                recibido = index.simular_error(paquete, (8 + (poly.bit_length() - 1)), error_type)
-                _ = index.verificar_crc(recibido, poly=poly)
-                if i % (iters // 10 or 1) == 0:
-                    self.log.insert(tk.END, f"CRC iter {i}\n")
-            fin_crc = time.perf_counter()
-            inicio_ham = time.perf_counter()
-            for i in range(iters):
-                if self._stop_event.is_set():
-                    break
-                codigo = index.codificar_hamming(b)
-                recibido = index.simular_error(codigo, 12, error_type)
-                _ = index.decodificar_corregir_hamming(recibido)
-                if i % (iters // 10 or 1) == 0:
-                    self.log.insert(tk.END, f"HAM iter {i}\n")
-            fin_ham = time.perf_counter()
-            total_crc_ms = (fin_crc - inicio_crc) * 1000.0
-            total_ham_ms = (fin_ham - inicio_ham) * 1000.0
-            self.log.insert(tk.END, f"CRC total {total_crc_ms:.3f} ms\n")
-            self.log.insert(tk.END, f"HAM total {total_ham_ms:.3f} ms\n")
+            # La suite mide con calentamiento y repeticiones; el log se escribe al final,
+            # fuera de las regiones medidas
+            filas = bench.ejecutar_suite(datos=bytes([b]) * iters, codecs=[bench.CODEC_CRC, bench.CODEC_HAMMING],
+                                         implementaciones=[bench.IMPL_TABLA], poly=poly,
+                                         tipo_error=error_type, sin_limites=True, detener=self._stop_event)
+            for fila in filas:
+                self.log.insert(tk.END, f"{fila['codec'].upper()} {fila['etapa']}: mediana {fila['mediana_ms']:.3f} ms, "
+                                        f"p95 {fila['p95_ms']:.3f} ms, {fila['ns_byte']:.1f} ns/byte\n")
+            if self._stop_event.is_set():
+                self.log.insert(tk.END, "Benchmark detenido\n")
             return
 
         # Otherwise run the text-mode simulation using index.main logic
         # Set index.estado so GUI can read progress
+        datos = texto.encode('utf-8')
         index.estado = {
-            'crc': {'total': len(texto.encode('utf-8')), 'procesados': 0, 'detectados': 0, 'no_detectados': 0, 'tiempo_ms': 0.0},
-            'ham': {'total': len(texto.encode('utf-8')), 'procesados': 0, 'corregidos': 0, 'no_corregibles': 0, 'correctos': 0, 'tiempo_ms': 0.0},
+            'crc': {'total': len(datos), 'procesados': 0, 'detectados': 0, 'no_detectados': 0, 'tiempo_ms': 0.0},
+            'ham': {'total': len(datos), 'procesados': 0, 'corregidos': 0, 'no_corregibles': 0, 'correctos': 0, 'tiempo_ms': 0.0},
         }
         lock = threading.Lock()
         stop_event = self._stop_event
 
         def tarea_crc():
-            res = index.procesar_crc(texto.encode('utf-8'), index.estado, lock, sleep_ms, poly=poly, tipo_error=error_type)
+            res = index.procesar_crc(datos, index.estado, lock, sleep_ms, poly=poly, tipo_error=error_type, perfil=perfil)
             index.estado['crc']['tiempo_ms'] = res.tiempo_ms
             self._resultado_crc = res
 
         def tarea_ham():
-            res = index.procesar_hamming(texto.encode('utf-8'), index.estado, lock, sleep_ms, tipo_error=error_type)
+            res = index.procesar_hamming(datos, index.estado, lock, sleep_ms, tipo_error=error_type, perfil=perfil)
             index.estado['ham']['tiempo_ms'] = res.tiempo_ms
             self._resultado_ham = res
 
@@ -0,0 +1,313 @@
+"""
+Familia de códigos de Hamming(2^m-1, 2^m-1-m) y su extensión SECDED sobre mensajes completos
+Cada código se construye a partir de su matriz de comprobación de paridad H en forma
+sistemática. El mensaje se trata como un flujo de bits empaquetado: se parte en bloques
+de k bits, cada bloque es un entero de 64 bits y la paridad y el síndrome se calculan en
+paralelo para todos los bloques (AND con cada fila de H y paridad de la población). La
+corrección usa una tabla síndrome -> máscara de error
+"""
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import canal
+from vectorizado import ESTADO_OK, ESTADO_CORREGIDO, ESTADO_NO_CORREGIBLE
+
+# Palabras por bloque de trabajo de `codificar`/`decodificar` (múltiplo de 8)
+PALABRAS_POR_BLOQUE = 1 << 16
+# Semilla de los flujos aleatorios de `simular_bsc` (distinta de los de canal.rng_barrido)
+_ID_FEC = 3
+
+
+def _poblacion(x: np.ndarray) -> np.ndarray:
+    """Número de bits a 1 de cada entero de `x` (uint64)."""
+    if hasattr(np, 'bitwise_count'):  # NumPy >= 2.0
+        return np.bitwise_count(x)
+    return np.unpackbits(x.astype(np.uint64).view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1, dtype=np.uint8)
+
+
+def _paridad(x: np.ndarray) -> np.ndarray:
+    """Paridad (0/1) de cada entero de `x` (uint64)."""
+    return _poblacion(x) & np.uint8(1)
+
+
+@dataclass(frozen=True)
+class CodigoHamming:
+    """Hamming(n, k) con n = 2^m - 1 y k = n - m; con `extendido`, SECDED(n+1, k).
+
+    Palabra sistemática (bit más significativo primero): k bits de datos, m bits de
+    paridad y, si es extendido, un bit de paridad global. La columna de H de cada bit de
+    paridad es una potencia de 2 y la de cada bit de datos uno de los demás valores no
+    nulos de m bits, así que el síndrome de un error simple es la columna del bit erróneo.
+    """
+    m: int
+    extendido: bool = False
+    _filas_datos: tuple = field(init=False, repr=False, compare=False)
+    _filas_h: tuple = field(init=False, repr=False, compare=False)
+    _tabla_errores: np.ndarray = field(init=False, repr=False, compare=False)
+    _tablas: tuple = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not 2 <= self.m <= 6:
+            raise ValueError("m debe estar entre 2 y 6 (palabras de hasta 64 bits)")
+        n, k, m = self.n_hamming, self.k, self.m
+        columnas_datos = [c for c in range(1, n + 1) if c & (c - 1)]  # no potencias de 2
+        # Bit j de datos (j = 0 el más significativo) -> posición k-1-j + m en la palabra de n bits
+        filas_datos = []
+        filas_h = []
+        for i in range(m):
+            fila = 0
+            for j, columna in enumerate(columnas_datos):
+                if columna >> i & 1:
+                    fila |= 1 << (k - 1 - j)
+            filas_datos.append(np.uint64(fila))
+            filas_h.append(np.uint64(fila << m | 1 << i))
+        # Síndrome -> máscara de error (sobre la palabra de n bits) del único bit con esa columna
+        tabla = np.zeros(1 << m, dtype=np.uint64)
+        for i in range(m):
+            tabla[1 << i] = 1 << i
+        for j, columna in enumerate(columnas_datos):
+            tabla[columna] = 1 << (k - 1 - j + m)
+        object.__setattr__(self, '_filas_datos', tuple(filas_datos))
+        object.__setattr__(self, '_filas_h', tuple(filas_h))
+        object.__setattr__(self, '_tabla_errores', tabla)
+        # Palabras de hasta 16 bits: codificación y decodificación completas por tabla
+        tablas = None
+        if self.n <= 16:
+            todas = np.arange(1 << self.n, dtype=np.uint64)
+            datos, estados = self._decodificar_paridad(todas)
+            tablas = (self._codificar_paridad(np.arange(1 << k, dtype=np.uint64)).astype(np.uint16),
+                      datos.astype(np.uint16), estados)
+        object.__setattr__(self, '_tablas', tablas)
+
+    @property
+    def n_hamming(self) -> int:
+        return (1 << self.m) - 1
+
+    @property
+    def n(self) -> int:
+        """Bits por palabra de código."""
+        return self.n_hamming + int(self.extendido)
+
+    @property
+    def k(self) -> int:
+        """Bits de datos por palabra."""
+        return self.n_hamming - self.m
+
+    @property
+    def nombre(self) -> str:
+        return f"{'SECDED' if self.extendido else 'Hamming'}({self.n},{self.k})"
+
+    @property
+    def overhead(self) -> float:
+        """Bits de redundancia por bit de datos."""
+        return (self.n - self.k) / self.k
+
+    def codificar_bloques(self, datos: np.ndarray) -> np.ndarray:
+        """Palabras de código (uint64, n bits) de cada bloque de k bits de `datos`."""
+        if self._tablas is not None:
+            return np.take(self._tablas[0], datos).astype(np.uint64)
+        return self._codificar_paridad(datos)
+
+    def _codificar_paridad(self, datos: np.ndarray) -> np.ndarray:
+        datos = datos.astype(np.uint64, copy=False)
+        palabras = datos << np.uint64(self.m)
+        for i, fila in enumerate(self._filas_datos):
+            palabras |= _paridad(datos & fila).astype(np.uint64) << np.uint64(i)
+        if self.extendido:
+            palabras = (palabras << np.uint64(1)) | _paridad(palabras).astype(np.uint64)
+        return palabras
+
+    def sindromes(self, palabras: np.ndarray) -> np.ndarray:
+        """Síndrome de m bits de cada palabra (sin la paridad global en SECDED)."""
+        base = palabras >> np.uint64(1) if self.extendido else palabras
+        sindrome = np.zeros(len(palabras), dtype=np.int64)
+        for i, fila in enumerate(self._filas_h):
+            sindrome |= _paridad(base & fila).astype(np.int64) << i
+        return sindrome
+
+    def decodificar_bloques(self, palabras: np.ndarray) -> tuple:
+        """Corrige las palabras recibidas y devuelve (datos de k bits, estado de cada palabra).
+
+        Hamming corrige todo error simple, pero un error doble tiene el síndrome de otro
+        bit y se "corrige" mal sin aviso. SECDED usa la paridad global: síndrome no nulo
+        con paridad par es un error doble, que se señala como no corregible.
+        """
+        if self._tablas is not None:
+            return np.take(self._tablas[1], palabras).astype(np.uint64), np.take(self._tablas[2], palabras)
+        return self._decodificar_paridad(palabras)
+
+    def _decodificar_paridad(self, palabras: np.ndarray) -> tuple:
+        palabras = palabras.astype(np.uint64, copy=False)
+        sindrome = self.sindromes(palabras)
+        errores = np.take(self._tabla_errores, sindrome)
+        if not self.extendido:
+            corregidas = palabras ^ errores
+            estados = np.where(sindrome != 0, ESTADO_CORREGIDO, ESTADO_OK).astype(np.uint8)
+            return corregidas >> np.uint64(self.m), estados
+        impar = _paridad(palabras).astype(bool)
+        doble = (sindrome != 0) & ~impar
+        base = (palabras >> np.uint64(1)) ^ np.where(impar, errores, np.uint64(0))
+        estados = np.where(doble, ESTADO_NO_CORREGIBLE,
+                           np.where(impar, ESTADO_CORREGIDO, ESTADO_OK)).astype(np.uint8)
+        return base >> np.uint64(self.m), estados
+
+    def codificar(self, datos: bytes) -> np.ndarray:
+        """Codifica un mensaje completo: flujo de bits empaquetado (uint8) de palabras de n bits.
+
+        Trabaja por bloques de PALABRAS_POR_BLOQUE palabras (k y n bytes por cada 8
+        palabras, así que los bloques empiezan en byte entero). El último bloque de
+        datos se rellena con ceros hasta k bits.
+        """
+        datos = np.frombuffer(datos, dtype=np.uint8)
+        paso = self.k * PALABRAS_POR_BLOQUE // 8
+        partes = []
+        for desde in range(0, len(datos), paso):
+            bloque = datos[desde:desde + paso]
+            campos = leer_campos(bloque, self.k, -(-len(bloque) * 8 // self.k))
+            partes.append(escribir_campos(self.codificar_bloques(campos), self.n))
+        return np.concatenate(partes) if partes else np.empty(0, dtype=np.uint8)
+
+    def decodificar(self, flujo: np.ndarray, longitud: int) -> tuple:
+        """Inversa de `codificar`: (bytes de datos (`longitud`), estado de cada palabra)."""
+        flujo = np.asarray(flujo, dtype=np.uint8)
+        paso = self.n * PALABRAS_POR_BLOQUE // 8
+        pendientes = -(-longitud * 8 // self.k)
+        datos, estados = [], []
+        for desde in range(0, len(flujo), paso):
+            palabras = min(PALABRAS_POR_BLOQUE, pendientes)
+            pendientes -= palabras
+            bloque, estado = self.decodificar_bloques(leer_campos(flujo[desde:desde + paso], self.n, palabras))
+            datos.append(escribir_campos(bloque, self.k))
+            estados.append(estado)
+        if not datos:
+            return b"", np.empty(0, dtype=np.uint8)
+        return np.concatenate(datos)[:longitud].tobytes(), np.concatenate(estados)
+
+
+def leer_campos(octetos: np.ndarray, ancho: int, n: int) -> np.ndarray:
+    """Lee `n` campos consecutivos de `ancho` bits (<= 64, MSB primero) de un flujo de bytes.
+
+    8 campos ocupan exactamente `ancho` bytes, así que el flujo se ve como una matriz
+    de grupos x `ancho` bytes y cada uno de los 8 campos del grupo se arma con columnas
+    y desplazamientos fijos: operaciones sobre columnas enteras, sin índices por campo.
+    """
+    if ancho in (8, 16, 32, 64) or ancho == 4:
+        return _leer_alineados(octetos, ancho, n)
+    grupos = -(-n // 8)
+    relleno = np.zeros(grupos * ancho, dtype=np.uint8)
+    usados = min(len(octetos), len(relleno))
+    relleno[:usados] = octetos[:usados]
+    columnas = relleno.reshape(grupos, ancho).T.astype(np.uint64)
+    campos = np.empty((grupos, 8), dtype=np.uint64)
+    for r in range(8):
+        inicio, fin = r * ancho, (r + 1) * ancho
+        b0, b1 = inicio >> 3, (fin - 1) >> 3
+        if b0 == b1:
+            campos[:, r] = (columnas[b0] >> np.uint64(8 * b0 + 8 - fin)) & np.uint64((1 << ancho) - 1)
+            continue
+        valor = columnas[b0] & np.uint64((1 << (8 * b0 + 8 - inicio)) - 1)
+        for b in range(b0 + 1, b1):
+            valor = (valor << np.uint64(8)) | columnas[b]
+        ultimos = fin - 8 * b1
+        campos[:, r] = (valor << np.uint64(ultimos)) | (columnas[b1] >> np.uint64(8 - ultimos))
+    return campos.reshape(-1)[:n]
+
+
+def _leer_alineados(octetos: np.ndarray, ancho: int, n: int) -> np.ndarray:
+    """`leer_campos` para campos de 4 bits o de bytes enteros (vistas directas)."""
+    necesarios = -(-n * ancho // 8)
+    relleno = np.zeros(necesarios, dtype=np.uint8)
+    usados = min(len(octetos), necesarios)
+    relleno[:usados] = octetos[:usados]
+    if ancho == 4:
+        return np.stack((relleno >> 4, relleno & 0xF), axis=1).reshape(-1)[:n].astype(np.uint64)
+    return relleno.view(f'>u{ancho // 8}').astype(np.uint64)
+
+
+def escribir_campos(valores: np.ndarray, ancho: int) -> np.ndarray:
+    """Inversa de `leer_campos`: concatena los `ancho` bits bajos de cada valor.
+
+    Cada byte de la matriz de grupos toma bits de los pocos campos que lo cruzan,
+    también con desplazamientos fijos por columna.
+    """
+    n = len(valores)
+    if ancho in (8, 16, 32, 64):
+        return valores.astype(f'>u{ancho // 8}').view(np.uint8)
+    if ancho == 4:
+        nibbles = np.zeros(n + n % 2, dtype=np.uint8)
+        nibbles[:n] = valores
+        return (nibbles[0::2] << 4) | nibbles[1::2]
+    grupos = -(-n // 8)
+    campos = np.zeros(grupos * 8, dtype=np.uint64)
+    campos[:n] = valores
+    campos = campos.reshape(grupos, 8).T.copy()
+    salida = np.zeros((ancho, grupos), dtype=np.uint8)
+    for c in range(ancho):
+        byte = np.zeros(grupos, dtype=np.uint64)
+        for r in range(8 * c // ancho, (8 * c + 7) // ancho + 1):
+            lo, hi = max(8 * c, r * ancho), min(8 * c + 8, (r + 1) * ancho)
+            parte = (campos[r] >> np.uint64((r + 1) * ancho - hi)) & np.uint64((1 << (hi - lo)) - 1)
+            byte |= parte << np.uint64(8 * c + 8 - hi)
+        salida[c] = byte
+    return salida.T.reshape(-1)[:-(-n * ancho // 8)]
+
+
+CODIGOS_HAMMING = {f"{'secded' if ext else 'ham'}{(1 << m) - 1 + ext}": CodigoHamming(m, ext)
+                   for ext in (False, True) for m in (3, 4, 5, 6)}
+
+
+def simular_bsc(codigo: CodigoHamming, bits_datos: int, p: float, semilla: int, indice_p: int = 0) -> dict:
+    """Pasa `bits_datos` bits de datos codificados con `codigo` por un BSC(p).
+
+    El código es lineal y el decodificador también lo es respecto del error (como en
+    canal._fragmento_bsc), así que basta con decodificar las máscaras de error de las
+    palabras afectadas: el dato entregado es el original XOR los datos decodificados
+    de la máscara.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(
+        semilla, spawn_key=(_ID_FEC, indice_p, codigo.m, int(codigo.extendido))))
+    palabras = -(-bits_datos // codigo.k)
+    _, mascaras = canal.mascaras_desde_posiciones(canal.posiciones_bsc(palabras * codigo.n, p, rng), codigo.n)
+    errores, estados = codigo.decodificar_bloques(mascaras.astype(np.uint64))
+    senalado = estados == ESTADO_NO_CORREGIBLE
+    dato_erroneo = errores != 0
+    return {
+        'codigo': codigo.nombre,
+        'overhead': codigo.overhead,
+        'p': p,
+        'palabras': palabras,
+        'palabras_error': len(mascaras),
+        'corregidas': int(np.count_nonzero((estados == ESTADO_CORREGIDO) & ~dato_erroneo)),
+        'no_corregibles': int(np.count_nonzero(senalado)),
+        'mal_corregidas': int(np.count_nonzero(dato_erroneo & ~senalado)),
+        'ber_residual': int(_poblacion(errores[~senalado]).sum()) / (palabras * codigo.k) if palabras else 0.0,
+        'goodput': (palabras - int(np.count_nonzero(dato_erroneo | senalado))) * codigo.k / (palabras * codigo.n)
+        if palabras else 0.0,
+    }
+
+
+def medir_throughput(codigo: CodigoHamming, datos: bytes) -> tuple:
+    """MB/s de codificar y decodificar `datos` como un único mensaje."""
+    inicio = time.perf_counter()
+    flujo = codigo.codificar(datos)
+    medio = time.perf_counter()
+    codigo.decodificar(flujo, len(datos))
+    fin = time.perf_counter()
+    mb = len(datos) / (1024 * 1024)
+    return mb / max(medio - inicio, 1e-9), mb / max(fin - medio, 1e-9)
+
+
+def imprimir_comparacion(filas: list, throughput: dict = None):
+    """Imprime una fila por (código, p) de `simular_bsc`; `throughput`: nombre -> (MB/s cod., MB/s dec.)."""
+    print(f"{'Código':16} {'Overhead':>8} {'p':>9} {'Pal. error':>10} {'Corregidas':>10} {'Detectadas':>10} "
+          f"{'Mal corr.':>10} {'BER resid.':>11} {'Goodput':>8}" + (f" {'Cod. MB/s':>10} {'Dec. MB/s':>10}" if throughput else ""))
+    for fila in filas:
+        linea = (f"{fila['codigo']:16} {fila['overhead'] * 100:7.1f}% {fila['p']:9.2e} {fila['palabras_error']:10d} "
+                 f"{fila['corregidas']:10d} {fila['no_corregibles']:10d} {fila['mal_corregidas']:10d} "
+                 f"{fila['ber_residual']:11.3e} {fila['goodput']:8.4f}")
+        if throughput:
+            cod, dec = throughput[fila['codigo']]
+            linea += f" {cod:10.1f} {dec:10.1f}"
+        print(linea)
@@ -1,9 +1,15 @@
+import os
 import time
 import random
 import sys
 import argparse
+import functools
+import itertools
 import threading
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import modelos_crc
+from modelos_crc import TAMANO_CACHE_TABLAS
 
 # --- IMPLEMENTACIÓN DE CRC-8 ---
 
@@ -12,7 +18,9 @@ from dataclasses import dataclass
 # pero aquí haremos la división larga explícita para mayor claridad.
 POLINOMIO_CRC = 0b100000111
 
-# Polinomios CRC adicionales comunes
+# Polinomios CRC adicionales comunes. La simulación por byte solo depende del polinomio
+# generador; el algoritmo completo (init, reflexión, xorout) de cada nombre está en
+# modelos_crc.ALIAS_CRC / CATALOGO_CRC (p. ej. 'CRC-32' es CRC-32/ISO-HDLC, el de Ethernet y zlib)
 POLINOMIOS_CRC = {
     'CRC-8': 0b100000111,      # x^8 + x^2 + x + 1
     'CRC-8-CCITT': 0b100000111,
@@ -21,9 +29,6 @@ POLINOMIOS_CRC = {
     'CRC-32': 0x104C11DB7,     # Ethernet polynomial
 }
 
-# Cache para tablas de lookup CRC
-_crc_tables = {}
-
 def generar_tabla_crc(poly: int, bits: int = 8) -> list:
     """Genera tabla de lookup para cálculos CRC rápidos."""
     degree = poly.bit_length() - 1
@@ -38,6 +43,136 @@ def generar_tabla_crc(poly: int, bits: int = 8) -> list:
         tabla.append(valor & ((1 << degree) - 1))
     return tabla
 
+def generar_tablas_slicing(poly: int, n: int = 8) -> list:
+    """Genera las `n` tablas para CRC slicing-by-N (grado múltiplo de 8, hasta 32).
+
+    tablas[k][b] es el CRC del byte `b` seguido de `k` bytes a cero. Los valores se
+    guardan alineados a 32 bits (desplazados 32 - grado) para que un mismo kernel
+    sirva para CRC-8, CRC-16 y CRC-32.
+    """
+    degree = poly.bit_length() - 1
+    mascara = (1 << degree) - 1
+    base = obtener_tabla_crc(poly)
+    tablas = [base]
+    for _ in range(1, n):
+        previa = tablas[-1]
+        tablas.append([((v << 8) & mascara) ^ base[v >> (degree - 8)] for v in previa])
+    alineacion = 32 - degree
+    return [[v << alineacion for v in t] for t in tablas]
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def obtener_tablas_slicing(poly: int, n: int = 8) -> list:
+    """Devuelve las tablas slicing-by-N de `poly` (caché LRU acotada)."""
+    return generar_tablas_slicing(poly, n)
+
+def _slicing_4(datos, tablas: list, crc: int) -> int:
+    t0, t1, t2, t3 = tablas
+    it = iter(datos)
+    for b0, b1, b2, b3 in zip(it, it, it, it):
+        crc = (t3[b0 ^ (crc >> 24)] ^ t2[b1 ^ ((crc >> 16) & 0xFF)]
+               ^ t1[b2 ^ ((crc >> 8) & 0xFF)] ^ t0[b3 ^ (crc & 0xFF)])
+    return crc
+
+def _slicing_8(datos, tablas: list, crc: int) -> int:
+    t0, t1, t2, t3, t4, t5, t6, t7 = tablas
+    it = iter(datos)
+    for b0, b1, b2, b3, b4, b5, b6, b7 in zip(it, it, it, it, it, it, it, it):
+        crc = (t7[b0 ^ (crc >> 24)] ^ t6[b1 ^ ((crc >> 16) & 0xFF)]
+               ^ t5[b2 ^ ((crc >> 8) & 0xFF)] ^ t4[b3 ^ (crc & 0xFF)]
+               ^ t3[b4] ^ t2[b5] ^ t1[b6] ^ t0[b7])
+    return crc
+
+def _slicing_16(datos, tablas: list, crc: int) -> int:
+    t0, t1, t2, t3, t4, t5, t6, t7, t8, t9, t10, t11, t12, t13, t14, t15 = tablas
+    it = iter(datos)
+    for (b0, b1, b2, b3, b4, b5, b6, b7,
+         b8, b9, b10, b11, b12, b13, b14, b15) in zip(*[it] * 16):
+        crc = (t15[b0 ^ (crc >> 24)] ^ t14[b1 ^ ((crc >> 16) & 0xFF)]
+               ^ t13[b2 ^ ((crc >> 8) & 0xFF)] ^ t12[b3 ^ (crc & 0xFF)]
+               ^ t11[b4] ^ t10[b5] ^ t9[b6] ^ t8[b7]
+               ^ t7[b8] ^ t6[b9] ^ t5[b10] ^ t4[b11]
+               ^ t3[b12] ^ t2[b13] ^ t1[b14] ^ t0[b15])
+    return crc
+
+_KERNELS_SLICING = {4: _slicing_4, 8: _slicing_8, 16: _slicing_16}
+
+def crc_mensaje_slicing(datos: bytes, poly: int = POLINOMIO_CRC, n: int = 8, crc_inicial: int = 0,
+                        acelerado: bool = True) -> int:
+    """Calcula el CRC de un mensaje consumiendo `n` bytes (4, 8 o 16) por iteración.
+
+    Da el mismo resultado que `crc_mensaje`. Si el grado no es múltiplo de 8 (o
+    `n` no está soportado) delega en `crc_mensaje`; los bytes sobrantes al final
+    también se procesan con la tabla byte a byte. Con `acelerado`, los polinomios
+    con rutina en C se delegan en `crc_mensaje`.
+    """
+    degree = poly.bit_length() - 1
+    kernel = _KERNELS_SLICING.get(n)
+    if (kernel is None or degree % 8 or not 8 <= degree <= 32
+            or acelerado and backend_crc_mensaje(poly) != modelos_crc.BACKEND_PYTHON):
+        return crc_mensaje(datos, poly, crc_inicial, acelerado)
+    vista = memoryview(datos).cast('B')
+    fin = len(vista) - len(vista) % n
+    alineacion = 32 - degree
+    crc = kernel(vista[:fin], obtener_tablas_slicing(poly, n), crc_inicial << alineacion) >> alineacion
+    return crc_mensaje(vista[fin:], poly, crc, acelerado)
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def obtener_tabla_crc(poly: int) -> list:
+    """Devuelve la tabla de lookup de `poly` (caché LRU acotada: los --poly a medida no la hacen crecer sin límite)."""
+    return generar_tabla_crc(poly)
+
+def _crc_mensaje_bit_a_bit(datos: bytes, poly: int, crc_inicial: int = 0) -> int:
+    """CRC de un mensaje con un registro desplazado bit a bit (cualquier grado)."""
+    degree = poly.bit_length() - 1
+    mascara = (1 << degree) - 1
+    crc = crc_inicial
+    for b in datos:
+        for i in range(7, -1, -1):
+            bit = ((crc >> (degree - 1)) ^ (b >> i)) & 1
+            crc = (crc << 1) & mascara
+            if bit:
+                crc ^= poly & mascara
+    return crc
+
+def backend_crc_mensaje(poly: int) -> str:
+    """Backend con el que `crc_mensaje` calcula `poly` (ver modelos_crc.kernel_c)."""
+    degree = poly.bit_length() - 1
+    kernel = modelos_crc.kernel_c(degree, poly & ((1 << degree) - 1), False)
+    return kernel[0] if kernel is not None else modelos_crc.BACKEND_PYTHON
+
+def crc_mensaje(datos: bytes, poly: int = POLINOMIO_CRC, crc_inicial: int = 0, acelerado: bool = True) -> int:
+    """Calcula el CRC de un mensaje completo (MSB primero, sin reflexión).
+
+    Es la división polinómica pura (init 0, sin xorout); los algoritmos estándar
+    completos se calculan con `modelos_crc.ModeloCRC`.
+
+    Para polinomios de grado 8 a 32 procesa un byte por iteración con la tabla
+    cacheada de 256 entradas; para otros grados usa el registro bit a bit.
+    `crc_inicial` permite encadenar el cálculo sobre fragmentos consecutivos.
+    Si el polinomio tiene una rutina en C en la biblioteca estándar (CRC-16-CCITT:
+    `binascii.crc_hqx`) se delega en ella.
+
+    Args:
+        datos: Mensaje a proteger
+        poly: Polinomio generador (con el bit de grado incluido)
+        crc_inicial: Valor del registro al empezar (0 = división larga clásica)
+        acelerado: False fuerza los kernels en Python (referencia y benchmarks)
+    """
+    degree = poly.bit_length() - 1
+    if acelerado:
+        kernel = modelos_crc.kernel_c(degree, poly & ((1 << degree) - 1), False)
+        if kernel is not None:
+            return kernel[1](crc_inicial, datos)
+    if not 8 <= degree <= 32:
+        return _crc_mensaje_bit_a_bit(datos, poly, crc_inicial)
+    tabla = obtener_tabla_crc(poly)
+    mascara = (1 << degree) - 1
+    desplazamiento = degree - 8
+    crc = crc_inicial
+    for b in datos:
+        crc = ((crc << 8) & mascara) ^ tabla[(crc >> desplazamiento) ^ b]
+    return crc
+
 def calcular_crc(datos_bits: int, poly: int = POLINOMIO_CRC, data_bits: int = 8, usar_tabla: bool = True) -> int:
     """Calcula el CRC para una palabra de `data_bits` bits usando `poly`.
 
@@ -52,12 +187,11 @@ def calcular_crc(datos_bits: int, poly: int = POLINOMIO_CRC, data_bits: int = 8,
     """
     degree = poly.bit_length() - 1
     
-    # Método optimizado con tabla de lookup (solo para bytes completos)
-    if usar_tabla and data_bits == 8 and degree == 8:
-        if poly not in _crc_tables:
-            _crc_tables[poly] = generar_tabla_crc(poly)
-        tabla = _crc_tables[poly]
-        return tabla[datos_bits & 0xFF]
+    # Método optimizado con tabla de lookup (bytes completos, grado 8..32)
+    if usar_tabla and 8 <= degree <= 32 and data_bits % 8 == 0 and data_bits > 0:
+        if data_bits == 8:
+            return obtener_tabla_crc(poly)[datos_bits & 0xFF]
+        return crc_mensaje(datos_bits.to_bytes(data_bits // 8, 'big'), poly)
     
     # Método tradicional bit a bit
     dividendo = datos_bits << degree  # anadimos degree ceros
@@ -68,9 +202,22 @@ def calcular_crc(datos_bits: int, poly: int = POLINOMIO_CRC, data_bits: int = 8,
             dividendo ^= (divisor >> i)
     return dividendo & ((1 << degree) - 1)
 
-def verificar_crc(datos_con_crc: int, poly: int = POLINOMIO_CRC, data_bits: int = 8) -> bool:
-    """Verifica si un paquete (data_bits + degree) tiene error usando `poly`."""
+def verificar_crc(datos_con_crc: int, poly: int = POLINOMIO_CRC, data_bits: int = 8, usar_tabla: bool = True) -> bool:
+    """Verifica si un paquete (data_bits + degree) tiene error usando `poly`.
+
+    Con `usar_tabla` recalcula el CRC de la parte de datos con la misma tabla
+    cacheada que `calcular_crc` y lo compara con el CRC recibido (equivalente a
+    comprobar que el resto de la división es 0). Si no, hace la división larga.
+    """
     degree = poly.bit_length() - 1
+    if usar_tabla and 8 <= degree <= 32:
+        if data_bits == 8:
+            tabla = obtener_tabla_crc(poly)
+            return tabla[(datos_con_crc >> degree) & 0xFF] == datos_con_crc & ((1 << degree) - 1)
+        if data_bits % 8 == 0 and data_bits > 0:
+            datos = (datos_con_crc >> degree) & ((1 << data_bits) - 1)
+            return crc_mensaje(datos.to_bytes(data_bits // 8, 'big'), poly) == datos_con_crc & ((1 << degree) - 1)
+
     dividendo = datos_con_crc
     shift = data_bits - 1
     divisor = poly << shift
@@ -79,6 +226,13 @@ def verificar_crc(datos_con_crc: int, poly: int = POLINOMIO_CRC, data_bits: int
             dividendo ^= (divisor >> i)
     return (dividendo & ((1 << degree) - 1)) == 0
 
+def verificar_crc_mensaje(trama: bytes, poly: int = POLINOMIO_CRC) -> bool:
+    """Verifica una trama de bytes (datos seguidos del CRC, grado múltiplo de 8).
+
+    El CRC de datos+CRC es 0 si la trama llegó sin errores detectables.
+    """
+    return crc_mensaje_slicing(trama, poly) == 0
+
 # --- IMPLEMENTACIÓN DE FEC (CÓDIGO DE HAMMING 12,8) ---
 
 def codificar_hamming(datos_bits: int) -> int:
@@ -132,12 +286,43 @@ def decodificar_corregir_hamming(codigo_recibido: int) -> int:
     # Si después de la corrección el síndrome no es 0, entonces hay múltiples errores: no corregible
     return codigo_recibido, 'no_corregible'
 
+def extraer_datos_hamming(codigo: int) -> int:
+    """Extrae el byte de datos (posiciones 3, 5-7 y 9-12) de una palabra de Hamming de 12 bits."""
+    return (((codigo >> 9) & 1) << 7) | (((codigo >> 5) & 0b111) << 4) | (codigo & 0b1111)
+
+# Tablas precalculadas de Hamming(12,8): solo hay 256 datos y 4096 palabras recibidas posibles
+_tabla_cod_hamming = None
+_tabla_dec_hamming = None
+
+def tabla_codificacion_hamming() -> list:
+    """Tabla de 256 entradas: byte de datos -> palabra de Hamming de 12 bits."""
+    global _tabla_cod_hamming
+    if _tabla_cod_hamming is None:
+        _tabla_cod_hamming = [codificar_hamming(b) for b in range(256)]
+    return _tabla_cod_hamming
+
+def tabla_decodificacion_hamming() -> list:
+    """Tabla de 4096 entradas: palabra recibida -> (palabra corregida, byte de datos, estado).
+
+    Se construye una sola vez a partir de `decodificar_corregir_hamming`, por lo que
+    da exactamente los mismos resultados que la decodificación bit a bit.
+    """
+    global _tabla_dec_hamming
+    if _tabla_dec_hamming is None:
+        tabla = []
+        for recibido in range(4096):
+            corregido, status = decodificar_corregir_hamming(recibido)
+            tabla.append((corregido, extraer_datos_hamming(corregido), status))
+        _tabla_dec_hamming = tabla
+    return _tabla_dec_hamming
+
 # --- UTILIDADES DE SIMULACIÓN Y PROGRESO ---
 
 # Tipos de errores para simulación más realista
 TIPO_ERROR_UN_BIT = 'un_bit'
 TIPO_ERROR_DOS_BITS = 'dos_bits'
 TIPO_ERROR_RAFAGA = 'rafaga'  # burst error
+TIPO_ERROR_GILBERT = 'gilbert'  # canal de Gilbert–Elliott sobre todo el flujo (requiere numpy, ver canal.py)
 
 def simular_error_un_bit(valor: int, ancho_bits: int) -> int:
     """Invierte un bit aleatorio dentro de un valor de 'ancho_bits' bits."""
@@ -162,7 +347,11 @@ def simular_error_rafaga(valor: int, ancho_bits: int, longitud_rafaga: int = 3)
     return resultado
 
 def simular_error(valor: int, ancho_bits: int, tipo_error: str = TIPO_ERROR_UN_BIT) -> int:
-    """Simula un error según el tipo especificado."""
+    """Simula un error según el tipo especificado en una sola palabra.
+
+    Los bucles de simulación usan `fuente_mascaras`, que genera las mismas máscaras
+    por bloques (y admite TIPO_ERROR_GILBERT, que tiene memoria entre palabras).
+    """
     if tipo_error == TIPO_ERROR_DOS_BITS:
         return simular_error_multiples_bits(valor, ancho_bits, 2)
     elif tipo_error == TIPO_ERROR_RAFAGA:
@@ -170,6 +359,102 @@ def simular_error(valor: int, ancho_bits: int, tipo_error: str = TIPO_ERROR_UN_B
     else:  # TIPO_ERROR_UN_BIT
         return simular_error_un_bit(valor, ancho_bits)
 
+# Partición común de la entrada: todos los motores simulan por fragmentos de este tamaño,
+# cada uno con su propio flujo aleatorio derivado de la semilla (canal.rng_fragmento).
+# No depende del motor ni del número de procesos, así que una semilla fija reproduce la ejecución
+TAMANO_FRAGMENTO = 1 << 20
+
+# Cache de tablas de máscaras: (tipo_error, ancho_bits) -> lista de máscaras
+_tablas_mascaras = {}
+# Máscaras por bloque en la fuente sin numpy
+TAMANO_BLOQUE_MASCARAS = 1 << 16
+
+def tabla_mascaras(tipo_error: str, ancho_bits: int) -> list:
+    """Todas las máscaras posibles de un modelo de una palabra, equiprobables (cacheada).
+
+    Sortear un índice de esta tabla equivale a `simular_error`: un bit cualquiera,
+    una pareja de bits distintos o una ráfaga de 3 bits que empieza en 0..ancho-3.
+    """
+    clave = (tipo_error, ancho_bits)
+    tabla = _tablas_mascaras.get(clave)
+    if tabla is None:
+        if tipo_error == TIPO_ERROR_DOS_BITS:
+            num_errores = min(2, ancho_bits)
+            tabla = [sum(1 << p for p in posiciones)
+                     for posiciones in itertools.combinations(range(ancho_bits), num_errores)]
+        elif tipo_error == TIPO_ERROR_RAFAGA:
+            tabla = [(0b111 << inicio) & ((1 << ancho_bits) - 1) for inicio in range(max(0, ancho_bits - 3) + 1)]
+        else:  # TIPO_ERROR_UN_BIT
+            tabla = [1 << p for p in range(ancho_bits)]
+        _tablas_mascaras[clave] = tabla
+    return tabla
+
+def nueva_semilla() -> int:
+    """Semilla raíz aleatoria para una ejecución sin --seed (se muestra para poder repetirla)."""
+    try:
+        import canal
+    except ImportError:
+        return random.SystemRandom().getrandbits(64)
+    return canal.semilla_aleatoria()
+
+def fuente_mascaras(tipo_error: str, ancho_bits: int, n: int, codec: str, semilla: int = None,
+                    parametros_canal=None, indice_inicial: int = 0, intercalador=None):
+    """Iterador de las máscaras de error (enteros) de `n` palabras, para los bucles escalares.
+
+    Con numpy usa `canal.mascaras_flujo`: mismos fragmentos, semillas y bloques que
+    los motores vectorizado y paralelo, así que con la misma `semilla` todos dan
+    el mismo `Resultado`. Sin numpy sortea índices de `tabla_mascaras` en bloque
+    con `random.choices` (reproducible, pero distinto de los motores NumPy). En
+    ningún caso se llama al generador por palabra. `intercalador`
+    (intercalado.Intercalador) requiere numpy y palabras de hasta 64 bits.
+    """
+    semilla = semilla if semilla is not None else nueva_semilla()
+    try:
+        import canal
+    except ImportError:
+        if tipo_error == TIPO_ERROR_GILBERT:
+            raise
+        canal = None
+    if canal is None or (ancho_bits > 64 and tipo_error != TIPO_ERROR_GILBERT):
+        # Sin numpy, o palabras que no caben en un entero de NumPy (polinomios de grado > 56)
+        if intercalador is not None:
+            raise ValueError("El intercalado requiere numpy y palabras de hasta 64 bits")
+        return _fuente_mascaras_random(tabla_mascaras(tipo_error, ancho_bits), n, codec, semilla, indice_inicial)
+    return canal.mascaras_flujo(tipo_error, ancho_bits, n, codec, semilla, parametros_canal, indice_inicial,
+                                intercalador)
+
+def _fuente_mascaras_random(tabla: list, n: int, codec: str, semilla: int, indice_inicial: int):
+    for i, desde in enumerate(range(0, n, TAMANO_FRAGMENTO), start=indice_inicial):
+        generador = random.Random(f"{semilla}:{codec}:{i}")
+        restantes = min(TAMANO_FRAGMENTO, n - desde)
+        while restantes > 0:
+            bloque = min(TAMANO_BLOQUE_MASCARAS, restantes)
+            yield from generador.choices(tabla, k=bloque)
+            restantes -= bloque
+
+# Motores de simulación disponibles
+MOTOR_ESCALAR = 'escalar'
+MOTOR_VECTORIZADO = 'vectorizado'  # NumPy, ver vectorizado.py
+MOTOR_PARALELO = 'paralelo'  # NumPy en un pool de procesos, ver paralelo.py
+
+# Código corrector de la simulación principal: Hamming(12,8) por byte, Reed–Solomon (reed_solomon.py)
+# o convolucional K=7 con Viterbi (convolucional.py); los dos últimos requieren NumPy
+FEC_HAMMING = 'hamming'
+FEC_RS_255_223 = 'rs255'
+FEC_RS_204_188 = 'rs204'
+FEC_CONV_1_2 = 'conv12'
+FEC_CONV_2_3 = 'conv23'
+FEC_CONV_3_4 = 'conv34'
+CODIGOS_FEC = [FEC_HAMMING, FEC_RS_255_223, FEC_RS_204_188, FEC_CONV_1_2, FEC_CONV_2_3, FEC_CONV_3_4]
+
+def codec_fec(fec: str) -> tuple:
+    """(simulación por lotes, código) de un `fec` de CODIGOS_FEC distinto de Hamming (importa NumPy)."""
+    if fec in (FEC_RS_255_223, FEC_RS_204_188):
+        import reed_solomon
+        return reed_solomon.procesar_rs_lote, reed_solomon.CODIGOS_RS[fec]
+    import convolucional
+    return convolucional.procesar_conv_lote, convolucional.CODIGOS_CONV[fec]
+
 def barra_progreso(nombre: str, hecho: int, total: int, ancho: int = 30, extra: str = "") -> str:
     if total <= 0:
         total = 1
@@ -178,6 +463,103 @@ def barra_progreso(nombre: str, hecho: int, total: int, ancho: int = 30, extra:
     vacios = ancho - llenos
     return f"{nombre:8} |[" + "#" * llenos + "." * vacios + f"] {porcentaje*100:6.2f}% ({hecho}/{total}) {extra}"
 
+class ReportadorProgreso:
+    """Publica los contadores de un codec en `estado[clave]` por tramos, no por byte.
+
+    Publica cada `cada_bytes` bytes o cada `cada_ms` milisegundos, lo que ocurra
+    primero: tras cada publicación el tramo se recalcula con la velocidad medida
+    para que la siguiente caiga a unos `cada_ms`. El bucle caliente solo compara
+    `procesados >= proximo`; el lock y las escrituras al dict se pagan por tramo.
+    """
+
+    def __init__(self, estado: dict, lock: threading.Lock, clave: str,
+                 cada_bytes: int = 65536, cada_ms: float = 50.0):
+        self.estado = estado
+        self.lock = lock
+        self.clave = clave
+        self.cada_bytes = max(1, cada_bytes)
+        self.cada_ms = cada_ms
+        self.proximo = 1
+        self._ultimo_t = time.perf_counter()
+        self._ultimos_procesados = 0
+
+    def publicar(self, procesados: int, **contadores) -> int:
+        """Escribe `procesados` y `contadores` bajo el lock y devuelve el próximo umbral."""
+        with self.lock:
+            destino = self.estado[self.clave]
+            destino['procesados'] = procesados
+            destino.update(contadores)
+        ahora = time.perf_counter()
+        avanzados = procesados - self._ultimos_procesados
+        transcurrido = ahora - self._ultimo_t
+        if avanzados > 0 and transcurrido > 0:
+            paso = int(avanzados * (self.cada_ms / 1000.0) / transcurrido)
+        else:
+            paso = self.cada_bytes
+        self._ultimo_t = ahora
+        self._ultimos_procesados = procesados
+        self.proximo = procesados + max(1, min(self.cada_bytes, paso))
+        return self.proximo
+
+# Etapas del bucle caliente que mide el perfil opcional (`perfil=True` en los motores)
+ETAPA_CODIFICAR = 'codificar'
+ETAPA_CANAL = 'canal'  # generar las máscaras de error e inyectarlas
+ETAPA_DECODIFICAR = 'decodificar'  # verificar / corregir y contar
+ETAPA_PROGRESO = 'progreso'  # publicar en `estado` (incluye esperar el lock)
+ETAPA_ESPERA = 'espera'  # retardo artificial de --sleep-ms
+ETAPAS_PERFIL = [ETAPA_CODIFICAR, ETAPA_CANAL, ETAPA_DECODIFICAR, ETAPA_PROGRESO, ETAPA_ESPERA]
+
+# Bytes por tramo del motor escalar cuando mide el perfil: cada etapa se aplica a un
+# tramo entero entre dos lecturas del reloj, en lugar de leerlo varias veces por byte
+TRAMO_PERFIL = 4096
+
+@dataclass
+class PerfilEtapas:
+    """Tiempo acumulado y número de llamadas por etapa, y tiempo de CPU frente a pared.
+
+    Solo se crea cuando el motor se llama con `perfil=True`; sin él los bucles no
+    leen el reloj por etapa. `cpu_ms` es el tiempo de CPU del hilo (o la suma de
+    los procesos, en el motor paralelo) y `pared_ms` el tiempo de reloj.
+    """
+    tiempos_ms: dict = field(default_factory=dict)
+    llamadas: dict = field(default_factory=dict)
+    cpu_ms: float = 0.0
+    pared_ms: float = 0.0
+
+    def sumar(self, etapa: str, desde: float, llamadas: int = 1) -> float:
+        """Acumula en `etapa` el tiempo transcurrido desde `desde` y devuelve el instante actual."""
+        ahora = time.perf_counter()
+        self.tiempos_ms[etapa] = self.tiempos_ms.get(etapa, 0.0) + (ahora - desde) * 1000.0
+        self.llamadas[etapa] = self.llamadas.get(etapa, 0) + llamadas
+        return ahora
+
+    @property
+    def medido_ms(self) -> float:
+        """Suma de los tiempos de todas las etapas."""
+        return sum(self.tiempos_ms.values())
+
+    @classmethod
+    def combinar(cls, perfiles: list, pared_ms: float) -> 'PerfilEtapas':
+        """Suma los perfiles de varios parciales; `pared_ms` es el tiempo de reloj del conjunto."""
+        combinado = cls(pared_ms=pared_ms)
+        for p in perfiles:
+            for etapa, ms in p.tiempos_ms.items():
+                combinado.tiempos_ms[etapa] = combinado.tiempos_ms.get(etapa, 0.0) + ms
+            for etapa, n in p.llamadas.items():
+                combinado.llamadas[etapa] = combinado.llamadas.get(etapa, 0) + n
+            combinado.cpu_ms += p.cpu_ms
+        return combinado
+
+    def lineas(self) -> list:
+        """Líneas de texto con el desglose por etapa, para el resumen de la CLI y la GUI."""
+        medido = self.medido_ms or 1.0
+        lineas = [f"Pared {self.pared_ms:.3f} ms, CPU {self.cpu_ms:.3f} ms"]
+        for etapa in ETAPAS_PERFIL:
+            if etapa in self.tiempos_ms:
+                ms = self.tiempos_ms[etapa]
+                lineas.append(f"{etapa:12} {ms:10.3f} ms {ms / medido * 100:5.1f}%  {self.llamadas[etapa]} llamadas")
+        return lineas
+
 @dataclass
 class Resultado:
     total: int
@@ -190,6 +572,8 @@ class Resultado:
     no_corregibles: int = 0
     falsos_positivos: int = 0
     overhead_bits: int = 0
+    perfil: PerfilEtapas = None  # solo con perfil=True
+    backend_crc: str = None  # backend del CRC del mensaje completo (modelos_crc.BACKEND_*)
     
     @property
     def tasa_deteccion(self) -> float:
@@ -221,49 +605,139 @@ class Resultado:
             return 0.0
         return (self.total / (self.tiempo_ms / 1000)) / (1024 * 1024)
 
+    @property
+    def throughput_codec(self) -> float:
+        """Throughput en MB/s contando solo codificar + decodificar (requiere `perfil`)."""
+        if self.perfil is None:
+            return 0.0
+        ms = self.perfil.tiempos_ms.get(ETAPA_CODIFICAR, 0.0) + self.perfil.tiempos_ms.get(ETAPA_DECODIFICAR, 0.0)
+        return (self.total / (ms / 1000)) / (1024 * 1024) if ms else 0.0
+
+
+def combinar_resultados(resultados: list, tiempo_ms: float, metrica: str = "") -> Resultado:
+    """Suma los contadores de varios `Resultado` parciales (fragmentos de un mismo codec).
 
-def procesar_crc(bytes_data: bytes, estado: dict, lock: threading.Lock, sleep_ms: float = 0.0, poly: int = POLINOMIO_CRC, tipo_error: str = TIPO_ERROR_UN_BIT) -> Resultado:
-    """Procesa datos con CRC y simula errores para evaluar detección."""
+    `tiempo_ms` es el tiempo de pared de la ejecución completa, no la suma de los
+    tiempos parciales (que se solapan cuando los fragmentos corren en paralelo).
+    Los perfiles por etapa, si los hay, se suman.
+    """
+    perfiles = [r.perfil for r in resultados if r.perfil is not None]
+    return Resultado(
+        total=sum(r.total for r in resultados),
+        procesados=sum(r.procesados for r in resultados),
+        tiempo_ms=tiempo_ms,
+        metrica=metrica,
+        detectados=sum(r.detectados for r in resultados),
+        corregidos=sum(r.corregidos for r in resultados),
+        no_detectados=sum(r.no_detectados for r in resultados),
+        no_corregibles=sum(r.no_corregibles for r in resultados),
+        falsos_positivos=sum(r.falsos_positivos for r in resultados),
+        overhead_bits=sum(r.overhead_bits for r in resultados),
+        perfil=PerfilEtapas.combinar(perfiles, tiempo_ms) if perfiles else None,
+        backend_crc=next((r.backend_crc for r in resultados if r.backend_crc is not None), None),
+    )
+
+
+def procesar_crc(bytes_data: bytes, estado: dict, lock: threading.Lock, sleep_ms: float = 0.0, poly: int = POLINOMIO_CRC, tipo_error: str = TIPO_ERROR_UN_BIT,
+                 parametros_canal=None, semilla: int = None, indice_inicial: int = 0, perfil: bool = False,
+                 intercalador=None) -> Resultado:
+    """Procesa datos con CRC y simula errores para evaluar detección.
+
+    `parametros_canal` (canal.ParametrosGilbertElliott) solo se usa con TIPO_ERROR_GILBERT.
+    `intercalador` (intercalado.Intercalador) intercala las palabras ante el canal.
+    `semilla` e `indice_inicial` (fragmento de la entrada en que empieza `bytes_data`)
+    fijan las máscaras de error; ver `fuente_mascaras`. Con `perfil` recorre la
+    entrada por tramos de TRAMO_PERFIL bytes, una etapa cada vez, y devuelve el
+    desglose en `Resultado.perfil` (mismos contadores).
+    """
+    degree = poly.bit_length() - 1
+    # La fuente se prepara fuera del tiempo medido (importa numpy la primera vez)
+    mascaras = fuente_mascaras(tipo_error, 8 + degree, len(bytes_data), 'crc', semilla, parametros_canal, indice_inicial,
+                               intercalador)
     inicio = time.perf_counter()
     total = len(bytes_data)
     detectados = 0
     no_detectados = 0
     falsos_positivos = 0
     procesados = 0
-    degree = poly.bit_length() - 1
-    
-    for b in bytes_data:
-        # Codificar
-        crc = calcular_crc(b, poly=poly)
-        paquete = (b << degree) | crc  # bits de datos + CRC
+    usar_tabla = 8 <= degree <= 32
+    tabla = obtener_tabla_crc(poly) if usar_tabla else None
+    mascara_crc = (1 << degree) - 1
+    reportador = ReportadorProgreso(estado, lock, 'crc')
+    proximo = reportador.proximo
+    medicion = PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+
+    if medicion is not None:
+        while procesados < total:
+            marca = time.perf_counter()
+            hasta = min(total, procesados + TRAMO_PERFIL, max(proximo, procesados + 1))
+            bloque = bytes_data[procesados:hasta]
+            if usar_tabla:
+                paquetes = [(b << degree) | tabla[b] for b in bloque]
+            else:
+                paquetes = [(b << degree) | calcular_crc(b, poly=poly, usar_tabla=False) for b in bloque]
+            marca = medicion.sumar(ETAPA_CODIFICAR, marca)
+            recibidos = [p ^ m for p, m in zip(paquetes, itertools.islice(mascaras, len(bloque)))]
+            marca = medicion.sumar(ETAPA_CANAL, marca)
+            for paquete, recibido in zip(paquetes, recibidos):
+                if usar_tabla:
+                    crc_detecta = tabla[recibido >> degree] != (recibido & mascara_crc)
+                else:
+                    crc_detecta = not verificar_crc(recibido, poly=poly, usar_tabla=False)
+                if recibido != paquete:
+                    if crc_detecta:
+                        detectados += 1
+                    else:
+                        no_detectados += 1
+                elif crc_detecta:
+                    falsos_positivos += 1
+            procesados = hasta
+            marca = medicion.sumar(ETAPA_DECODIFICAR, marca)
+            if procesados >= proximo:
+                proximo = reportador.publicar(procesados, detectados=detectados, no_detectados=no_detectados)
+                marca = medicion.sumar(ETAPA_PROGRESO, marca)
+            if sleep_ms:
+                time.sleep(sleep_ms * len(bloque) / 1000.0)
+                medicion.sumar(ETAPA_ESPERA, marca)
+    else:
+        for b, mascara in zip(bytes_data, mascaras):
+            # Codificar (lookup directo en la tabla compartida con crc_mensaje)
+            crc = tabla[b] if usar_tabla else calcular_crc(b, poly=poly, usar_tabla=False)
+            paquete = (b << degree) | crc  # bits de datos + CRC
         
-        # Simular error
-        recibido = simular_error(paquete, 8 + degree, tipo_error)
+            # Simular error (máscara pregenerada en bloque)
+            recibido = paquete ^ mascara
         
-        # Verificar
-        tiene_error = (recibido != paquete)  # error real introducido
-        crc_detecta = not verificar_crc(recibido, poly=poly)
+            # Verificar
+            tiene_error = (recibido != paquete)  # error real introducido
+            if usar_tabla:
+                crc_detecta = tabla[recibido >> degree] != (recibido & mascara_crc)
+            else:
+                crc_detecta = not verificar_crc(recibido, poly=poly, usar_tabla=False)
         
-        if tiene_error:
-            if crc_detecta:
-                detectados += 1
+            if tiene_error:
+                if crc_detecta:
+                    detectados += 1
+                else:
+                    no_detectados += 1
             else:
-                no_detectados += 1
-        else:
-            if crc_detecta:
-                falsos_positivos += 1
+                if crc_detecta:
+                    falsos_positivos += 1
         
-        procesados += 1
-        with lock:
-            estado['crc']['procesados'] = procesados
-            estado['crc']['detectados'] = detectados
-            estado['crc']['no_detectados'] = no_detectados
+            procesados += 1
+            if procesados >= proximo:
+                proximo = reportador.publicar(procesados, detectados=detectados, no_detectados=no_detectados)
         
-        if sleep_ms:
-            time.sleep(sleep_ms / 1000.0)
+            if sleep_ms:
+                time.sleep(sleep_ms / 1000.0)
     
+    reportador.publicar(procesados, detectados=detectados, no_detectados=no_detectados)
     fin = time.perf_counter()
     overhead = total * degree  # bits de overhead (CRC)
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
     
     return Resultado(
         total=total,
@@ -273,47 +747,92 @@ def procesar_crc(bytes_data: bytes, estado: dict, lock: threading.Lock, sleep_ms
         detectados=detectados,
         no_detectados=no_detectados,
         falsos_positivos=falsos_positivos,
-        overhead_bits=overhead
+        overhead_bits=overhead,
+        perfil=medicion
     )
 
-def procesar_hamming(bytes_data: bytes, estado: dict, lock: threading.Lock, sleep_ms: float = 0.0, tipo_error: str = TIPO_ERROR_UN_BIT) -> Resultado:
-    """Procesa datos con código de Hamming y simula errores para evaluar corrección."""
+def procesar_hamming(bytes_data: bytes, estado: dict, lock: threading.Lock, sleep_ms: float = 0.0, tipo_error: str = TIPO_ERROR_UN_BIT,
+                     parametros_canal=None, semilla: int = None, indice_inicial: int = 0, perfil: bool = False,
+                     intercalador=None) -> Resultado:
+    """Procesa datos con código de Hamming y simula errores para evaluar corrección.
+
+    `parametros_canal` (canal.ParametrosGilbertElliott) solo se usa con TIPO_ERROR_GILBERT.
+    `semilla` e `indice_inicial` fijan las máscaras de error; ver `fuente_mascaras`.
+    `perfil` e `intercalador` como en `procesar_crc`.
+    """
+    tabla_cod = tabla_codificacion_hamming()
+    tabla_dec = tabla_decodificacion_hamming()
+    mascaras = fuente_mascaras(tipo_error, 12, len(bytes_data), 'ham', semilla, parametros_canal, indice_inicial,
+                               intercalador)
     inicio = time.perf_counter()
     total = len(bytes_data)
     corregidos = 0
     no_corregibles = 0
     correctos = 0
     procesados = 0
-    
-    for b in bytes_data:
-        # Codificar
-        codigo = codificar_hamming(b)  # 12 bits
+    reportador = ReportadorProgreso(estado, lock, 'ham')
+    proximo = reportador.proximo
+    medicion = PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+
+    if medicion is not None:
+        while procesados < total:
+            marca = time.perf_counter()
+            hasta = min(total, procesados + TRAMO_PERFIL, max(proximo, procesados + 1))
+            bloque = bytes_data[procesados:hasta]
+            codigos = [tabla_cod[b] for b in bloque]
+            marca = medicion.sumar(ETAPA_CODIFICAR, marca)
+            recibidos = [c ^ m for c, m in zip(codigos, itertools.islice(mascaras, len(bloque)))]
+            marca = medicion.sumar(ETAPA_CANAL, marca)
+            for recibido in recibidos:
+                status = tabla_dec[recibido][2]
+                if status == 'corregido':
+                    corregidos += 1
+                elif status == 'no_corregible':
+                    no_corregibles += 1
+                elif status == 'ok':
+                    correctos += 1
+            procesados = hasta
+            marca = medicion.sumar(ETAPA_DECODIFICAR, marca)
+            if procesados >= proximo:
+                proximo = reportador.publicar(procesados, corregidos=corregidos,
+                                              no_corregibles=no_corregibles, correctos=correctos)
+                marca = medicion.sumar(ETAPA_PROGRESO, marca)
+            if sleep_ms:
+                time.sleep(sleep_ms * len(bloque) / 1000.0)
+                medicion.sumar(ETAPA_ESPERA, marca)
+    else:
+        for b, mascara in zip(bytes_data, mascaras):
+            # Codificar
+            codigo = tabla_cod[b]  # 12 bits
         
-        # Simular error
-        recibido = simular_error(codigo, 12, tipo_error)
+            # Simular error (máscara pregenerada en bloque)
+            recibido = codigo ^ mascara
         
-        # Decodificar y corregir
-        corregido, status = decodificar_corregir_hamming(recibido)
+            # Decodificar y corregir
+            corregido, dato, status = tabla_dec[recibido]
         
-        if status == 'corregido':
-            corregidos += 1
-        elif status == 'no_corregible':
-            no_corregibles += 1
-        elif status == 'ok':
-            correctos += 1
+            if status == 'corregido':
+                corregidos += 1
+            elif status == 'no_corregible':
+                no_corregibles += 1
+            elif status == 'ok':
+                correctos += 1
             
-        procesados += 1
-        with lock:
-            estado['ham']['procesados'] = procesados
-            estado['ham']['corregidos'] = corregidos
-            estado['ham']['no_corregibles'] = no_corregibles
-            estado['ham']['correctos'] = correctos
+            procesados += 1
+            if procesados >= proximo:
+                proximo = reportador.publicar(procesados, corregidos=corregidos,
+                                              no_corregibles=no_corregibles, correctos=correctos)
         
-        if sleep_ms:
-            time.sleep(sleep_ms / 1000.0)
+            if sleep_ms:
+                time.sleep(sleep_ms / 1000.0)
     
+    reportador.publicar(procesados, corregidos=corregidos, no_corregibles=no_corregibles, correctos=correctos)
     fin = time.perf_counter()
     overhead = total * 4  # bits de overhead (4 bits de paridad por cada 8 de datos)
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
     
     return Resultado(
         total=total,
@@ -322,11 +841,128 @@ def procesar_hamming(bytes_data: bytes, estado: dict, lock: threading.Lock, slee
         metrica=f"corregidos: {corregidos}, no_corregibles: {no_corregibles}",
         corregidos=corregidos,
         no_corregibles=no_corregibles,
-        overhead_bits=overhead
+        overhead_bits=overhead,
+        perfil=medicion
     )
 
 
-def render_barras(estado: dict, lock: threading.Lock, stop_event: threading.Event, inicio_crc: float, inicio_ham: float):
+# Tamaño de lectura para el modo de entrada por flujo (--input): un fragmento de la
+# partición común, así cada lectura continúa los flujos aleatorios donde toca
+TAMANO_FRAGMENTO_ENTRADA = TAMANO_FRAGMENTO
+
+def leer_fragmentos(ruta: str, tamano: int = TAMANO_FRAGMENTO_ENTRADA):
+    """Genera el contenido de `ruta` en fragmentos de `tamano` bytes ('-' = stdin).
+
+    Todos los fragmentos salvo el último tienen exactamente `tamano` bytes.
+    """
+    flujo = sys.stdin.buffer if ruta == '-' else open(ruta, 'rb')
+    try:
+        while True:
+            fragmento = flujo.read(tamano)
+            if not fragmento:
+                break
+            yield fragmento
+    finally:
+        if flujo is not sys.stdin.buffer:
+            flujo.close()
+
+def procesar_flujo(fragmentos, estado: dict, lock: threading.Lock, poly: int = POLINOMIO_CRC,
+                   tipo_error: str = TIPO_ERROR_UN_BIT, motor: str = MOTOR_ESCALAR,
+                   sleep_ms: float = 0.0, executor=None, semilla: int = None, parametros_canal=None,
+                   perfil: bool = False, modelo=None, fec: str = FEC_HAMMING, intercalador=None) -> tuple:
+    """Simula CRC y Hamming sobre una entrada que llega por fragmentos, con memoria acotada.
+
+    Cada fragmento se codifica, corrompe y verifica con ambos codecs en cuanto se
+    lee; solo se conservan los contadores acumulados y el CRC del mensaje completo
+    (encadenado con `crc_inicial`, o con el registro de `modelo`, un
+    modelos_crc.ModeloCRC, si se pasa). Con TIPO_ERROR_GILBERT cada fragmento arranca
+    el canal desde su distribución estacionaria. El progreso se publica en `estado` tras cada
+    fragmento; si el total no se conocía (stdin) se va ampliando. Con `perfil` los
+    perfiles por etapa de los fragmentos se suman. Con un `fec` de CODIGOS_FEC distinto de
+    Hamming el código corrector es el de `codec_fec`, con cualquier motor.
+    `intercalador` (intercalado.Intercalador) se aplica en cada fragmento, como en la entrada completa.
+
+    Todos los fragmentos salvo el último deben medir un múltiplo de TAMANO_FRAGMENTO:
+    así cada motor retoma la partición común y, con la misma `semilla`, el
+    resultado coincide con el de simular la entrada completa de una vez.
+
+    Returns:
+        (resultado_crc, resultado_ham, crc_del_mensaje)
+    """
+    # Cada llamada por fragmento publica en un estado local; el global se actualiza con los acumulados
+    lock_local = threading.Lock()
+    semilla = semilla if semilla is not None else nueva_semilla()
+    if motor == MOTOR_VECTORIZADO:
+        import vectorizado
+        codec_crc = lambda f, est, desde: vectorizado.procesar_crc_lote(
+            f, est, lock_local, poly=poly, tipo_error=tipo_error, semilla=semilla,
+            parametros_canal=parametros_canal, indice_inicial=desde // TAMANO_FRAGMENTO, perfil=perfil,
+            intercalador=intercalador)
+        codec_ham = lambda f, est, desde: vectorizado.procesar_hamming_lote(
+            f, est, lock_local, tipo_error=tipo_error, semilla=semilla,
+            parametros_canal=parametros_canal, indice_inicial=desde // TAMANO_FRAGMENTO, perfil=perfil,
+            intercalador=intercalador)
+    elif motor == MOTOR_PARALELO:
+        import paralelo
+        codec_crc = lambda f, _, desde: paralelo.ejecutar_paralelo(
+            f, paralelo.CODEC_CRC, poly=poly, tipo_error=tipo_error, semilla=semilla, executor=executor,
+            indice_inicial=desde // TAMANO_FRAGMENTO, parametros_canal=parametros_canal, perfil=perfil,
+            intercalador=intercalador)
+        codec_ham = lambda f, _, desde: paralelo.ejecutar_paralelo(
+            f, paralelo.CODEC_HAMMING, tipo_error=tipo_error, semilla=semilla, executor=executor,
+            indice_inicial=desde // TAMANO_FRAGMENTO, parametros_canal=parametros_canal, perfil=perfil,
+            intercalador=intercalador)
+    else:
+        codec_crc = lambda f, est, desde: procesar_crc(
+            f, est, lock_local, sleep_ms, poly=poly, tipo_error=tipo_error, parametros_canal=parametros_canal,
+            semilla=semilla, indice_inicial=desde // TAMANO_FRAGMENTO, perfil=perfil, intercalador=intercalador)
+        codec_ham = lambda f, est, desde: procesar_hamming(
+            f, est, lock_local, sleep_ms, tipo_error=tipo_error, parametros_canal=parametros_canal,
+            semilla=semilla, indice_inicial=desde // TAMANO_FRAGMENTO, perfil=perfil, intercalador=intercalador)
+    if fec != FEC_HAMMING:
+        procesar_fec, codigo_fec = codec_fec(fec)
+        codec_ham = lambda f, est, desde: procesar_fec(
+            f, est, lock_local, codigo=codigo_fec, tipo_error=tipo_error, semilla=semilla,
+            parametros_canal=parametros_canal, indice_inicial=desde // TAMANO_FRAGMENTO, perfil=perfil,
+            intercalador=intercalador)
+
+    resultado_crc = resultado_ham = None
+    crc_total = 0
+    registro = modelo.registro_inicial() if modelo is not None else None
+    procesados = 0
+    for fragmento in fragmentos:
+        estado_local = {'crc': {}, 'ham': {}}
+        parcial_crc = codec_crc(fragmento, estado_local, procesados)
+        parcial_ham = codec_ham(fragmento, estado_local, procesados)
+        if modelo is not None:
+            registro = modelo.actualizar(registro, fragmento)
+        else:
+            crc_total = crc_mensaje_slicing(fragmento, poly, crc_inicial=crc_total)
+        procesados += len(fragmento)
+        resultado_crc = parcial_crc if resultado_crc is None else combinar_resultados(
+            [resultado_crc, parcial_crc], resultado_crc.tiempo_ms + parcial_crc.tiempo_ms)
+        resultado_ham = parcial_ham if resultado_ham is None else combinar_resultados(
+            [resultado_ham, parcial_ham], resultado_ham.tiempo_ms + parcial_ham.tiempo_ms)
+        with lock:
+            for clave, res in (('crc', resultado_crc), ('ham', resultado_ham)):
+                estado[clave]['total'] = max(estado[clave]['total'], procesados)
+                estado[clave].update(procesados=procesados, detectados=res.detectados,
+                                     no_detectados=res.no_detectados, corregidos=res.corregidos,
+                                     no_corregibles=res.no_corregibles)
+
+    if resultado_crc is None:
+        resultado_crc = Resultado(total=0, procesados=0, tiempo_ms=0.0, metrica="")
+        resultado_ham = Resultado(total=0, procesados=0, tiempo_ms=0.0, metrica="")
+    resultado_crc.metrica = f"detectados: {resultado_crc.detectados}, no detectados: {resultado_crc.no_detectados}"
+    resultado_ham.metrica = f"corregidos: {resultado_ham.corregidos}, no_corregibles: {resultado_ham.no_corregibles}"
+    if modelo is not None:
+        crc_total = modelo.finalizar(registro)
+    resultado_crc.backend_crc = modelo.backend if modelo is not None else backend_crc_mensaje(poly)
+    return resultado_crc, resultado_ham, crc_total
+
+
+def render_barras(estado: dict, lock: threading.Lock, stop_event: threading.Event, inicio_crc: float, inicio_ham: float,
+                  nombre_fec: str = "Hamming"):
     # Preparar dos líneas para las barras y refrescar hasta que se indique stop
     # Intento de usar ANSI para mover el cursor; en PowerShell moderno suele estar habilitado.
     print()  # línea para CRC
@@ -340,7 +976,7 @@ def render_barras(estado: dict, lock: threading.Lock, stop_event: threading.Even
                 extra_crc = f"t={((ahora - inicio_crc)*1000):.1f}ms, det={crc['detectados']}"
                 extra_ham = f"t={((ahora - inicio_ham)*1000):.1f}ms, cor={ham['corregidos']}"
                 linea_crc = barra_progreso("CRC-8", crc['procesados'], crc['total'], extra=extra_crc)
-                linea_ham = barra_progreso("Hamming", ham['procesados'], ham['total'], extra=extra_ham)
+                linea_ham = barra_progreso(nombre_fec, ham['procesados'], ham['total'], extra=extra_ham)
             sys.stdout.write("\x1b[2A")  # subir 2 líneas
             sys.stdout.write("\r" + linea_crc.ljust(100) + "\n")
             sys.stdout.write(linea_ham.ljust(100) + "\n")
@@ -354,36 +990,217 @@ def render_barras(estado: dict, lock: threading.Lock, stop_event: threading.Even
             extra_crc = f"t={crc['tiempo_ms']:.1f}ms, det={crc['detectados']}"
             extra_ham = f"t={ham['tiempo_ms']:.1f}ms, cor={ham['corregidos']}"
             linea_crc = barra_progreso("CRC-8", crc['procesados'], crc['total'], extra=extra_crc)
-            linea_ham = barra_progreso("Hamming", ham['procesados'], ham['total'], extra=extra_ham)
+            linea_ham = barra_progreso(nombre_fec, ham['procesados'], ham['total'], extra=extra_ham)
         sys.stdout.write("\x1b[2A")
         sys.stdout.write("\r" + linea_crc.ljust(100) + "\n")
         sys.stdout.write(linea_ham.ljust(100) + "\n")
         sys.stdout.flush()
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Simulación CRC-8 vs Hamming (12,8) con barras de progreso")
+def imprimir_perfil(resultado: Resultado):
+    """Imprime el desglose por etapa de `resultado` (si se simuló con perfil)."""
+    if resultado.perfil is None:
+        return
+    print(f"  Throughput codec: {resultado.throughput_codec:.3f} MB/s (solo codificar + decodificar)")
+    print("  Perfil por etapas:")
+    for linea in resultado.perfil.lineas():
+        print(f"    {linea}")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """Parser de la línea de órdenes: opciones de la simulación y subcomandos.
+
+    Sin abreviaturas en el parser principal: argparse compara las opciones de los
+    subcomandos con los prefijos de las globales, y `sweep --p` chocaría con --poly y --perfil.
+    """
+    try:
+        import exhaustivo
+        clases_patron = exhaustivo.CLASES_PATRON
+    except ImportError:
+        clases_patron = None  # sin numpy, --exhaustive avisa al ejecutarse
+    parser = argparse.ArgumentParser(description="Simulación CRC-8 vs Hamming (12,8) con barras de progreso",
+                                     allow_abbrev=False)
     parser.add_argument("--text", type=str, help="Texto a simular (UTF-8)")
+    parser.add_argument("--input", type=str, default=None, help="Archivo a simular leído por fragmentos ('-' = stdin), con memoria constante")
     parser.add_argument("--poly", type=str, default=None, help="Polinomio CRC (ej. 0x107 o 0b100000111). Si no se pasa, se usa 0b100000111")
-    parser.add_argument("--byte", type=int, default=None, help="Valor de 8 bits para benchmark (0-255). Si se pasa, se ejecuta benchmark en modo por-byte con --iters")
-    parser.add_argument("--iters", type=int, default=100000, help="Número de iteraciones para el benchmark por byte")
+    parser.add_argument("--byte", type=int, default=None, help="Valor de 8 bits para benchmark (0-255): mide la suite de bench.py sobre --iters copias del byte")
+    parser.add_argument("--iters", type=int, default=100000, help="Número de bytes de la entrada del benchmark por byte")
     parser.add_argument("--sleep-ms", type=float, default=0.0, help="Retardo artificial por byte para visualizar mejor")
     parser.add_argument("--error-type", type=str, default=TIPO_ERROR_UN_BIT, 
-                       choices=[TIPO_ERROR_UN_BIT, TIPO_ERROR_DOS_BITS, TIPO_ERROR_RAFAGA],
-                       help="Tipo de error a simular: un_bit, dos_bits, rafaga")
-    args = parser.parse_args()
+                       choices=[TIPO_ERROR_UN_BIT, TIPO_ERROR_DOS_BITS, TIPO_ERROR_RAFAGA, TIPO_ERROR_GILBERT],
+                       help="Tipo de error a simular: un_bit, dos_bits, rafaga o gilbert (canal de Gilbert–Elliott, requiere numpy)")
+    parser.add_argument("--ge-buena-mala", type=float, default=1e-3, help="Gilbert–Elliott: probabilidad por bit de pasar al estado malo")
+    parser.add_argument("--ge-mala-buena", type=float, default=0.1, help="Gilbert–Elliott: probabilidad por bit de volver al estado bueno")
+    parser.add_argument("--ge-ber-buena", type=float, default=0.0, help="Gilbert–Elliott: BER en el estado bueno")
+    parser.add_argument("--ge-ber-mala", type=float, default=0.5, help="Gilbert–Elliott: BER en el estado malo")
+    parser.add_argument("--motor", type=str, default=MOTOR_ESCALAR, choices=[MOTOR_ESCALAR, MOTOR_VECTORIZADO, MOTOR_PARALELO],
+                       help="Motor de simulación: escalar (byte a byte), vectorizado (NumPy, por lotes) o paralelo (NumPy en varios procesos)")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos para el motor paralelo (por defecto, uno por núcleo)")
+    parser.add_argument("--seed", type=int, default=None,
+                       help="Semilla de los errores simulados: la misma semilla da el mismo resultado con cualquier motor")
+    parser.add_argument("--perfil", action="store_true",
+                       help="Mide el tiempo y las llamadas de cada etapa (codificar, canal, decodificar, progreso) y la CPU")
+    parser.add_argument("--fec", type=str, default=FEC_HAMMING, choices=CODIGOS_FEC,
+                       help="Código corrector frente al CRC: hamming (12,8) por byte, rs255 = RS(255,223), "
+                            "rs204 = RS(204,188) o convolucional K=7 de tasa 1/2, 2/3 o 3/4 (conv12, conv23, conv34); "
+                            "los Reed–Solomon y convolucionales requieren numpy y calculan igual con cualquier motor")
+    parser.add_argument("--intercalado", type=str, default=None, metavar="FILASxCOLUMNAS",
+                       help="Intercalador de bloque entre la codificación y el canal (ej. 12x64, requiere numpy)")
+    parser.add_argument("--intercalado-unidad", type=str, default="bit", choices=["bit", "palabra"],
+                       help="Unidad que se intercala: bits o palabras de código enteras")
+    parser.add_argument("--exhaustive", type=str, default=None, metavar="CLASE", choices=clases_patron,
+                       help="Enumera todos los patrones de error de CLASE (peso1 a peso3, rafaga1 a rafaga12) y da tasas exactas")
+    subparsers = parser.add_subparsers(dest="comando", metavar="{encode,decode,crc,sweep,analyze-poly,fec,arq,frames,bench}")
+    p_encode = subparsers.add_parser("encode", help="Codifica un archivo (Hamming empaquetado o tramas con CRC)")
+    p_encode.add_argument("entrada", help="Archivo de entrada")
+    p_encode.add_argument("salida", help="Archivo codificado de salida")
+    p_encode.add_argument("--codec", choices=["hamming", "crc"], default="hamming", help="Codificación de transporte")
+    p_encode.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC para --codec crc")
+    p_encode.add_argument("--trama", type=int, default=256, help="Bytes de datos por trama para --codec crc")
+    p_crc = subparsers.add_parser("crc", help="CRC de un archivo con un algoritmo estándar del catálogo")
+    p_crc.add_argument("entrada", nargs="?", default=None,
+                       help="Archivo ('-' = stdin). Sin él, lista el catálogo y comprueba cada algoritmo")
+    p_crc.add_argument("--modelo", type=str, default="CRC-32/ISO-HDLC", help="Algoritmo del catálogo o alias (ej. CRC-32, CRC-16/MODBUS)")
+    p_decode = subparsers.add_parser("decode", help="Decodifica un archivo generado con encode")
+    p_decode.add_argument("entrada", help="Archivo codificado")
+    p_decode.add_argument("salida", help="Archivo de datos recuperado")
+    p_sweep = subparsers.add_parser("sweep", help="Barrido de BER en un canal binario simétrico (BSC)")
+    p_sweep.add_argument("--p", type=float, nargs="+", default=None, help="Probabilidades de error de bit a simular")
+    p_sweep.add_argument("--log", type=float, nargs=3, default=[-6, -1, 11], metavar=("MIN", "MAX", "PUNTOS"),
+                         help="Sin --p: PUNTOS probabilidades logarítmicas entre 10^MIN y 10^MAX")
+    p_sweep.add_argument("--bits", type=float, default=1e7, help="Bits de datos por punto y por codec")
+    p_sweep.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC")
+    p_sweep.add_argument("--salida", type=str, default=None, help="Guarda el barrido en CSV o JSON (según la extensión)")
+    p_sweep.add_argument("--grafico", type=str, default=None, help="Guarda el gráfico del barrido (requiere matplotlib)")
+    p_analisis = subparsers.add_parser("analyze-poly", help="Distancia de Hamming y P(error no detectado) de un polinomio CRC")
+    p_analisis.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC (sin él, todos los de POLINOMIOS_CRC)")
+    p_analisis.add_argument("--longitudes", type=int, nargs="+", default=None,
+                            help="Longitudes de mensaje en bytes (por defecto 8 64 256 1500)")
+    p_analisis.add_argument("--peso-max", type=int, default=4, choices=range(2, 7),
+                            help="Peso máximo de los patrones indetectables contados (5 y 6 solo en mensajes cortos)")
+    p_analisis.add_argument("--ber", type=float, nargs="+", default=None, help="BER a las que calcular P(error no detectado)")
+    p_analisis.add_argument("--sin-cache", action="store_true", help="No leer ni guardar análisis en disco")
+    p_fec = subparsers.add_parser("fec", help="Compara códigos Hamming/SECDED en un BSC: overhead, corrección y throughput")
+    p_fec.add_argument("--codigos", nargs="+", default=None, metavar="CODIGO",
+                       help="Códigos a comparar: ham7 ham15 ham31 ham63 secded8 secded16 secded32 secded64 (por defecto todos)")
+    p_fec.add_argument("--p", type=float, nargs="+", default=[1e-4, 1e-3, 1e-2], help="Probabilidades de error de bit")
+    p_fec.add_argument("--bits", type=float, default=1e7, help="Bits de datos por punto y por código")
+    p_fec.add_argument("--mb", type=float, default=8.0, help="MB del mensaje con que medir el throughput (0 = no medir)")
+    p_arq = subparsers.add_parser("arq", help="Simulador de enlace por eventos con ARQ: goodput, latencia y retransmisiones")
+    p_arq.add_argument("--protocolos", nargs="+", default=["sw", "gbn", "sr"], choices=["sw", "gbn", "sr"],
+                       help="Parada y espera (sw), retroceso N (gbn) y/o repetición selectiva (sr)")
+    p_arq.add_argument("--ventanas", type=int, nargs="+", default=None,
+                       help="Ventanas (tramas) a simular con gbn y sr (por defecto, las tramas de un ida y vuelta)")
+    p_arq.add_argument("--tramas", type=int, default=100000, help="Tramas a entregar por simulación")
+    p_arq.add_argument("--bytes-trama", type=int, default=1024, help="Bytes de datos por trama")
+    p_arq.add_argument("--tasa", type=float, default=10e6, help="Tasa de la línea en bits por segundo")
+    p_arq.add_argument("--retardo", type=float, default=0.25, help="Retardo de propagación en un sentido (segundos)")
+    p_arq.add_argument("--temporizador", type=float, default=None,
+                       help="Temporizador de retransmisión en segundos (por defecto, ida y vuelta + una trama)")
+    p_arq.add_argument("--ber", type=float, default=1e-6, help="BER del canal (BSC; con --error-type gilbert se usa Gilbert–Elliott)")
+    p_arq.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC de cada trama")
+    p_tramas = subparsers.add_parser("frames", help="Simulación por tramas con un CRC cada una: FER, no detectadas y goodput")
+    p_tramas.add_argument("--bytes-trama", type=int, default=1500, help="Bytes de datos por trama")
+    p_tramas.add_argument("--barrido", type=int, nargs="*", default=None, metavar="BYTES",
+                          help="Barre tamaños de trama (sin valores: 64 a 9000) y da el de mayor goodput")
+    p_tramas.add_argument("--ber", type=float, default=1e-6, help="BER del canal (BSC; con --error-type gilbert se usa Gilbert–Elliott)")
+    p_tramas.add_argument("--mb", type=float, default=16.0, help="MB de datos aleatorios si no se pasa --text ni --input")
+    p_tramas.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC de cada trama (grado 8, 16, 24 o 32)")
+    import bench
+    p_bench = subparsers.add_parser("bench", help="Suite de benchmarks por implementación y etapa (ver bench.py)")
+    p_bench.add_argument("--poly", type=str, default=argparse.SUPPRESS, help="Polinomio CRC")
+    bench.crear_parser(p_bench)
+    return parser
+
+
+def main():
+    args = crear_parser().parse_args()
+
+    if args.comando == "crc":
+        if args.entrada is None:
+            modelos_crc.imprimir_catalogo()
+            return
+        try:
+            modelo = modelos_crc.buscar_modelo(args.modelo)
+            registro = modelo.registro_inicial()
+            for fragmento in leer_fragmentos(args.entrada):
+                registro = modelo.actualizar(registro, fragmento)
+        except (KeyError, OSError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"{modelo.nombre}({args.entrada}) = 0x{modelo.finalizar(registro):0{(modelo.ancho + 3) // 4}X}")
+        return
+
+    if args.comando == "decode":
+        import transporte
+        try:
+            res = transporte.decodificar_archivo(args.entrada, args.salida)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"Decodificados {res.total} bytes en {res.tiempo_ms:.3f} ms ({res.throughput:.2f} MB/s) - {res.metrica}")
+        return
+
+    if args.motor in (MOTOR_VECTORIZADO, MOTOR_PARALELO):
+        try:
+            import vectorizado
+            import paralelo
+        except ImportError:
+            print(f"El motor {args.motor} requiere numpy (pip install numpy).")
+            return
+    if args.fec != FEC_HAMMING:
+        try:
+            procesar_fec, codigo_fec = codec_fec(args.fec)
+        except ImportError:
+            print(f"El código {args.fec} requiere numpy (pip install numpy).")
+            return
+        nombre_fec = codigo_fec.nombre
+    else:
+        nombre_fec = "Hamming (12,8)"
+
+    parametros_canal = None
+    if args.error_type == TIPO_ERROR_GILBERT:
+        try:
+            import canal
+        except ImportError:
+            print("El canal de Gilbert–Elliott requiere numpy (pip install numpy).")
+            return
+        try:
+            parametros_canal = canal.ParametrosGilbertElliott(args.ge_buena_mala, args.ge_mala_buena,
+                                                              args.ge_ber_buena, args.ge_ber_mala)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+
+    intercalador = None
+    if args.intercalado is not None:
+        try:
+            import intercalado
+        except ImportError:
+            print("El intercalado requiere numpy (pip install numpy).")
+            return
+        try:
+            intercalador = intercalado.Intercalador.desde_texto(args.intercalado, args.intercalado_unidad)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
 
     # Parse polinomio si fue pasado
+    modelo = None
     if args.poly is None:
         poly = POLINOMIO_CRC
         poly_name = "CRC-8"
     else:
         s = args.poly.strip()
         try:
-            # Verificar si es un nombre predefinido
+            # Verificar si es un nombre predefinido o un algoritmo del catálogo
             if s in POLINOMIOS_CRC:
                 poly = POLINOMIOS_CRC[s]
                 poly_name = s
+            elif s.upper() in modelos_crc.CATALOGO_CRC or s.upper() in modelos_crc.ALIAS_CRC:
+                modelo = modelos_crc.buscar_modelo(s)
+                poly = modelo.polinomio
+                poly_name = modelo.nombre
             elif s.startswith("0x") or s.startswith("0X"):
                 poly = int(s, 16)
                 poly_name = f"Custom (0x{poly:X})"
@@ -398,9 +1215,186 @@ def main():
             poly = POLINOMIO_CRC
             poly_name = "CRC-8"
     
+    # Algoritmo completo del catálogo para el CRC del mensaje (None = división polinómica pura)
+    if modelo is None and poly_name in POLINOMIOS_CRC:
+        modelo = modelos_crc.buscar_modelo(poly_name)
     print(f"Usando polinomio: {poly_name} = 0b{poly:b}")
+    semilla = args.seed if args.seed is not None else nueva_semilla()
+
+    if args.exhaustive is not None:
+        try:
+            import exhaustivo
+        except ImportError:
+            print("El análisis exhaustivo requiere numpy (pip install numpy).")
+            return
+        polinomios = dict(POLINOMIOS_CRC)
+        if poly not in polinomios.values():
+            polinomios[poly_name] = poly
+        try:
+            exhaustivo.imprimir_analisis(args.exhaustive, polinomios)
+        except ValueError as e:
+            print(f"Error: {e}")
+        return
+
+    if args.comando == "sweep":
+        try:
+            import canal
+        except ImportError:
+            print("El barrido BSC requiere numpy (pip install numpy).")
+            return
+        if args.p is not None:
+            probabilidades = args.p
+        else:
+            probabilidades = canal.probabilidades_log(args.log[0], args.log[1], int(args.log[2]))
+        if any(not 0.0 <= p <= 1.0 for p in probabilidades):
+            print("Las probabilidades deben estar en [0, 1]")
+            return
+        print(f"Semilla: {semilla} (repetir con --seed {semilla})")
+        inicio = time.perf_counter()
+        filas = canal.barrido_bsc(probabilidades, int(args.bits), poly=poly, semilla=semilla,
+                                  trabajadores=args.trabajadores)
+        canal.imprimir_barrido(filas, (time.perf_counter() - inicio) * 1000.0)
+        if args.salida:
+            canal.guardar_barrido(filas, args.salida)
+            print(f"Barrido guardado en {args.salida}")
+        if args.grafico:
+            try:
+                import visualizacion
+            except ImportError:
+                print("El gráfico requiere matplotlib (pip install matplotlib).")
+                return
+            visualizacion.guardar_grafico_barrido(filas, args.grafico)
+            print(f"Gráfico guardado en {args.grafico}")
+        return
+
+    if args.comando == "analyze-poly":
+        try:
+            import analisis_poly
+        except ImportError:
+            print("El análisis de polinomios requiere numpy (pip install numpy).")
+            return
+        polinomios = {poly_name: poly} if args.poly is not None else POLINOMIOS_CRC
+        longitudes = args.longitudes or analisis_poly.LONGITUDES_POR_DEFECTO
+        cache = None if args.sin_cache else analisis_poly.DIRECTORIO_CACHE
+        for nombre, p in polinomios.items():
+            inicio = time.perf_counter()
+            try:
+                analisis = analisis_poly.analizar_polinomio(p, [8 * m for m in longitudes],
+                                                            peso_max=args.peso_max, cache=cache)
+            except ValueError as e:
+                print(f"{nombre}: {e}")
+                continue
+            analisis_poly.imprimir_analisis(nombre, analisis, args.ber or analisis_poly.BER_POR_DEFECTO,
+                                            (time.perf_counter() - inicio) * 1000.0)
+            print()
+        return
+
+    if args.comando == "fec":
+        try:
+            import hamming
+        except ImportError:
+            print("La comparación de códigos requiere numpy (pip install numpy).")
+            return
+        nombres = args.codigos or list(hamming.CODIGOS_HAMMING)
+        desconocidos = [n for n in nombres if n not in hamming.CODIGOS_HAMMING]
+        if desconocidos:
+            print(f"Códigos desconocidos: {', '.join(desconocidos)} (disponibles: {', '.join(hamming.CODIGOS_HAMMING)})")
+            return
+        if any(not 0.0 <= p <= 1.0 for p in args.p):
+            print("Las probabilidades deben estar en [0, 1]")
+            return
+        print(f"Semilla: {semilla} (repetir con --seed {semilla})")
+        codigos = [hamming.CODIGOS_HAMMING[n] for n in nombres]
+        filas = [hamming.simular_bsc(c, int(args.bits), p, semilla, indice_p=i)
+                 for c in codigos for i, p in enumerate(args.p)]
+        throughput = None
+        if args.mb > 0:
+            datos = random.Random(semilla).randbytes(int(args.mb * 1024 * 1024))
+            throughput = {c.nombre: hamming.medir_throughput(c, datos) for c in codigos}
+        hamming.imprimir_comparacion(filas, throughput)
+        return
 
-    # Modo benchmark por byte: comparar procesamiento de una sola palabra de 8 bits
+    if args.comando == "arq":
+        try:
+            import arq
+        except ImportError:
+            print("El simulador ARQ requiere numpy (pip install numpy).")
+            return
+        try:
+            enlace = arq.ParametrosEnlace(args.tasa, args.retardo, args.bytes_trama, temporizador_s=args.temporizador)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        if not 0.0 <= args.ber <= 1.0:
+            print("La BER debe estar en [0, 1]")
+            return
+        minima = arq.ventana_minima(enlace, poly)
+        ventanas = args.ventanas or [minima]
+        canal_texto = (f"Gilbert–Elliott (BER media {parametros_canal.ber_media:.2e})" if parametros_canal
+                       else f"BSC p={args.ber:g}")
+        print(f"Semilla: {semilla} (repetir con --seed {semilla})")
+        print(f"Enlace: {args.tasa / 1e6:g} Mb/s, retardo {args.retardo * 1000:g} ms, tramas de {args.bytes_trama} bytes "
+              f"+ {poly_name}, canal {canal_texto}; ventana sin esperas: {minima} tramas")
+        resultados = []
+        for protocolo in args.protocolos:
+            for ventana in ([1] if protocolo == arq.PROTOCOLO_PARADA_ESPERA else ventanas):
+                try:
+                    resultados.append(arq.simular(protocolo, args.tramas, enlace, ventana, p=args.ber,
+                                                  parametros_canal=parametros_canal, poly=poly, semilla=semilla))
+                except ValueError as e:
+                    print(f"Error: {e}")
+                    return
+        arq.imprimir_resultados(resultados, enlace)
+        return
+
+    if args.comando == "frames":
+        try:
+            import tramas
+        except ImportError:
+            print("La simulación por tramas requiere numpy (pip install numpy).")
+            return
+        if not 0.0 <= args.ber <= 1.0:
+            print("La BER debe estar en [0, 1]")
+            return
+        if args.input is not None:
+            fragmentos = leer_fragmentos(args.input)
+        elif args.text:
+            fragmentos = [args.text.encode('utf-8')]
+        else:
+            fragmentos = [random.Random(semilla).randbytes(int(args.mb * 1024 * 1024))]
+        p = None if parametros_canal else args.ber
+        print(f"Semilla: {semilla} (repetir con --seed {semilla})")
+        print("Canal: " + (f"Gilbert–Elliott (BER media {parametros_canal.ber_media:.2e})" if parametros_canal
+                           else f"BSC p={args.ber:g}"))
+        try:
+            if args.barrido is None:
+                tramas.imprimir_resultado(tramas.procesar_tramas(fragmentos, args.bytes_trama, poly, args.ber,
+                                                                 parametros_canal, semilla))
+            else:
+                datos = b"".join(fragmentos)
+                inicio = time.perf_counter()
+                filas = tramas.barrido_tamanos(datos, args.barrido or tramas.TAMANOS_BARRIDO, poly, args.ber,
+                                               parametros_canal, semilla)
+                tramas.imprimir_barrido(filas, p, (time.perf_counter() - inicio) * 1000.0)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+        return
+
+    if args.comando == "encode":
+        import transporte
+        try:
+            res = transporte.codificar_archivo(args.entrada, args.salida, codec=args.codec, poly=poly, trama=args.trama)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"Codificados {res.total} bytes en {res.tiempo_ms:.3f} ms ({res.throughput:.2f} MB/s) - {res.metrica}")
+        return
+
+    import bench
+    if args.comando == "bench":
+        sys.exit(bench.ejecutar(args, poly=poly, parametros_canal=parametros_canal))
+
+    # Modo benchmark por byte: la suite de bench.py sobre una entrada de --iters copias del byte
     if args.byte is not None:
         b = args.byte
         if b < 0 or b > 255:
@@ -408,49 +1402,34 @@ def main():
             return
         iters = max(1, args.iters)
         print(f"Benchmark por byte: valor={b}, iteraciones={iters}, polinomio=0b{poly:b}")
-
-        # Benchmark CRC: calcular CRC y verificar con un error simulado por iteración
-        inicio_crc = time.perf_counter()
-        for _ in range(iters):
-            crc = calcular_crc(b, poly=poly)
-            paquete = (b << (poly.bit_length() - 1)) | crc
-            recibido = simular_error_un_bit(paquete, (8 + (poly.bit_length() - 1)))
-            _ = verificar_crc(recibido, poly=poly)
-        fin_crc = time.perf_counter()
-
-        # Benchmark Hamming: codificar y decodificar/corregir por iteración
-        inicio_ham = time.perf_counter()
-        for _ in range(iters):
-            codigo = codificar_hamming(b)
-            recibido = simular_error_un_bit(codigo, 12)
-            _ = decodificar_corregir_hamming(recibido)
-        fin_ham = time.perf_counter()
-
-        total_crc_ms = (fin_crc - inicio_crc) * 1000.0
-        total_ham_ms = (fin_ham - inicio_ham) * 1000.0
-        print(f"Resultado benchmark:\n - CRC:  tiempo total = {total_crc_ms:.3f} ms, tiempo/op = {total_crc_ms/iters*1000:.3f} µs")
-        print(f" - Hamming: tiempo total = {total_ham_ms:.3f} ms, tiempo/op = {total_ham_ms/iters*1000:.3f} µs")
-        if total_crc_ms < total_ham_ms:
-            print("Más rápido: CRC")
-        elif total_crc_ms > total_ham_ms:
-            print("Más rápido: Hamming")
-        else:
-            print("Empate exacto")
+        args_bench = bench.crear_parser().parse_args(["--codecs", bench.CODEC_CRC, bench.CODEC_HAMMING,
+                                                      "--sin-limites", "--error-type", args.error_type])
+        args_bench.trabajadores = args.trabajadores
+        bench.ejecutar(args_bench, poly=poly, datos=bytes([b]) * iters, parametros_canal=parametros_canal)
         return
 
-    if args.text is None or args.text.strip() == "":
+    if args.input is not None:
+        # Modo flujo: la entrada se lee por fragmentos y nunca se carga entera en memoria
+        datos = None
         try:
-            texto = input("Ingrese el texto a transmitir: ")
-        except EOFError:
-            texto = "Hola mundo"
+            total = 0 if args.input == '-' else os.path.getsize(args.input)
+        except OSError as e:
+            print(f"No se puede leer la entrada: {e}")
+            return
     else:
-        texto = args.text
+        if args.text is None or args.text.strip() == "":
+            try:
+                texto = input("Ingrese el texto a transmitir: ")
+            except EOFError:
+                texto = "Hola mundo"
+        else:
+            texto = args.text
 
-    datos = texto.encode('utf-8')
-    total = len(datos)
-    if total == 0:
-        print("No hay datos que procesar.")
-        return
+        datos = texto.encode('utf-8')
+        total = len(datos)
+        if total == 0:
+            print("No hay datos que procesar.")
+            return
 
     # Estado compartido para las barras
     lock = threading.Lock()
@@ -464,46 +1443,118 @@ def main():
     # Arrancar renderizador
     inicio_crc = time.perf_counter()
     inicio_ham = inicio_crc
-    render_thread = threading.Thread(target=render_barras, args=(estado, lock, stop_event, inicio_crc, inicio_ham), daemon=True)
+    render_thread = threading.Thread(target=render_barras, args=(estado, lock, stop_event, inicio_crc, inicio_ham, nombre_fec), daemon=True)
     render_thread.start()
 
     # Trabajos en paralelo
     resultado_crc: Resultado | None = None
     resultado_ham: Resultado | None = None
+    pool = None
+    if args.motor == MOTOR_PARALELO:
+        pool = paralelo.ProcessPoolExecutor(max_workers=args.trabajadores or os.cpu_count())
 
     def tarea_crc():
         nonlocal resultado_crc, inicio_crc
         inicio_crc = time.perf_counter()
-        resultado_crc = procesar_crc(datos, estado, lock, args.sleep_ms, poly=poly, tipo_error=args.error_type)
+        if args.motor == MOTOR_VECTORIZADO:
+            resultado_crc = vectorizado.procesar_crc_lote(datos, estado, lock, poly=poly, tipo_error=args.error_type,
+                                                          semilla=semilla, parametros_canal=parametros_canal,
+                                                          perfil=args.perfil, intercalador=intercalador)
+        elif args.motor == MOTOR_PARALELO:
+            resultado_crc = paralelo.ejecutar_paralelo(datos, paralelo.CODEC_CRC, poly=poly, tipo_error=args.error_type,
+                                                       semilla=semilla, estado=estado, lock=lock, executor=pool,
+                                                       parametros_canal=parametros_canal, perfil=args.perfil,
+                                                       intercalador=intercalador)
+        else:
+            resultado_crc = procesar_crc(datos, estado, lock, args.sleep_ms, poly=poly, tipo_error=args.error_type,
+                                         parametros_canal=parametros_canal, semilla=semilla, perfil=args.perfil,
+                                         intercalador=intercalador)
         with lock:
             estado['crc']['tiempo_ms'] = resultado_crc.tiempo_ms
 
     def tarea_ham():
         nonlocal resultado_ham, inicio_ham
         inicio_ham = time.perf_counter()
-        resultado_ham = procesar_hamming(datos, estado, lock, args.sleep_ms, tipo_error=args.error_type)
+        if args.fec != FEC_HAMMING:
+            resultado_ham = procesar_fec(datos, estado, lock, codigo=codigo_fec, tipo_error=args.error_type,
+                                         semilla=semilla, parametros_canal=parametros_canal, perfil=args.perfil,
+                                         intercalador=intercalador)
+        elif args.motor == MOTOR_VECTORIZADO:
+            resultado_ham = vectorizado.procesar_hamming_lote(datos, estado, lock, tipo_error=args.error_type,
+                                                              semilla=semilla, parametros_canal=parametros_canal,
+                                                              perfil=args.perfil, intercalador=intercalador)
+        elif args.motor == MOTOR_PARALELO:
+            resultado_ham = paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=args.error_type,
+                                                       semilla=semilla, estado=estado, lock=lock, executor=pool,
+                                                       parametros_canal=parametros_canal, perfil=args.perfil,
+                                                       intercalador=intercalador)
+        else:
+            resultado_ham = procesar_hamming(datos, estado, lock, args.sleep_ms, tipo_error=args.error_type,
+                                             parametros_canal=parametros_canal, semilla=semilla, perfil=args.perfil,
+                                             intercalador=intercalador)
         with lock:
             estado['ham']['tiempo_ms'] = resultado_ham.tiempo_ms
 
-    th_crc = threading.Thread(target=tarea_crc, daemon=True)
-    th_ham = threading.Thread(target=tarea_ham, daemon=True)
+    if args.input is not None:
+        if args.motor == MOTOR_PARALELO:
+            tamano = TAMANO_FRAGMENTO * (args.trabajadores or os.cpu_count())
+        else:
+            tamano = TAMANO_FRAGMENTO_ENTRADA
+        try:
+            resultado_crc, resultado_ham, crc_total = procesar_flujo(
+                leer_fragmentos(args.input, tamano), estado, lock, poly=poly, tipo_error=args.error_type,
+                motor=args.motor, sleep_ms=args.sleep_ms, executor=pool, semilla=semilla,
+                parametros_canal=parametros_canal, perfil=args.perfil, modelo=modelo, fec=args.fec,
+                intercalador=intercalador)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        total = resultado_crc.total
+        for clave, res in (('crc', resultado_crc), ('ham', resultado_ham)):
+            with lock:
+                estado[clave]['tiempo_ms'] = res.tiempo_ms
+    elif pool is not None:
+        # Motor paralelo: cada codec usa todos los núcleos por turnos, así el
+        # tiempo de uno no queda inflado por el otro (como ocurre con los hilos y el GIL)
+        with pool:
+            tarea_crc()
+            tarea_ham()
+    else:
+        th_crc = threading.Thread(target=tarea_crc, daemon=True)
+        th_ham = threading.Thread(target=tarea_ham, daemon=True)
 
-    th_crc.start()
-    th_ham.start()
+        th_crc.start()
+        th_ham.start()
 
-    th_crc.join()
-    th_ham.join()
+        th_crc.join()
+        th_ham.join()
 
     stop_event.set()
     render_thread.join(timeout=0.2)
 
     # Resumen
     assert resultado_crc is not None and resultado_ham is not None
+    if total == 0:
+        print("No hay datos que procesar.")
+        return
+    if datos is not None:
+        crc_total = modelo.calcular(datos) if modelo is not None else crc_mensaje(datos, poly)
+        resultado_crc.backend_crc = modelo.backend if modelo is not None else backend_crc_mensaje(poly)
     print("\n" + "="*80)
     print("RESUMEN DETALLADO DE LA SIMULACIÓN")
     print("="*80)
     print(f"\nTipo de error simulado: {args.error_type}")
+    print(f"Semilla: {semilla} (repetir con --seed {semilla})")
+    if parametros_canal is not None:
+        print(f"Canal Gilbert–Elliott: BER media {parametros_canal.ber_media:.2e}, "
+              f"{parametros_canal.prob_mala * 100:.2f}% del tiempo en estado malo, "
+              f"estancia media {parametros_canal.duracion_media_mala:.1f} bits")
+    if intercalador is not None:
+        print(f"Intercalado: {intercalador.filas}x{intercalador.columnas} "
+              f"({'bits' if intercalador.unidad == 'bit' else 'palabras'})")
     print(f"Total de bytes procesados: {total}")
+    nombre_crc = f" ({modelo.nombre})" if modelo is not None else ""
+    print(f"CRC del mensaje completo{nombre_crc} [{resultado_crc.backend_crc}]: 0x{crc_total:0{(poly.bit_length() + 2) // 4}X}")
     
     print("\n--- CRC-8 ---")
     print(f"  Tiempo:           {resultado_crc.tiempo_ms:.3f} ms")
@@ -512,21 +1563,23 @@ def main():
     print(f"  No detectados:    {resultado_crc.no_detectados}/{total}")
     print(f"  Overhead:         {resultado_crc.overhead_bits} bits ({(resultado_crc.overhead_bits/(total*8))*100:.1f}%)")
     print(f"  Eficiencia:       {resultado_crc.eficiencia:.2f}%")
+    imprimir_perfil(resultado_crc)
     
-    print("\n--- Hamming (12,8) ---")
+    print(f"\n--- {nombre_fec} ---")
     print(f"  Tiempo:           {resultado_ham.tiempo_ms:.3f} ms")
     print(f"  Throughput:       {resultado_ham.throughput:.3f} MB/s")
     print(f"  Errores corregidos: {resultado_ham.corregidos}/{total} ({resultado_ham.tasa_correccion:.1f}%)")
     print(f"  No corregibles:   {resultado_ham.no_corregibles}/{total}")
     print(f"  Overhead:         {resultado_ham.overhead_bits} bits ({(resultado_ham.overhead_bits/(total*8))*100:.1f}%)")
     print(f"  Eficiencia:       {resultado_ham.eficiencia:.2f}%")
+    imprimir_perfil(resultado_ham)
     
     print("\n--- Comparación ---")
     if resultado_crc.tiempo_ms < resultado_ham.tiempo_ms:
         velocidad_ganador = "CRC-8"
         diferencia = ((resultado_ham.tiempo_ms / resultado_crc.tiempo_ms - 1) * 100)
     elif resultado_crc.tiempo_ms > resultado_ham.tiempo_ms:
-        velocidad_ganador = "Hamming"
+        velocidad_ganador = nombre_fec
         diferencia = ((resultado_crc.tiempo_ms / resultado_ham.tiempo_ms - 1) * 100)
     else:
         velocidad_ganador = "Empate"
@@ -536,7 +1589,7 @@ def main():
     
     # Comparación de capacidades
     print(f"\n  Capacidad de detección CRC: {resultado_crc.tasa_deteccion:.1f}%")
-    print(f"  Capacidad de corrección Hamming: {resultado_ham.tasa_correccion:.1f}%")
+    print(f"  Capacidad de corrección {nombre_fec}: {resultado_ham.tasa_correccion:.1f}%")
     
     print("\n" + "="*80)
 
@@ -0,0 +1,92 @@
+"""
+Intercalador de bloque (filas x columnas) entre la codificación y el canal
+Las unidades (bits o palabras de código) se escriben por filas y se transmiten por
+columnas, así una ráfaga de errores consecutivos en el canal queda repartida entre
+palabras distintas al desintercalar. Como el canal suma (XOR) una máscara de error,
+desintercalar(intercalar(c) ^ e) = c ^ desintercalar(e): en lugar de mover las palabras
+codificadas dos veces se lleva la máscara del canal al orden original, y las palabras no
+se copian. Intercalar y desintercalar son vistas reshape/transpose de NumPy, sin copias
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+import canal
+
+UNIDAD_BIT = 'bit'
+UNIDAD_PALABRA = 'palabra'
+UNIDADES = [UNIDAD_BIT, UNIDAD_PALABRA]
+
+
+@dataclass(frozen=True)
+class Intercalador:
+    """Intercalador de bloque de `filas` x `columnas` unidades (bits o palabras de código).
+
+    El flujo se parte en bloques de filas·columnas unidades; la unidad i de un bloque
+    ocupa la fila i // columnas y la columna i % columnas, y el bloque se transmite
+    columna a columna. Una ráfaga de hasta `filas` unidades seguidas en el canal
+    afecta a unidades separadas `columnas` posiciones en el orden original. La cola
+    que no llena un bloque se transmite sin intercalar.
+    """
+    filas: int
+    columnas: int
+    unidad: str = UNIDAD_BIT
+
+    def __post_init__(self):
+        if self.filas < 1 or self.columnas < 1:
+            raise ValueError("El intercalador necesita al menos una fila y una columna")
+        if self.unidad not in UNIDADES:
+            raise ValueError(f"Unidad de intercalado desconocida: {self.unidad} (use {', '.join(UNIDADES)})")
+
+    @classmethod
+    def desde_texto(cls, texto: str, unidad: str = UNIDAD_BIT) -> 'Intercalador':
+        """Intercalador a partir de 'FILASxCOLUMNAS' (ej. '12x64')."""
+        try:
+            filas, columnas = (int(v) for v in texto.lower().split('x'))
+        except ValueError:
+            raise ValueError(f"Intercalado no válido: {texto} (use FILASxCOLUMNAS, ej. 12x64)") from None
+        return cls(filas, columnas, unidad)
+
+    @property
+    def tamano(self) -> int:
+        """Unidades por bloque."""
+        return self.filas * self.columnas
+
+    def intercalar(self, unidades: np.ndarray) -> np.ndarray:
+        """Vista (bloques, columnas, filas) de `unidades` en orden de transmisión, sin copiar.
+
+        `unidades` es un arreglo 1-D con un múltiplo de `tamano` elementos.
+        """
+        return unidades.reshape(-1, self.filas, self.columnas).swapaxes(1, 2)
+
+    def desintercalar(self, unidades: np.ndarray) -> np.ndarray:
+        """Inversa de `intercalar`: vista (bloques, filas, columnas) en el orden original, sin copiar."""
+        return unidades.reshape(-1, self.columnas, self.filas).swapaxes(1, 2)
+
+    def posiciones_originales(self, posiciones: np.ndarray, total: int) -> np.ndarray:
+        """Lleva posiciones de unidad del orden de transmisión al original (flujo de `total` unidades)."""
+        completos = total // self.tamano * self.tamano
+        bloque, resto = np.divmod(posiciones, self.tamano)
+        columna, fila = np.divmod(resto, self.filas)
+        return np.where(posiciones < completos, bloque * self.tamano + fila * self.columnas + columna, posiciones)
+
+    def desintercalar_mascaras(self, mascaras: np.ndarray, ancho_bits: int) -> np.ndarray:
+        """Máscaras del canal (una por palabra, en orden de transmisión) en el orden de las palabras.
+
+        Con UNIDAD_PALABRA se permutan las máscaras enteras; con UNIDAD_BIT solo se
+        recolocan los bits a 1 (coste proporcional al número de errores, no de bits).
+        """
+        if self.unidad == UNIDAD_PALABRA:
+            completos = len(mascaras) // self.tamano * self.tamano
+            salida = np.empty_like(mascaras)
+            salida[completos:] = mascaras[completos:]
+            salida[:completos].reshape(-1, self.filas, self.columnas)[...] = self.desintercalar(mascaras[:completos])
+            return salida
+        # El bit 0 del flujo es el más significativo de la palabra 0 (canal.mascaras_desde_posiciones)
+        con_error = np.flatnonzero(mascaras)
+        desplazamientos = np.arange(ancho_bits - 1, -1, -1, dtype=np.uint64)
+        bits = (mascaras[con_error, None].astype(np.uint64) >> desplazamientos) & np.uint64(1)
+        palabra, bit = np.nonzero(bits)
+        posiciones = con_error[palabra] * ancho_bits + bit
+        posiciones = np.sort(self.posiciones_originales(posiciones, len(mascaras) * ancho_bits))
+        return canal.mascaras_densas(posiciones, ancho_bits, len(mascaras)).astype(mascaras.dtype, copy=False)
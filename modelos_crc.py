@@ -0,0 +1,249 @@
+"""
+Modelo paramétrico de CRC (Rocksoft / catálogo de Greg Cook)
+Un algoritmo CRC queda definido por ancho, polinomio, valor inicial, reflexión de
+entrada y salida y XOR final. `CATALOGO_CRC` recoge los algoritmos estándar con su
+valor de comprobación (CRC de b"123456789"); las tablas se generan por parámetros
+y se guardan en una caché LRU acotada
+
+Cuando el núcleo del algoritmo coincide con una rutina en C de la biblioteca
+estándar (`zlib.crc32`, `binascii.crc_hqx`) el cálculo se delega en ella
+"""
+import binascii
+import functools
+import zlib
+from dataclasses import dataclass
+
+# Mensaje de comprobación estándar del catálogo
+MENSAJE_CHECK = b"123456789"
+TAMANO_CACHE_TABLAS = 64
+
+# Backends del cálculo (se informan en Resultado.backend_crc)
+BACKEND_PYTHON = 'python'
+BACKEND_ZLIB = 'zlib'
+BACKEND_BINASCII = 'binascii'
+
+
+def reflejar(valor: int, ancho: int) -> int:
+    """Invierte el orden de los `ancho` bits menos significativos de `valor`."""
+    return int(f"{valor:0{ancho}b}"[::-1], 2) if ancho else 0
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def tabla_crc(ancho: int, poly: int, reflejado: bool) -> tuple:
+    """Tabla de 256 entradas para un registro de `ancho` bits (cacheada por parámetros).
+
+    Son los únicos parámetros de los que depende la tabla: init, refout y xorout
+    solo afectan al registro inicial y al final. Reflejada, la tabla procesa el
+    byte por el bit menos significativo (el registro se desplaza a la derecha).
+    Sin reflejar y con `ancho` < 8 el registro se alinea a 8 bits.
+    """
+    if reflejado:
+        rpoly = reflejar(poly, ancho)
+        tabla = []
+        for b in range(256):
+            crc = b
+            for _ in range(8):
+                crc = (crc >> 1) ^ rpoly if crc & 1 else crc >> 1
+            tabla.append(crc)
+        return tuple(tabla)
+    w = max(ancho, 8)
+    p = poly << (w - ancho)
+    alto = 1 << (w - 1)
+    mascara = (1 << w) - 1
+    tabla = []
+    for b in range(256):
+        crc = b << (w - 8)
+        for _ in range(8):
+            crc = ((crc << 1) ^ p) & mascara if crc & alto else (crc << 1) & mascara
+        tabla.append(crc)
+    return tuple(tabla)
+
+
+def _crc32_zlib(registro: int, datos) -> int:
+    # zlib encadena con el CRC ya finalizado (registro ^ 0xFFFFFFFF)
+    return zlib.crc32(datos, registro ^ 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+
+def _crc16_binascii(registro: int, datos) -> int:
+    return binascii.crc_hqx(datos, registro)
+
+
+# (ancho, poly, reflejado) -> (backend, función(registro, datos) -> registro).
+# Como las tablas, solo dependen del núcleo: init y xorout se aplican fuera, así que
+# CRC-16/XMODEM, CRC-16/IBM-3740, CRC-32/ISO-HDLC o CRC-32/JAMCRC usan la misma rutina
+_KERNELS_C = {
+    (32, 0x04C11DB7, True): (BACKEND_ZLIB, _crc32_zlib),
+    (16, 0x1021, False): (BACKEND_BINASCII, _crc16_binascii),
+}
+
+
+def kernel_c(ancho: int, poly: int, reflejado: bool):
+    """Rutina en C de la biblioteca estándar para este núcleo, o None si no la hay.
+
+    Devuelve (backend, función(registro, datos) -> registro) con el registro en la
+    misma representación que `ModeloCRC.actualizar`.
+    """
+    return _KERNELS_C.get((ancho, poly, reflejado))
+
+
+@dataclass(frozen=True)
+class ModeloCRC:
+    """Parámetros Rocksoft de un algoritmo CRC.
+
+    `poly` se da sin el término x^ancho (0x04C11DB7 para CRC-32); `polinomio`
+    devuelve la forma con el bit de grado que usa el resto del simulador.
+    """
+    nombre: str
+    ancho: int
+    poly: int
+    init: int = 0
+    refin: bool = False
+    refout: bool = False
+    xorout: int = 0
+    check: int = None  # CRC de MENSAJE_CHECK
+
+    def __post_init__(self):
+        if self.ancho < 1:
+            raise ValueError("El ancho del CRC debe ser positivo")
+        for campo in ('poly', 'init', 'xorout'):
+            if not 0 <= getattr(self, campo) <= self.mascara:
+                raise ValueError(f"{self.nombre}: {campo} no cabe en {self.ancho} bits")
+
+    @property
+    def mascara(self) -> int:
+        return (1 << self.ancho) - 1
+
+    @property
+    def polinomio(self) -> int:
+        """Polinomio generador con el bit x^ancho incluido (notación de POLINOMIOS_CRC)."""
+        return self.poly | (1 << self.ancho)
+
+    @property
+    def backend(self) -> str:
+        """Backend con el que `actualizar` calcula este modelo."""
+        kernel = kernel_c(self.ancho, self.poly, self.refin)
+        return kernel[0] if kernel is not None else BACKEND_PYTHON
+
+    @property
+    def _alineacion(self) -> int:
+        return 0 if self.refin else max(self.ancho, 8) - self.ancho
+
+    def registro_inicial(self) -> int:
+        """Registro al empezar: `init` en la representación interna del kernel."""
+        if self.refin:
+            return reflejar(self.init, self.ancho)
+        return self.init << self._alineacion
+
+    def actualizar(self, registro: int, datos, acelerado: bool = True) -> int:
+        """Avanza el registro sobre `datos` (permite procesar un mensaje por fragmentos).
+
+        Con `acelerado` usa la rutina en C de `kernel_c` si la hay; si no, la tabla.
+        """
+        if acelerado:
+            kernel = kernel_c(self.ancho, self.poly, self.refin)
+            if kernel is not None:
+                return kernel[1](registro, datos)
+        tabla = tabla_crc(self.ancho, self.poly, self.refin)
+        if self.refin:
+            for b in datos:
+                registro = tabla[(registro ^ b) & 0xFF] ^ (registro >> 8)
+            return registro
+        w = max(self.ancho, 8)
+        desplazamiento = w - 8
+        mascara = (1 << w) - 1
+        for b in datos:
+            registro = tabla[((registro >> desplazamiento) ^ b) & 0xFF] ^ ((registro << 8) & mascara)
+        return registro
+
+    def finalizar(self, registro: int) -> int:
+        """Convierte el registro en el CRC (reflexión de salida y XOR final)."""
+        crc = registro >> self._alineacion
+        if self.refin != self.refout:
+            crc = reflejar(crc, self.ancho)
+        return crc ^ self.xorout
+
+    def calcular(self, datos, acelerado: bool = True) -> int:
+        """CRC de `datos` con este modelo."""
+        return self.finalizar(self.actualizar(self.registro_inicial(), datos, acelerado))
+
+    def verificar_check(self) -> bool:
+        """Comprueba el modelo contra su valor de comprobación del catálogo."""
+        return self.check is None or self.calcular(MENSAJE_CHECK) == self.check
+
+
+def crc_bit_a_bit(datos, modelo: ModeloCRC) -> int:
+    """Implementación de referencia bit a bit del modelo Rocksoft (sin tablas)."""
+    crc = modelo.init
+    alto = 1 << (modelo.ancho - 1)
+    for b in datos:
+        if modelo.refin:
+            b = reflejar(b, 8)
+        for i in range(7, -1, -1):
+            bit = ((crc & alto) != 0) ^ ((b >> i) & 1)
+            crc = (crc << 1) & modelo.mascara
+            if bit:
+                crc ^= modelo.poly
+    if modelo.refout:
+        crc = reflejar(crc, modelo.ancho)
+    return crc ^ modelo.xorout
+
+
+_MODELOS = [
+    ModeloCRC('CRC-8/SMBUS', 8, 0x07, check=0xF4),
+    ModeloCRC('CRC-8/I-432-1', 8, 0x07, xorout=0x55, check=0xA1),
+    ModeloCRC('CRC-8/MAXIM-DOW', 8, 0x31, refin=True, refout=True, check=0xA1),
+    ModeloCRC('CRC-8/AUTOSAR', 8, 0x2F, init=0xFF, xorout=0xFF, check=0xDF),
+    ModeloCRC('CRC-5/USB', 5, 0x05, init=0x1F, refin=True, refout=True, xorout=0x1F, check=0x19),
+    ModeloCRC('CRC-16/ARC', 16, 0x8005, refin=True, refout=True, check=0xBB3D),
+    ModeloCRC('CRC-16/MODBUS', 16, 0x8005, init=0xFFFF, refin=True, refout=True, check=0x4B37),
+    ModeloCRC('CRC-16/XMODEM', 16, 0x1021, check=0x31C3),
+    ModeloCRC('CRC-16/IBM-3740', 16, 0x1021, init=0xFFFF, check=0x29B1),
+    ModeloCRC('CRC-16/KERMIT', 16, 0x1021, refin=True, refout=True, check=0x2189),
+    ModeloCRC('CRC-16/IBM-SDLC', 16, 0x1021, init=0xFFFF, refin=True, refout=True, xorout=0xFFFF, check=0x906E),
+    ModeloCRC('CRC-24/OPENPGP', 24, 0x864CFB, init=0xB704CE, check=0x21CF02),
+    ModeloCRC('CRC-32/ISO-HDLC', 32, 0x04C11DB7, init=0xFFFFFFFF, refin=True, refout=True,
+              xorout=0xFFFFFFFF, check=0xCBF43926),
+    ModeloCRC('CRC-32/BZIP2', 32, 0x04C11DB7, init=0xFFFFFFFF, xorout=0xFFFFFFFF, check=0xFC891918),
+    ModeloCRC('CRC-32/MPEG-2', 32, 0x04C11DB7, init=0xFFFFFFFF, check=0x0376E6E7),
+    ModeloCRC('CRC-32/ISCSI', 32, 0x1EDC6F41, init=0xFFFFFFFF, refin=True, refout=True,
+              xorout=0xFFFFFFFF, check=0xE3069283),
+    ModeloCRC('CRC-64/ECMA-182', 64, 0x42F0E1EBA9EA3693, check=0x6C40DF5F0B497347),
+    ModeloCRC('CRC-64/XZ', 64, 0x42F0E1EBA9EA3693, init=0xFFFFFFFFFFFFFFFF, refin=True, refout=True,
+              xorout=0xFFFFFFFFFFFFFFFF, check=0x995DC9BBDF1939FA),
+]
+
+CATALOGO_CRC = {m.nombre: m for m in _MODELOS}
+
+# Nombres comunes -> nombre del catálogo. Incluye las claves de index.POLINOMIOS_CRC:
+# el simulador por byte solo usa su polinomio, aquí se fija el algoritmo completo
+ALIAS_CRC = {
+    'CRC-8': 'CRC-8/SMBUS',
+    'CRC-8-CCITT': 'CRC-8/I-432-1',
+    'CRC-16-IBM': 'CRC-16/ARC',
+    'CRC-16-CCITT': 'CRC-16/XMODEM',
+    'CRC-32': 'CRC-32/ISO-HDLC',
+    'CRC-32C': 'CRC-32/ISCSI',
+    'CRC-16/CCITT-FALSE': 'CRC-16/IBM-3740',
+    'CRC-16/X-25': 'CRC-16/IBM-SDLC',
+    'CRC-32/ETHERNET': 'CRC-32/ISO-HDLC',
+}
+
+
+def buscar_modelo(nombre: str) -> ModeloCRC:
+    """Devuelve el modelo del catálogo por nombre o alias (sin distinguir mayúsculas)."""
+    clave = nombre.strip().upper()
+    clave = ALIAS_CRC.get(clave, clave)
+    if clave not in CATALOGO_CRC:
+        raise KeyError(f"Algoritmo CRC desconocido: {nombre}")
+    return CATALOGO_CRC[clave]
+
+
+def imprimir_catalogo():
+    """Imprime el catálogo con sus parámetros y el resultado de la comprobación."""
+    print(f"{'Algoritmo':18} {'Ancho':>5} {'Poly':>18} {'Init':>18} {'RefIn':>5} {'RefOut':>6} "
+          f"{'XorOut':>18} {'Check':>18} {'Backend':>8}  OK")
+    for m in _MODELOS:
+        print(f"{m.nombre:18} {m.ancho:5} {m.poly:#18x} {m.init:#18x} {str(m.refin):>5} {str(m.refout):>6} "
+              f"{m.xorout:#18x} {m.check:#18x} {m.backend:>8}  {'✓' if m.verificar_check() else '✗'}")
+    alias = ', '.join(f"{a} = {n}" for a, n in ALIAS_CRC.items())
+    print(f"\nAlias: {alias}")
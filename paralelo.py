@@ -0,0 +1,99 @@
+"""
+Motor paralelo multinúcleo para la simulación CRC vs Hamming
+Reparte la entrada en fragmentos de tamaño fijo (`index.TAMANO_FRAGMENTO`) entre procesos
+(ProcessPoolExecutor), cada fragmento con su propio flujo aleatorio derivado de la semilla
+(`canal.rng_fragmento`), y combina los `Resultado` parciales en uno solo
+"""
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import canal
+import index
+import vectorizado
+from canal import CODEC_CRC, CODEC_HAMMING
+from index import Resultado, POLINOMIO_CRC, TIPO_ERROR_UN_BIT
+
+
+def _procesar_fragmento(codec: str, datos: bytes, poly: int, tipo_error: str, semilla: int, indice: int,
+                        parametros_canal=None, tamano_fragmento: int = None, perfil: bool = False,
+                        intercalador=None) -> Resultado:
+    """Trabajo de un proceso: simula el fragmento `indice` con su propio generador.
+
+    `tamano_fragmento` es el del proceso principal, para que la partición coincida.
+    """
+    if codec == CODEC_CRC:
+        return vectorizado.procesar_crc_lote(datos, poly=poly, tipo_error=tipo_error, semilla=semilla,
+                                             parametros_canal=parametros_canal, indice_inicial=indice, perfil=perfil,
+                                             intercalador=intercalador, tamano_fragmento=tamano_fragmento)
+    return vectorizado.procesar_hamming_lote(datos, tipo_error=tipo_error, semilla=semilla,
+                                             parametros_canal=parametros_canal, indice_inicial=indice, perfil=perfil,
+                                             intercalador=intercalador, tamano_fragmento=tamano_fragmento)
+
+
+def _metrica(codec: str, r: Resultado) -> str:
+    if codec == CODEC_CRC:
+        return f"detectados: {r.detectados}, no detectados: {r.no_detectados}"
+    return f"corregidos: {r.corregidos}, no_corregibles: {r.no_corregibles}"
+
+
+def ejecutar_paralelo(bytes_data: bytes, codec: str, poly: int = POLINOMIO_CRC,
+                      tipo_error: str = TIPO_ERROR_UN_BIT, semilla: int = None,
+                      trabajadores: int = None, estado: dict = None, lock: threading.Lock = None,
+                      executor: ProcessPoolExecutor = None, indice_inicial: int = 0,
+                      parametros_canal=None, perfil: bool = False, intercalador=None) -> Resultado:
+    """Simula `codec` sobre `bytes_data` repartiendo fragmentos entre procesos.
+
+    Para una misma `semilla` el resultado es idéntico bit a bit con cualquier número
+    de trabajadores: los fragmentos y sus flujos aleatorios solo dependen de la
+    semilla y de la posición del fragmento, y los contadores se suman.
+
+    Args:
+        bytes_data: Datos a simular
+        codec: CODEC_CRC o CODEC_HAMMING
+        semilla: Semilla raíz (None = aleatoria)
+        trabajadores: Número de procesos (None = os.cpu_count())
+        estado, lock: Estado compartido de progreso (opcional)
+        executor: Pool ya creado para reutilizarlo entre codecs (opcional)
+        indice_inicial: Índice del primer fragmento, para continuar una entrada
+            procesada por partes (cada parte debe empezar en un múltiplo de index.TAMANO_FRAGMENTO)
+        parametros_canal: Parámetros de TIPO_ERROR_GILBERT (el canal de cada
+            fragmento arranca desde su distribución estacionaria)
+        perfil: Mide las etapas en cada proceso; el perfil combinado suma sus
+            tiempos y su CPU, y `pared_ms` es el tiempo de reloj de todo el reparto
+        intercalador: intercalado.Intercalador aplicado en cada fragmento (opcional)
+    """
+    if semilla is None:
+        semilla = canal.semilla_aleatoria()
+    fragmento = index.TAMANO_FRAGMENTO
+    propio = executor is None
+    if propio:
+        executor = ProcessPoolExecutor(max_workers=trabajadores or os.cpu_count())
+    reportador = index.ReportadorProgreso(estado, lock, codec) if estado is not None else None
+    inicio = time.perf_counter()
+    try:
+        futuros = {
+            executor.submit(_procesar_fragmento, codec, bytes_data[desde:desde + fragmento],
+                            poly, tipo_error, semilla, i, parametros_canal, fragmento, perfil, intercalador): i
+            for i, desde in enumerate(range(0, len(bytes_data), fragmento), start=indice_inicial)
+        }
+        parciales = []
+        procesados = 0
+        for futuro in as_completed(futuros):
+            parcial = futuro.result()
+            parciales.append(parcial)
+            procesados += parcial.procesados
+            if reportador is not None:
+                acumulado = index.combinar_resultados(parciales, 0.0)
+                reportador.publicar(procesados, detectados=acumulado.detectados,
+                                    no_detectados=acumulado.no_detectados,
+                                    corregidos=acumulado.corregidos,
+                                    no_corregibles=acumulado.no_corregibles)
+    finally:
+        if propio:
+            executor.shutdown()
+    fin = time.perf_counter()
+    resultado = index.combinar_resultados(parciales, (fin - inicio) * 1000.0)
+    resultado.metrica = _metrica(codec, resultado)
+    return resultado
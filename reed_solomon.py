@@ -0,0 +1,340 @@
+"""
+Códigos Reed–Solomon RS(n, k) sobre GF(2^8) para la simulación (DVB, enlaces satelitales)
+Cada palabra tiene n símbolos de un byte: k de datos y 2t = n - k de paridad, y corrige
+hasta t símbolos erróneos sin importar cuántos bits de cada símbolo estén alterados, por
+eso aguanta ráfagas que rompen Hamming(12,8). La aritmética del cuerpo usa tablas
+precalculadas (log/antilog y multiplicación 256x256). La codificación y los síndromes son
+lineales en cada byte, así que se calculan para todas las palabras a la vez con una tabla
+por posición; solo las palabras con síndrome no nulo pasan por Berlekamp–Massey, Chien
+y Forney, también vectorizados sobre todas ellas
+"""
+import functools
+import threading
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+import canal
+import index
+from index import Resultado, TIPO_ERROR_UN_BIT, TIPO_ERROR_DOS_BITS, TIPO_ERROR_RAFAGA, TIPO_ERROR_GILBERT
+from vectorizado import ESTADO_OK, ESTADO_CORREGIDO, ESTADO_NO_CORREGIBLE
+
+# Polinomio primitivo x^8 + x^4 + x^3 + x^2 + 1 (el de DVB y la mayoría de implementaciones)
+POLINOMIO_PRIMITIVO = 0x11D
+
+
+@functools.lru_cache(maxsize=None)
+def tablas_gf(primitivo: int = POLINOMIO_PRIMITIVO) -> tuple:
+    """Tablas de GF(2^8) generado por α = x: (antilog[510], log[256], producto[256, 256], inverso[256]).
+
+    `antilog` está duplicada para sumar dos logaritmos sin reducir módulo 255;
+    `log[0]` no está definido (vale 0) y `inverso[0]` vale 0.
+    """
+    antilog = np.zeros(510, dtype=np.uint8)
+    log = np.zeros(256, dtype=np.int64)
+    x = 1
+    for i in range(255):
+        antilog[i] = antilog[i + 255] = x
+        log[x] = i
+        x <<= 1
+        if x & 0x100:
+            x ^= primitivo
+    if x != 1 or len(set(antilog[:255].tolist())) != 255:
+        raise ValueError(f"0x{primitivo:X} no es un polinomio primitivo de grado 8")
+    producto = antilog[log[:, None] + log[None, :]]
+    producto[0, :] = 0
+    producto[:, 0] = 0
+    inverso = antilog[(255 - log) % 255]
+    inverso[0] = 0
+    return antilog, log, producto, inverso
+
+
+def _multiplicar(plano: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Producto elemento a elemento (con difusión) en GF(2^8); `plano` es la tabla de producto aplanada.
+
+    Un `take` sobre índices de 16 bits es varias veces más rápido que indexar la tabla 2D.
+    """
+    return np.take(plano, (np.asarray(a).astype(np.uint16) << 8) | b)
+
+
+@dataclass(frozen=True)
+class CodigoRS:
+    """RS(n, k) sistemático sobre GF(2^8), con n ≤ 255 (n < 255: código acortado).
+
+    El generador tiene las raíces α^fcr … α^(fcr+2t-1). La palabra se transmite
+    con el coeficiente de mayor grado primero: k bytes de datos y luego 2t de paridad.
+    Los códigos acortados (RS(204,188) de DVB a partir de RS(255,239)) se obtienen
+    suponiendo ceros en las 255 - n primeras posiciones, que no se transmiten.
+    """
+    n: int
+    k: int
+    fcr: int = 0
+    primitivo: int = POLINOMIO_PRIMITIVO
+    _generador: tuple = field(init=False, repr=False, compare=False)
+    _tabla_paridad: np.ndarray = field(init=False, repr=False, compare=False)
+    _tabla_sindromes: np.ndarray = field(init=False, repr=False, compare=False)
+    _tabla_chien: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not 0 < self.k < self.n <= 255:
+            raise ValueError("RS(n, k) requiere 0 < k < n ≤ 255")
+        antilog, _, producto, _ = tablas_gf(self.primitivo)
+        dos_t, n, k = self.n - self.k, self.n, self.k
+        # g(x) = Π (x - α^(fcr+i)), coeficientes de mayor a menor grado
+        generador = [1]
+        for i in range(dos_t):
+            raiz = int(antilog[(self.fcr + i) % 255])
+            generador = [a ^ int(producto[raiz, b]) for a, b in zip(generador + [0], [0] + generador)]
+        object.__setattr__(self, '_generador', tuple(generador))
+        # La paridad es lineal en cada byte: el byte j (grado n-1-j) aporta dato·(x^(n-1-j) mod g).
+        # Filas de 2t bytes rellenadas a múltiplo de 8 para acumularlas como uint64
+        ancho = -(-dos_t // 8) * 8
+        restos = np.zeros((k, ancho), dtype=np.uint8)
+        resto = list(generador[1:])  # x^(2t) mod g
+        for grado in range(k):
+            restos[k - 1 - grado, :dos_t] = resto
+            arrastre = resto[0]
+            resto = [a ^ int(producto[arrastre, b]) for a, b in zip(resto[1:] + [0], generador[1:])]
+        valores = np.arange(256)[None, :, None]
+        object.__setattr__(self, '_tabla_paridad',
+                           np.ascontiguousarray(producto[valores, restos[:, None, :]]).view(np.uint64))
+        # Síndrome S_i = r(α^(fcr+i)): el byte j aporta r_j·α^((fcr+i)(n-1-j))
+        grados = np.arange(n - 1, -1, -1)
+        potencias = np.zeros((n, ancho), dtype=np.uint8)
+        potencias[:, :dos_t] = antilog[np.outer(grados, self.fcr + np.arange(dos_t)) % 255]
+        object.__setattr__(self, '_tabla_sindromes',
+                           np.ascontiguousarray(producto[valores, potencias[:, None, :]]).view(np.uint64))
+        # Chien: α^(-i·(n-1-j)), evaluación de Λ_i en la inversa del localizador de la posición j
+        object.__setattr__(self, '_tabla_chien', antilog[np.outer(np.arange(dos_t + 1), -grados) % 255])
+
+    @property
+    def t(self) -> int:
+        """Símbolos erróneos que corrige cada palabra."""
+        return (self.n - self.k) // 2
+
+    @property
+    def nombre(self) -> str:
+        return f"RS({self.n},{self.k})"
+
+    @property
+    def overhead(self) -> float:
+        """Bits de paridad por bit de datos."""
+        return (self.n - self.k) / self.k
+
+    @property
+    def generador(self) -> tuple:
+        """Coeficientes de g(x), de mayor a menor grado."""
+        return self._generador
+
+    def codificar_bloques(self, datos: np.ndarray) -> np.ndarray:
+        """Palabras de código (matriz uint8 de n columnas) de cada fila de k bytes de `datos`."""
+        dos_t = self.n - self.k
+        paridad = np.zeros((len(datos), self._tabla_paridad.shape[2]), dtype=np.uint64)
+        for j, tabla in enumerate(self._tabla_paridad):
+            paridad ^= np.take(tabla, datos[:, j], axis=0)
+        palabras = np.empty((len(datos), self.n), dtype=np.uint8)
+        palabras[:, :self.k] = datos
+        palabras[:, self.k:] = paridad.view(np.uint8)[:, :dos_t]
+        return palabras
+
+    def sindromes(self, palabras: np.ndarray) -> np.ndarray:
+        """Síndromes S_0 … S_(2t-1) (matriz uint8) de cada fila de `palabras`."""
+        acumulado = np.zeros((len(palabras), self._tabla_sindromes.shape[2]), dtype=np.uint64)
+        for j, tabla in enumerate(self._tabla_sindromes):
+            acumulado ^= np.take(tabla, palabras[:, j], axis=0)
+        return acumulado.view(np.uint8)[:, :self.n - self.k]
+
+    def decodificar_bloques(self, palabras: np.ndarray) -> tuple:
+        """Corrige cada fila de `palabras` (uint8, n columnas).
+
+        Returns:
+            (datos corregidos, matriz uint8 de k columnas; estado de cada palabra,
+            vectorizado.ESTADO_*). Una palabra con más de t símbolos erróneos puede
+            acabar en otra palabra de código (se informa como corregida) o quedar
+            como no corregible, con sus datos recibidos tal cual.
+        """
+        sindromes = self.sindromes(palabras)
+        estados = np.full(len(palabras), ESTADO_OK, dtype=np.uint8)
+        con_error = np.flatnonzero(sindromes.any(axis=1))
+        if len(con_error) == 0:
+            return palabras[:, :self.k], estados
+        corregidas, validas = self._corregir(palabras[con_error], sindromes[con_error])
+        salida = palabras[:, :self.k].copy()
+        salida[con_error[validas]] = corregidas[validas, :self.k]
+        estados[con_error] = np.where(validas, ESTADO_CORREGIDO, ESTADO_NO_CORREGIBLE)
+        return salida, estados
+
+    def _corregir(self, palabras: np.ndarray, sindromes: np.ndarray) -> tuple:
+        """Berlekamp–Massey, Chien y Forney sobre todas las filas a la vez (todas con síndrome no nulo)."""
+        antilog, _, producto, inverso = tablas_gf(self.primitivo)
+        plano = producto.reshape(-1)
+        dos_t = self.n - self.k
+        filas = len(palabras)
+        # Berlekamp–Massey (forma de Blahut): Λ(x) localizador y B(x) ya desplazado por x.
+        # En el paso r ambos tienen grado ≤ r + 1: solo se opera sobre esas columnas
+        localizador = np.zeros((filas, dos_t + 1), dtype=np.uint8)
+        localizador[:, 0] = 1
+        auxiliar = localizador.copy()
+        grado = np.zeros(filas, dtype=np.int64)
+        for r in range(dos_t):
+            vivas = r + 2
+            discrepancia = np.bitwise_xor.reduce(_multiplicar(plano, localizador[:, :r + 1], sindromes[:, r::-1]),
+                                                 axis=1)
+            desplazado = np.zeros((filas, vivas), dtype=np.uint8)
+            desplazado[:, 1:] = auxiliar[:, :vivas - 1]
+            cambia = (discrepancia != 0) & (2 * grado <= r)
+            nuevo = localizador[:, :vivas] ^ _multiplicar(plano, discrepancia[:, None], desplazado)
+            auxiliar[:, :vivas] = np.where(cambia[:, None],
+                                           _multiplicar(plano, inverso[discrepancia][:, None], localizador[:, :vivas]),
+                                           desplazado)
+            grado = np.where(cambia, r + 1 - grado, grado)
+            localizador[:, :vivas] = nuevo
+        validas = grado <= self.t
+        # Chien: raíces de Λ entre las inversas de los localizadores de las n posiciones
+        grado_max = int(grado[validas].max(initial=0))
+        evaluado = np.zeros((filas, self.n), dtype=np.uint8)
+        for i in range(grado_max + 1):
+            evaluado ^= _multiplicar(plano, localizador[:, i, None], self._tabla_chien[i][None, :])
+        raices = evaluado == 0
+        validas &= np.count_nonzero(raices, axis=1) == grado
+        # Forney: e = X^(1-fcr)·Ω(X^-1)/Λ'(X^-1), con Ω = S·Λ mod x^(2t)
+        evaluador = np.zeros((filas, dos_t), dtype=np.uint8)
+        for i in range(grado_max + 1):
+            evaluador[:, i:] ^= _multiplicar(plano, localizador[:, i, None], sindromes[:, :dos_t - i])
+        fila, posicion = np.nonzero(raices & validas[:, None])
+        log_inverso = (-(self.n - 1 - posicion)) % 255  # log de X^-1
+        omega = np.zeros(len(fila), dtype=np.uint8)
+        for i in range(dos_t):
+            omega ^= producto[evaluador[fila, i], antilog[(i * log_inverso) % 255]]
+        derivada = np.zeros(len(fila), dtype=np.uint8)
+        for i in range(1, grado_max + 1, 2):
+            derivada ^= producto[localizador[fila, i], antilog[((i - 1) * log_inverso) % 255]]
+        factor = antilog[((1 - self.fcr) * (self.n - 1 - posicion)) % 255]
+        magnitud = producto[producto[factor, omega], inverso[derivada]]
+        validas[fila[derivada == 0]] = False
+        corregidas = palabras.copy()
+        corregidas[fila, posicion] ^= magnitud
+        return corregidas, validas
+
+    def codificar(self, datos: bytes) -> np.ndarray:
+        """Flujo de palabras (uint8) de `datos`; el último bloque se completa con ceros."""
+        bloques = -(-len(datos) // self.k)
+        relleno = np.zeros(bloques * self.k, dtype=np.uint8)
+        relleno[:len(datos)] = np.frombuffer(datos, dtype=np.uint8)
+        return self.codificar_bloques(relleno.reshape(bloques, self.k)).reshape(-1)
+
+    def decodificar(self, flujo: np.ndarray, longitud: int) -> tuple:
+        """Inversa de `codificar`: (bytes de datos (`longitud`), estado de cada palabra)."""
+        datos, estados = self.decodificar_bloques(np.asarray(flujo, dtype=np.uint8).reshape(-1, self.n))
+        return datos.reshape(-1)[:longitud].tobytes(), estados
+
+
+CODIGOS_RS = {
+    index.FEC_RS_255_223: CodigoRS(255, 223),
+    index.FEC_RS_204_188: CodigoRS(204, 188),
+}
+
+
+def mascaras_palabras(tipo_error: str, codigo: CodigoRS, palabras: int, rng: np.random.Generator,
+                      parametros_canal=None) -> np.ndarray:
+    """Máscaras de error (matriz uint8, una fila de n bytes por palabra) de un fragmento.
+
+    Los modelos de una palabra ponen un evento por palabra de código, como con
+    Hamming: un bit, dos bits distintos o una ráfaga de 3 bits en cualquier lugar de
+    sus 8n bits. El canal de Gilbert–Elliott se aplica sobre el flujo transmitido.
+    """
+    if tipo_error == TIPO_ERROR_GILBERT:
+        fuente = canal.FuenteMascaras(tipo_error, 8, rng, parametros_canal)
+        return fuente.siguientes(palabras * codigo.n).reshape(palabras, codigo.n)
+    bits = 8 * codigo.n
+    if tipo_error == TIPO_ERROR_DOS_BITS:
+        primero = rng.integers(0, bits, palabras)
+        segundo = rng.integers(0, bits - 1, palabras)
+        posiciones = np.stack((primero, segundo + (segundo >= primero)), axis=1)
+    elif tipo_error == TIPO_ERROR_RAFAGA:
+        posiciones = rng.integers(0, bits - 2, palabras)[:, None] + np.arange(3)
+    else:  # TIPO_ERROR_UN_BIT
+        posiciones = rng.integers(0, bits, palabras)[:, None]
+    mascaras = np.zeros((palabras, codigo.n), dtype=np.uint8)
+    fila = np.repeat(np.arange(palabras), posiciones.shape[1])
+    byte, bit = np.divmod(posiciones.reshape(-1), 8)
+    np.bitwise_xor.at(mascaras, (fila, byte), (0x80 >> bit).astype(np.uint8))
+    return mascaras
+
+
+def procesar_rs_lote(bytes_data: bytes, estado: dict = None, lock: threading.Lock = None,
+                     codigo: CodigoRS = CODIGOS_RS[index.FEC_RS_255_223], tipo_error: str = TIPO_ERROR_UN_BIT,
+                     semilla: int = None, parametros_canal=None, indice_inicial: int = 0,
+                     perfil: bool = False, intercalador=None, tamano_fragmento: int = None) -> Resultado:
+    """Simula `codigo` como `vectorizado.procesar_hamming_lote` y devuelve el mismo `Resultado`.
+
+    La entrada se parte en los fragmentos comunes (`tamano_fragmento` bytes, por
+    defecto index.TAMANO_FRAGMENTO) y cada uno
+    se codifica por separado, con su último bloque completado con ceros y su
+    flujo aleatorio `canal.rng_fragmento(semilla, CODEC_RS, indice_inicial + i)`: así
+    el modo por flujo da lo mismo que la entrada completa. `corregidos` y
+    `no_corregibles` cuentan bytes de datos de las palabras en ese estado. Con
+    `intercalador` (intercalado.Intercalador) la unidad palabra es el símbolo de un byte.
+    """
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    reportador = index.ReportadorProgreso(estado, lock, 'ham') if estado is not None else None
+    medicion = index.PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+    inicio = marca = time.perf_counter()
+    datos = np.frombuffer(bytes_data, dtype=np.uint8)
+    total = len(datos)
+    corregidos = no_corregibles = correctos = 0
+    bloques_totales = 0
+
+    tamano_fragmento = tamano_fragmento if tamano_fragmento is not None else index.TAMANO_FRAGMENTO
+    for i, desde in enumerate(range(0, total, tamano_fragmento), start=indice_inicial):
+        fragmento = datos[desde:desde + tamano_fragmento]
+        bloques = -(-len(fragmento) // codigo.k)
+        bloques_totales += bloques
+        relleno = np.zeros(bloques * codigo.k, dtype=np.uint8)
+        relleno[:len(fragmento)] = fragmento
+        # Bytes de datos reales de cada palabra (la última puede estar rellena)
+        utiles = np.minimum(codigo.k, len(fragmento) - codigo.k * np.arange(bloques))
+        mascaras = mascaras_palabras(tipo_error, codigo, bloques, canal.rng_fragmento(semilla, canal.CODEC_RS, i),
+                                     parametros_canal)
+        if intercalador is not None:
+            mascaras = intercalador.desintercalar_mascaras(mascaras.reshape(-1), 8).reshape(bloques, codigo.n)
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca, llamadas=0)
+        palabras = codigo.codificar_bloques(relleno.reshape(bloques, codigo.k))
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CODIFICAR, marca)
+        recibidas = palabras ^ mascaras
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca)
+        _, estados = codigo.decodificar_bloques(recibidas)
+        cor = int(utiles[estados == ESTADO_CORREGIDO].sum())
+        no_cor = int(utiles[estados == ESTADO_NO_CORREGIBLE].sum())
+        corregidos += cor
+        no_corregibles += no_cor
+        correctos += len(fragmento) - cor - no_cor
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_DECODIFICAR, marca)
+        if reportador is not None and desde + len(fragmento) >= reportador.proximo:
+            reportador.publicar(desde + len(fragmento), corregidos=corregidos,
+                                no_corregibles=no_corregibles, correctos=correctos)
+            if medicion is not None:
+                marca = medicion.sumar(index.ETAPA_PROGRESO, marca)
+
+    if reportador is not None:
+        reportador.publicar(total, corregidos=corregidos, no_corregibles=no_corregibles, correctos=correctos)
+    fin = time.perf_counter()
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
+    return Resultado(
+        total=total,
+        procesados=total,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=f"corregidos: {corregidos}, no_corregibles: {no_corregibles}",
+        corregidos=corregidos,
+        no_corregibles=no_corregibles,
+        overhead_bits=bloques_totales * (codigo.n - codigo.k) * 8,
+        perfil=medicion
+    )
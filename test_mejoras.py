@@ -94,6 +94,668 @@ def prueba_basica():
     print(f"Estado: {status}")
     print(f"✓ Corrección exitosa: {corregido == codigo}")
     
+    print("\n" + "="*80)
+    print("PRUEBA 6: CRC de mensaje completo con tabla")
+    print("="*80)
+    
+    mensaje = b"123456789"
+    for nombre, poly in index.POLINOMIOS_CRC.items():
+        crc_tabla = index.crc_mensaje(mensaje, poly)
+        crc_bits = index.calcular_crc(int.from_bytes(mensaje, 'big'), poly=poly,
+                                      data_bits=len(mensaje) * 8, usar_tabla=False)
+        print(f"{nombre:15} : 0x{crc_tabla:X} ✓ Coincide con división larga: {crc_tabla == crc_bits}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 7: Kernels slicing-by-N")
+    print("="*80)
+    
+    buffer = bytes(range(256)) * 4 + b"cola"
+    for nombre in ('CRC-16-IBM', 'CRC-16-CCITT', 'CRC-32'):
+        poly = index.POLINOMIOS_CRC[nombre]
+        referencia = index.crc_mensaje(buffer, poly)
+        iguales = all(index.crc_mensaje_slicing(buffer, poly, n) == referencia for n in (4, 8, 16))
+        print(f"{nombre:15} : ✓ slicing-4/8/16 coinciden con la tabla byte a byte: {iguales}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 8: Verificación CRC con tabla vs división larga")
+    print("="*80)
+    
+    for nombre, poly in index.POLINOMIOS_CRC.items():
+        grado = poly.bit_length() - 1
+        paquetes = [((b << grado) | index.calcular_crc(b, poly=poly)) ^ (1 << (b % (8 + grado)) if b % 3 else 0)
+                    for b in range(256)]
+        iguales = all(index.verificar_crc(p, poly=poly) == index.verificar_crc(p, poly=poly, usar_tabla=False)
+                      for p in paquetes)
+        print(f"{nombre:15} : ✓ Mismo veredicto con y sin tabla: {iguales}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 9: Tablas precalculadas de Hamming(12,8)")
+    print("="*80)
+    
+    tabla_cod = index.tabla_codificacion_hamming()
+    tabla_dec = index.tabla_decodificacion_hamming()
+    cod_ok = all(tabla_cod[b] == index.codificar_hamming(b) for b in range(256))
+    dec_ok = all(tabla_dec[r][0::2] == index.decodificar_corregir_hamming(r) for r in range(4096))
+    datos_ok = all(tabla_dec[tabla_cod[b] ^ (1 << pos)][1] == b for b in range(256) for pos in range(12))
+    print(f"✓ Tabla de codificación (256) coincide: {cod_ok}")
+    print(f"✓ Tabla de decodificación (4096) coincide: {dec_ok}")
+    print(f"✓ Recupera el byte tras cualquier error de 1 bit: {datos_ok}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 10: Pipeline vectorizado (NumPy)")
+    print("="*80)
+    
+    try:
+        import vectorizado
+    except ImportError:
+        print("numpy no disponible: se omite la prueba vectorizada")
+    else:
+        datos = bytes(range(256)) * 64
+        res_crc = vectorizado.procesar_crc_lote(datos, poly=index.POLINOMIOS_CRC['CRC-16-CCITT'])
+        res_ham = vectorizado.procesar_hamming_lote(datos)
+        cod_np, datos_np, _ = vectorizado.tablas_hamming_np()
+        tablas_ok = (list(cod_np) == index.tabla_codificacion_hamming()
+                     and list(datos_np) == [d for _, d, _ in index.tabla_decodificacion_hamming()])
+        print(f"✓ Tablas NumPy coinciden con las tablas Python: {tablas_ok}")
+        print(f"✓ CRC-16 detecta todos los errores de 1 bit: {res_crc.detectados == len(datos)}")
+        print(f"✓ Hamming corrige todos los errores de 1 bit: {res_ham.corregidos == len(datos)}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 11: Motor paralelo determinista")
+    print("="*80)
+    
+    try:
+        import paralelo
+    except ImportError:
+        print("numpy no disponible: se omite la prueba del motor paralelo")
+    else:
+        tamano_original = index.TAMANO_FRAGMENTO
+        index.TAMANO_FRAGMENTO = 4096
+        datos = bytes(range(256)) * 50
+        res_1 = paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=index.TIPO_ERROR_DOS_BITS,
+                                           semilla=1234, trabajadores=1)
+        res_3 = paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=index.TIPO_ERROR_DOS_BITS,
+                                           semilla=1234, trabajadores=3)
+        index.TAMANO_FRAGMENTO = tamano_original
+        iguales = (res_1.corregidos, res_1.no_corregibles) == (res_3.corregidos, res_3.no_corregibles)
+        print(f"Con 1 proceso:  {res_1.metrica}")
+        print(f"Con 3 procesos: {res_3.metrica}")
+        print(f"✓ Mismo resultado con la misma semilla: {iguales}")
+        import vectorizado
+        explicito = vectorizado.procesar_hamming_lote(datos, tipo_error=index.TIPO_ERROR_DOS_BITS, semilla=1234,
+                                                      tamano_fragmento=4096)
+        print(f"✓ Misma partición pasando tamano_fragmento: "
+              f"{(explicito.corregidos, explicito.no_corregibles) == (res_1.corregidos, res_1.no_corregibles)}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 12: Codificación de archivos (encode/decode con mmap)")
+    print("="*80)
+    
+    try:
+        import transporte
+    except ImportError:
+        print("numpy no disponible: se omite la prueba de transporte")
+    else:
+        import tempfile
+        with tempfile.TemporaryDirectory() as tmp:
+            original = os.path.join(tmp, "datos.bin")
+            codificado = os.path.join(tmp, "datos.enc")
+            recuperado = os.path.join(tmp, "datos.dec")
+            datos = bytes(range(256)) * 20 + b"impar"
+            with open(original, 'wb') as f:
+                f.write(datos)
+            for codec, extra in (('hamming', {}), ('crc', {'poly': index.POLINOMIOS_CRC['CRC-16-CCITT'], 'trama': 100})):
+                transporte.codificar_archivo(original, codificado, codec=codec, **extra)
+                with open(codificado, 'r+b') as f:
+                    f.seek(transporte.CABECERA.size + 10)
+                    byte = f.read(1)[0]
+                    f.seek(-1, os.SEEK_CUR)
+                    f.write(bytes([byte ^ 0x01]))  # error de 1 bit
+                res = transporte.decodificar_archivo(codificado, recuperado)
+                with open(recuperado, 'rb') as f:
+                    iguales = f.read() == datos
+                if codec == 'hamming':
+                    print(f"{codec:8}: {res.metrica}; ✓ datos recuperados: {iguales}")
+                else:
+                    print(f"{codec:8}: {res.metrica}; ✓ trama dañada detectada: {res.detectados == 1}")
+            # Cabeceras corruptas: codec desconocido, trama de 0 bytes, polinomio de grado 12
+            with open(codificado, 'rb') as f:
+                campos = transporte.CABECERA.unpack(f.read(transporte.CABECERA.size))
+            rechazadas = 0
+            for campo, valor in (('codec', 7), ('trama', 0), ('poly', 0x180F)):
+                cabecera = dict(zip(('magia', 'version', 'codec', 'trama', 'poly', 'longitud'), campos))
+                cabecera[campo] = valor
+                corrupto = os.path.join(tmp, "corrupto.enc")
+                with open(corrupto, 'wb') as f:
+                    f.write(transporte.CABECERA.pack(*cabecera.values()))
+                try:
+                    transporte.decodificar_archivo(corrupto, recuperado)
+                except ValueError:
+                    rechazadas += 1
+            print(f"Cabeceras corruptas rechazadas con ValueError ✓ {rechazadas == 3}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 13: Análisis exhaustivo de patrones de error")
+    print("="*80)
+    
+    try:
+        import exhaustivo
+    except ImportError:
+        print("numpy no disponible: se omite el análisis exhaustivo")
+    else:
+        ham = exhaustivo.analizar_exhaustivo('hamming', 'peso1')
+        print(f"Hamming peso1: {ham.casos} casos, corrección {ham.tasa_correccion:.1f}% "
+              f"✓ {ham.corregidos == ham.casos == 256 * 12}")
+        ham2 = exhaustivo.analizar_exhaustivo('hamming', 'peso2')
+        print(f"Hamming peso2: señalados {ham2.tasa_deteccion:.2f}%, mal corregidos {ham2.tasa_mal_correccion:.2f}% "
+              f"✓ {ham2.corregidos == 0 and ham2.mal_corregidos + ham2.no_corregibles == ham2.casos}")
+        for nombre in ('CRC-8', 'CRC-16-CCITT'):
+            a = exhaustivo.analizar_exhaustivo('crc', 'rafaga8', index.POLINOMIOS_CRC[nombre])
+            print(f"{nombre:13} rafaga8: detección {a.tasa_deteccion:.2f}% ✓ {a.no_detectados == 0}")
+        rechazadas = []
+        for clase in ('peso0', 'peso5', 'rafaga0', 'rafaga40', 'bloque2'):
+            try:
+                exhaustivo.patrones_error(clase, 40)
+            except ValueError:
+                rechazadas.append(clase)
+        print(f"Clases fuera de CLASES_PATRON rechazadas: {', '.join(rechazadas)} ✓ {len(rechazadas) == 5}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 14: Barrido de BER en canal BSC")
+    print("="*80)
+    
+    try:
+        import canal
+        import numpy as np
+    except ImportError:
+        print("numpy no disponible: se omite el barrido BSC")
+    else:
+        import tempfile
+        pos = canal.posiciones_bsc(10**6, 1e-2, np.random.default_rng(7))
+        _, mascaras = canal.mascaras_desde_posiciones(pos, 12)
+        bits = sum(bin(int(m)).count('1') for m in mascaras)
+        print(f"BSC p=1e-2 sobre 10^6 bits: {len(pos)} errores ✓ {9500 < len(pos) < 10500 and bits == len(pos)}")
+        filas = canal.barrido_bsc([0.0, 1e-3, 1e-1], bits_datos=80000, semilla=5, trabajadores=1)
+        print(f"p=0: goodput CRC {filas[0]['crc_goodput']:.4f}, Hamming {filas[0]['ham_goodput']:.4f} "
+              f"✓ {filas[0]['crc_palabras_error'] == 0 and filas[0]['ham_goodput'] == 8 / 12}")
+        print(f"BER residual Hamming crece con p ✓ {filas[1]['ham_ber_residual'] < filas[2]['ham_ber_residual']}")
+        repetido = canal.barrido_bsc([0.0, 1e-3, 1e-1], bits_datos=80000, semilla=5, trabajadores=1)
+        print(f"Misma semilla, mismo barrido ✓ {repetido == filas}")
+        with tempfile.TemporaryDirectory() as tmp:
+            for extension in ('csv', 'json'):
+                ruta = os.path.join(tmp, f"barrido.{extension}")
+                canal.guardar_barrido(filas, ruta)
+                print(f"Ida y vuelta {extension.upper()} ✓ {canal.cargar_barrido(ruta) == filas}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 15: Canal de Gilbert–Elliott (ráfagas con memoria)")
+    print("="*80)
+    
+    try:
+        import canal
+        import numpy as np
+        import vectorizado
+    except ImportError:
+        print("numpy no disponible: se omite el canal de Gilbert–Elliott")
+    else:
+        parametros = canal.ParametrosGilbertElliott(p_buena_mala=1e-3, p_mala_buena=0.05, ber_buena=0.0, ber_mala=0.5)
+        ge = canal.CanalGilbertElliott(parametros, np.random.default_rng(11))
+        inicios, longitudes, es_mala = ge.estancias(10**6)
+        print(f"Estancias cubren el flujo ✓ {int(longitudes.sum()) == 10**6 and bool((longitudes > 0).all())}")
+        mascaras = np.concatenate([ge.mascaras(12, 50000) for _ in range(20)])  # por bloques, estado continuo
+        ber = sum(bin(int(m)).count('1') for m in mascaras[mascaras != 0]) / (len(mascaras) * 12)
+        print(f"BER observada {ber:.2e} vs media teórica {parametros.ber_media:.2e}")
+        multiples_ge = np.count_nonzero([bin(int(m)).count('1') >= 2 for m in mascaras[mascaras != 0]])
+        pos_bsc = canal.posiciones_bsc(len(mascaras) * 12, parametros.ber_media, np.random.default_rng(11))
+        _, mascaras_bsc = canal.mascaras_desde_posiciones(pos_bsc, 12)
+        multiples_bsc = sum(bin(int(m)).count('1') >= 2 for m in mascaras_bsc)
+        print(f"Palabras con ≥2 errores: GE {multiples_ge} vs BSC {multiples_bsc} ✓ {multiples_ge > 2 * multiples_bsc}")
+        res = vectorizado.procesar_hamming_lote(bytes(range(256)) * 400, tipo_error=index.TIPO_ERROR_GILBERT,
+                                                semilla=3, parametros_canal=parametros)
+        print(f"Hamming vectorizado con GE: {res.metrica}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 16: Máscaras de error pregeneradas por bloques")
+    print("="*80)
+    
+    for tipo in (index.TIPO_ERROR_UN_BIT, index.TIPO_ERROR_DOS_BITS, index.TIPO_ERROR_RAFAGA):
+        tabla = index.tabla_mascaras(tipo, 16)
+        vistas = {index.simular_error(0, 16, tipo) for _ in range(3000)}
+        print(f"{tipo:9}: {len(tabla)} máscaras en la tabla ✓ {vistas == set(tabla)}")
+    primeras = list(index.fuente_mascaras(index.TIPO_ERROR_DOS_BITS, 12, 1000, 'ham'))
+    print(f"Fuente escalar: 1000 máscaras de 2 bits ✓ {len(primeras) == 1000 and all(bin(m).count('1') == 2 for m in primeras)}")
+    try:
+        import canal
+        import numpy as np
+    except ImportError:
+        print("numpy no disponible: se omite la comparación con canal.FuenteMascaras")
+    else:
+        por_bloques = canal.FuenteMascaras(index.TIPO_ERROR_RAFAGA, 24, np.random.default_rng(9)).siguientes(100000)
+        iterada = canal.FuenteMascaras(index.TIPO_ERROR_RAFAGA, 24, np.random.default_rng(9))
+        mismas = [m for m, _ in zip(iterada, range(100000))] == por_bloques.tolist()
+        print(f"Iterador y arreglo recorren el mismo flujo ✓ {mismas}")
+    
+    print("\n" + "="*80)
+    print("PRUEBA 17: Misma semilla, mismo resultado en todos los motores")
+    print("="*80)
+    
+    import threading
+    try:
+        import paralelo
+        import vectorizado
+    except ImportError:
+        print("numpy no disponible: solo se comprueba el motor escalar")
+        motores = []
+    else:
+        motores = ['vectorizado', 'paralelo']
+    tamano_original = index.TAMANO_FRAGMENTO
+    index.TAMANO_FRAGMENTO = 8192  # varios fragmentos con pocos datos
+    datos = bytes((i * 37) & 0xFF for i in range(30000))
+    poly = index.POLINOMIOS_CRC['CRC-16-CCITT']
+    clave = lambda r: (r.detectados, r.no_detectados, r.falsos_positivos, r.corregidos, r.no_corregibles)
+    for tipo in (index.TIPO_ERROR_DOS_BITS, index.TIPO_ERROR_RAFAGA) + ((index.TIPO_ERROR_GILBERT,) if motores else ()):
+        estado = {'crc': {}, 'ham': {}}
+        lock = threading.Lock()
+        referencia = (clave(index.procesar_crc(datos, estado, lock, poly=poly, tipo_error=tipo, semilla=99)),
+                      clave(index.procesar_hamming(datos, estado, lock, tipo_error=tipo, semilla=99)))
+        iguales = [clave(index.procesar_crc(datos, estado, lock, poly=poly, tipo_error=tipo, semilla=99)) == referencia[0]]
+        if motores:
+            iguales.append((clave(vectorizado.procesar_crc_lote(datos, poly=poly, tipo_error=tipo, semilla=99)),
+                            clave(vectorizado.procesar_hamming_lote(datos, tipo_error=tipo, semilla=99))) == referencia)
+            iguales.append((clave(paralelo.ejecutar_paralelo(datos, paralelo.CODEC_CRC, poly=poly, tipo_error=tipo,
+                                                             semilla=99, trabajadores=2)),
+                            clave(paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=tipo,
+                                                             semilla=99, trabajadores=2))) == referencia)
+            fragmentos = (datos[i:i + 8192] for i in range(0, len(datos), 8192))
+            por_flujo = index.procesar_flujo(fragmentos, {'crc': {'total': 0}, 'ham': {'total': 0}}, lock, poly=poly,
+                                             tipo_error=tipo, motor='vectorizado', semilla=99)
+            iguales.append((clave(por_flujo[0]), clave(por_flujo[1])) == referencia)
+        print(f"{tipo:9}: escalar {referencia} ✓ {all(iguales)}")
+    index.TAMANO_FRAGMENTO = tamano_original
+
+    print("\n" + "="*80)
+    print("PRUEBA 18: Suite de benchmarks (bench.py)")
+    print("="*80)
+
+    import bench
+    est = bench.estadisticas([0.004, 0.001, 0.002, 0.003, 0.010], 1024 * 1024)
+    print(f"Mediana {est['mediana_ms']:.1f} ms, p95 {est['p95_ms']:.1f} ms, {est['mb_s']:.0f} MB/s "
+          f"✓ {est['mediana_ms'] == 3.0 and est['p95_ms'] == 10.0 and round(est['mb_s']) == 333}")
+    filas = bench.ejecutar_suite(tamanos=[4096], codecs=[bench.CODEC_CRC, bench.CODEC_HAMMING],
+                                 implementaciones=[bench.IMPL_TABLA, bench.IMPL_VECTORIZADO],
+                                 repeticiones=2, calentamiento=1)
+    etapas = {(f['codec'], f['implementacion']): set() for f in filas}
+    for f in filas:
+        etapas[(f['codec'], f['implementacion'])].add(f['etapa'])
+    print(f"{len(filas)} mediciones, todas las etapas por implementación ✓ {all(e == set(bench.ETAPAS) for e in etapas.values())}")
+    lenta = [dict(f, mediana_ms=f['mediana_ms'] * 2) for f in filas]
+    regresiones = sum(c['regresion'] for c in bench.comparar(lenta, filas, umbral=0.5))
+    sin_cambio = sum(c['regresion'] for c in bench.comparar(filas, filas))
+    print(f"Regresión detectada al duplicar los tiempos ✓ {regresiones == len(filas) and sin_cambio == 0}")
+    detener = threading.Event()
+    parciales = bench.ejecutar_suite(tamanos=[4096], codecs=[bench.CODEC_CRC, bench.CODEC_HAMMING],
+                                     implementaciones=[bench.IMPL_TABLA], repeticiones=2, calentamiento=1,
+                                     informar=lambda fila: detener.set(), detener=detener)
+    print(f"La suite se detiene tras la primera medición ✓ {len(parciales) == 1}")
+    import contextlib
+    import io
+    for orden, esperado in ((["bench", "--tamanos", "1024", "--codecs", "crc", "--implementaciones", "tabla",
+                              "--repeticiones", "1", "--calentamiento", "0"], "crc          tabla"),
+                            (["--byte", "65", "--iters", "200"], "ham          tabla")):
+        argv, sys.argv = sys.argv, ["index.py"] + orden
+        salida = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(salida):
+                index.main()
+        except SystemExit as e:
+            codigo = e.code
+        else:
+            codigo = 0
+        finally:
+            sys.argv = argv
+        print(f"'{orden[0]}' desde la línea de órdenes ✓ {codigo == 0 and esperado in salida.getvalue()}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 19: Perfil por etapas en Resultado")
+    print("="*80)
+
+    datos = bytes((i * 53) & 0xFF for i in range(20000))
+    contadores = lambda r: (r.detectados, r.no_detectados, r.falsos_positivos, r.corregidos, r.no_corregibles)
+    estado = {'crc': {}, 'ham': {}}
+    lock = threading.Lock()
+    sin_perfil = index.procesar_crc(datos, estado, lock, tipo_error=index.TIPO_ERROR_RAFAGA, semilla=4)
+    con_perfil = index.procesar_crc(datos, estado, lock, tipo_error=index.TIPO_ERROR_RAFAGA, semilla=4, perfil=True)
+    print(f"Sin perfil no se crea ✓ {sin_perfil.perfil is None}")
+    print(f"Mismos contadores con perfil ✓ {contadores(sin_perfil) == contadores(con_perfil)}")
+    p = con_perfil.perfil
+    etapas_ok = all(p.llamadas.get(e, 0) > 0 for e in (index.ETAPA_CODIFICAR, index.ETAPA_CANAL, index.ETAPA_DECODIFICAR))
+    print(f"Etapas medidas: {', '.join(f'{e}={ms:.2f}ms' for e, ms in p.tiempos_ms.items())} ✓ {etapas_ok}")
+    print(f"Suma de etapas <= pared ({p.medido_ms:.2f} <= {p.pared_ms:.2f} ms) ✓ {p.medido_ms <= p.pared_ms + 1e-6}")
+    ham = index.procesar_hamming(datos, estado, lock, tipo_error=index.TIPO_ERROR_RAFAGA, semilla=4, perfil=True)
+    combinado = index.combinar_resultados([con_perfil, ham], 1.0)
+    suma_llamadas = con_perfil.perfil.llamadas[index.ETAPA_CANAL] + ham.perfil.llamadas[index.ETAPA_CANAL]
+    print(f"Los perfiles se suman al combinar ✓ {combinado.perfil.llamadas[index.ETAPA_CANAL] == suma_llamadas}")
+    if motores:
+        lote = vectorizado.procesar_crc_lote(datos, tipo_error=index.TIPO_ERROR_RAFAGA, semilla=4, perfil=True)
+        print(f"Vectorizado: throughput codec {lote.throughput_codec:.1f} MB/s ✓ "
+              f"{contadores(lote) == contadores(sin_perfil) and lote.perfil.llamadas[index.ETAPA_CODIFICAR] > 0}")
+    args = index.crear_parser().parse_args(["--perfil", "sweep", "--p", "1e-3", "1e-2"])
+    print(f"--perfil no choca con '--p' de los subcomandos ✓ {args.perfil and args.p == [1e-3, 1e-2]}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 20: Catálogo de algoritmos CRC (modelo Rocksoft)")
+    print("="*80)
+
+    import binascii
+    import zlib
+    import time
+    import modelos_crc
+    fallan = [m.nombre for m in modelos_crc.CATALOGO_CRC.values() if not m.verificar_check()]
+    print(f"{len(modelos_crc.CATALOGO_CRC)} algoritmos con su valor check ✓ {not fallan} {fallan or ''}")
+    aleatorio = bytes((i * 131 + 7) & 0xFF for i in range(300))
+    iguales = all(m.calcular(aleatorio) == modelos_crc.crc_bit_a_bit(aleatorio, m)
+                  for m in modelos_crc.CATALOGO_CRC.values())
+    print(f"Tabla == referencia bit a bit ✓ {iguales}")
+    crc32 = modelos_crc.buscar_modelo('crc-32')
+    xmodem = modelos_crc.buscar_modelo('CRC-16-CCITT')
+    print(f"CRC-32 == zlib.crc32 ✓ {crc32.calcular(aleatorio) == zlib.crc32(aleatorio)}")
+    print(f"CRC-16/XMODEM == binascii.crc_hqx ✓ {xmodem.calcular(aleatorio) == binascii.crc_hqx(aleatorio, 0)}")
+    registro = crc32.registro_inicial()
+    for i in range(0, len(aleatorio), 77):
+        registro = crc32.actualizar(registro, aleatorio[i:i + 77])
+    print(f"Por fragmentos == de una vez ✓ {crc32.finalizar(registro) == crc32.calcular(aleatorio)}")
+    print(f"Caché de tablas acotada ✓ "
+          f"{index.obtener_tabla_crc.cache_info().maxsize == modelos_crc.TAMANO_CACHE_TABLAS}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 21: Rutinas en C de la biblioteca estándar (zlib, binascii)")
+    print("="*80)
+
+    grande = bytes((i * 7 + (i >> 9)) & 0xFF for i in range(1 << 20))
+    print(f"Backends: CRC-32 {crc32.backend}, CRC-16/XMODEM {xmodem.backend}, "
+          f"CRC-32/BZIP2 {modelos_crc.buscar_modelo('CRC-32/BZIP2').backend}")
+    iguales = all(m.calcular(aleatorio) == m.calcular(aleatorio, acelerado=False)
+                  for m in modelos_crc.CATALOGO_CRC.values())
+    print(f"C == tabla en Python en todo el catálogo ✓ {iguales}")
+    ccitt = index.POLINOMIOS_CRC['CRC-16-CCITT']
+    print(f"crc_mensaje CRC-16-CCITT -> {index.backend_crc_mensaje(ccitt)} ✓ "
+          f"{index.crc_mensaje(grande, ccitt) == index.crc_mensaje(grande, ccitt, acelerado=False)}")
+    t0 = time.perf_counter(); crc32.calcular(grande, acelerado=False); t_py = time.perf_counter() - t0
+    t0 = time.perf_counter(); crc32.calcular(grande); t_c = time.perf_counter() - t0
+    print(f"CRC-32 de 1 MiB: Python {t_py * 1000:.1f} ms, zlib {t_c * 1000:.2f} ms ({t_py / t_c:.0f}x)")
+    lock = threading.Lock()
+    res_crc, _, crc_flujo = index.procesar_flujo([grande[:300000], grande[300000:400000]],
+                                                  {'crc': {'total': 0}, 'ham': {'total': 0}}, lock, poly=crc32.polinomio,
+                                                  semilla=1, modelo=crc32)
+    print(f"Resultado.backend_crc = {res_crc.backend_crc} ✓ "
+          f"{res_crc.backend_crc == modelos_crc.BACKEND_ZLIB and crc_flujo == zlib.crc32(grande[:400000])}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 22: Analizador de polinomios (distancia de Hamming y P(no detectado))")
+    print("="*80)
+
+    if motores:
+        import functools
+        import itertools
+        import operator
+        import tempfile
+        import analisis_poly
+        iguales = True
+        for p in (index.POLINOMIOS_CRC['CRC-8'], 0x19, 0x1D):
+            a = analisis_poly.analizar_polinomio(p, [16], peso_max=6, cache=None)[0]
+            s = [int(v) for v in analisis_poly.sindromes(p, a.bits_palabra)]
+            fuerza_bruta = {w: sum(1 for c in itertools.combinations(s, w) if functools.reduce(operator.xor, c) == 0)
+                            for w in range(2, 7)}
+            iguales &= a.pesos == fuerza_bruta
+        print(f"Distribución de pesos == fuerza bruta (pesos 2..6) ✓ {iguales}")
+        crc32 = index.POLINOMIOS_CRC['CRC-32']
+        corto, largo = analisis_poly.analizar_polinomio(crc32, [8 * 371, 8 * 372], cache=None)
+        print(f"CRC-32: HD>=5 hasta 2974 bits de datos, 4 después ✓ "
+              f"{not corto.distancia_exacta and largo.distancia_minima == 4 and largo.ejemplo[-1] == 3006}")
+        mensaje = bytes(i & 0xFF for i in range(1, 373))
+        palabra = (int.from_bytes(mensaje, 'big') << 32) | index.crc_mensaje(mensaje, crc32)
+        error = sum(1 << i for i in largo.ejemplo)
+        print(f"verificar_crc no detecta el patrón {list(largo.ejemplo)} ✓ "
+              f"{index.verificar_crc(palabra ^ error, crc32, 8 * 372) and not index.verificar_crc(palabra ^ 1, crc32, 8 * 372)}")
+        with tempfile.TemporaryDirectory() as directorio:
+            calculado = analisis_poly.analizar_polinomio(0x11021, [512], cache=directorio)[0]
+            leido = analisis_poly.cargar_cache(directorio, 0x11021, 512, 4)
+            print(f"Caché en disco por (poly, longitud) ✓ {leido == calculado}")
+        print(f"P(no detectado) CRC-16-CCITT 64 bytes, BER 1e-5: {calculado.prob_no_detectado(1e-5):.3e}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 23: Familia Hamming(2^m-1) y SECDED sobre flujos empaquetados")
+    print("="*80)
+
+    if motores:
+        import numpy as np
+        import hamming
+        for nombre in ('ham7', 'ham15', 'secded8', 'secded16', 'ham63', 'secded64'):
+            codigo = hamming.CODIGOS_HAMMING[nombre]
+            datos = np.arange(min(1 << codigo.k, 4096), dtype=np.uint64) * 0x9E3779B97F4A7C15 & ((1 << codigo.k) - 1)
+            palabras = codigo.codificar_bloques(datos)
+            uno_ok = dos_ok = True
+            for i in range(codigo.n):
+                dec, est = codigo.decodificar_bloques(palabras ^ np.uint64(1 << i))
+                uno_ok &= bool(np.all(dec == datos) and np.all(est == hamming.ESTADO_CORREGIDO))
+                j = (i + 1) % codigo.n
+                _, est = codigo.decodificar_bloques(palabras ^ np.uint64((1 << i) | (1 << j)))
+                # SECDED detecta todo error doble; Hamming simple lo corrige mal (nunca lo detecta)
+                esperado = hamming.ESTADO_NO_CORREGIBLE if codigo.extendido else hamming.ESTADO_CORREGIDO
+                dos_ok &= bool(np.all(est == esperado))
+            mensaje = bytes(range(256)) * 3 + b'x'
+            ida_vuelta = codigo.decodificar(codigo.codificar(mensaje), len(mensaje))[0] == mensaje
+            print(f"{codigo.nombre}: corrige 1 bit ✓ {uno_ok}, errores dobles ✓ {dos_ok}, ida y vuelta ✓ {ida_vuelta}")
+        fila = hamming.simular_bsc(hamming.CODIGOS_HAMMING['secded16'], 200000, 1e-2, semilla=5)
+        print(f"BSC SECDED(16,11): contadores coherentes ✓ "
+              f"{fila['corregidas'] + fila['no_corregibles'] + fila['mal_corregidas'] <= fila['palabras_error']}")
+        print(f"BSC reproducible con la misma semilla ✓ "
+              f"{fila == hamming.simular_bsc(hamming.CODIGOS_HAMMING['secded16'], 200000, 1e-2, semilla=5)}")
+        argv, sys.argv = sys.argv, ["index.py", "--seed", "5", "fec", "--codigos", "ham15", "--p", "1e-3",
+                                    "--bits", "1e5", "--mb", "0"]
+        salida = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(salida):
+                index.main()
+        finally:
+            sys.argv = argv
+        print(f"'fec --p 1e-3' desde la línea de órdenes ✓ {'Hamming(15,11)' in salida.getvalue() and '1.00e-03' in salida.getvalue()}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 24: Reed–Solomon sobre GF(256): RS(255,223) y RS(204,188)")
+    print("="*80)
+
+    if motores:
+        import numpy as np
+        import reed_solomon
+        rng = np.random.default_rng(24)
+        for codigo in reed_solomon.CODIGOS_RS.values():
+            datos = rng.integers(0, 256, (300, codigo.k), dtype=np.uint8)
+            palabras = codigo.codificar_bloques(datos)
+            resultados = []
+            for errores in (codigo.t, codigo.t + 1):
+                mascaras = np.zeros_like(palabras)
+                for fila in mascaras:
+                    fila[rng.choice(codigo.n, errores, replace=False)] = rng.integers(1, 256, errores)
+                recuperados, estados = codigo.decodificar_bloques(palabras ^ mascaras)
+                resultados.append((np.all(recuperados == datos), np.all(estados == vectorizado.ESTADO_CORREGIDO),
+                                   np.all(estados == vectorizado.ESTADO_NO_CORREGIBLE)))
+            print(f"{codigo.nombre}: síndromes nulos ✓ {not codigo.sindromes(palabras).any()}, "
+                  f"corrige t={codigo.t} símbolos ✓ {bool(resultados[0][0] and resultados[0][1])}, "
+                  f"detecta t+1 ✓ {bool(resultados[1][2])}")
+        rs255 = reed_solomon.CODIGOS_RS[index.FEC_RS_255_223]
+        mensaje = bytes(range(256)) * 5
+        print(f"Ida y vuelta de un mensaje ✓ {rs255.decodificar(rs255.codificar(mensaje), len(mensaje))[0] == mensaje}")
+        datos = bytes(i * 7 & 0xFF for i in range(3 * index.TAMANO_FRAGMENTO // 2))
+        for tipo in (index.TIPO_ERROR_RAFAGA, index.TIPO_ERROR_GILBERT):
+            completo = reed_solomon.procesar_rs_lote(datos, codigo=rs255, tipo_error=tipo, semilla=11)
+            _, por_flujo, _ = index.procesar_flujo(
+                iter([datos[:index.TAMANO_FRAGMENTO], datos[index.TAMANO_FRAGMENTO:]]),
+                {'crc': {'total': 0}, 'ham': {'total': 0}}, threading.Lock(), tipo_error=tipo,
+                motor=index.MOTOR_VECTORIZADO, semilla=11, fec=index.FEC_RS_255_223)
+            print(f"{tipo}: flujo == entrada completa ✓ "
+                  f"{(completo.corregidos, completo.no_corregibles) == (por_flujo.corregidos, por_flujo.no_corregibles)}")
+        print(f"Ráfagas de 3 bits: RS(255,223) corrige todo ✓ "
+              f"{reed_solomon.procesar_rs_lote(datos[:50000], codigo=rs255, tipo_error=index.TIPO_ERROR_RAFAGA, semilla=2).tasa_correccion == 100.0}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 25: Intercalador de bloque entre la codificación y el canal")
+    print("="*80)
+
+    if motores:
+        import numpy as np
+        import intercalado
+        import paralelo
+        inter = intercalado.Intercalador(3, 4)
+        unidades = np.arange(24)
+        transmitido = inter.intercalar(unidades)
+        print(f"Orden de transmisión por columnas ✓ {transmitido.reshape(-1)[:6].tolist() == [0, 4, 8, 1, 5, 9]}")
+        print(f"Vistas sin copia ✓ {np.shares_memory(transmitido, unidades)}, "
+              f"ida y vuelta ✓ {np.array_equal(inter.desintercalar(transmitido.reshape(-1)).reshape(-1), unidades)}")
+        # Permutar la máscara del canal equivale a intercalar las palabras, pasar el canal y desintercalar
+        palabras = np.random.default_rng(0).integers(0, 1 << 12, 1000, dtype=np.uint16)
+        mascaras = np.random.default_rng(1).integers(0, 1 << 12, 1000, dtype=np.uint16) * (np.arange(1000) % 7 == 0)
+        mascaras = mascaras.astype(np.uint16)
+        bits = lambda v: np.unpackbits(v.astype('>u2').view(np.uint8)).reshape(-1, 16)[:, 4:].reshape(-1)
+        por_bits = intercalado.Intercalador(12, 40)
+        completos = len(bits(palabras)) // por_bits.tamano * por_bits.tamano
+        esperado = bits(palabras).copy()
+        recibido = por_bits.intercalar(esperado[:completos]).reshape(-1) ^ bits(mascaras)[:completos]
+        esperado[:completos] = por_bits.desintercalar(recibido).reshape(-1)
+        esperado[completos:] ^= bits(mascaras)[completos:]
+        print(f"Máscaras desintercaladas == intercalar + canal + desintercalar ✓ "
+              f"{np.array_equal(bits(palabras ^ por_bits.desintercalar_mascaras(mascaras, 12)), esperado)}")
+        ge = canal.ParametrosGilbertElliott(1e-4, 0.3, 0.0, 0.5)
+        datos = bytes(i * 13 & 0xFF for i in range(300000))
+        sin = vectorizado.procesar_hamming_lote(datos, tipo_error=index.TIPO_ERROR_GILBERT, semilla=8, parametros_canal=ge)
+        inter = intercalado.Intercalador(12, 128)
+        con = vectorizado.procesar_hamming_lote(datos, tipo_error=index.TIPO_ERROR_GILBERT, semilla=8,
+                                                parametros_canal=ge, intercalador=inter)
+        print(f"Gilbert–Elliott: no corregibles {sin.no_corregibles} -> {con.no_corregibles} con 12x128 bits ✓ "
+              f"{con.no_corregibles < sin.no_corregibles}")
+        escalar = index.procesar_hamming(datos, {'ham': {'total': 0}}, threading.Lock(), tipo_error=index.TIPO_ERROR_GILBERT,
+                                         semilla=8, parametros_canal=ge, intercalador=inter)
+        repartido = paralelo.ejecutar_paralelo(datos, paralelo.CODEC_HAMMING, tipo_error=index.TIPO_ERROR_GILBERT,
+                                               semilla=8, trabajadores=2, parametros_canal=ge, intercalador=inter)
+        clave = lambda r: (r.corregidos, r.no_corregibles)
+        print(f"Mismo resultado con los tres motores ✓ {clave(escalar) == clave(con) == clave(repartido)}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 26: Código convolucional K=7 (171, 133) con perforación y Viterbi")
+    print("="*80)
+
+    if motores:
+        import numpy as np
+        import convolucional
+        rng = np.random.default_rng(26)
+        mensaje = rng.integers(0, 256, 5000, dtype=np.uint8).tobytes()
+        for codigo in convolucional.CODIGOS_CONV.values():
+            transmitido = codigo.codificar(mensaje)
+            # Errores aislados (uno cada ~200 bits transmitidos) que Viterbi debe corregir
+            errores = np.zeros(len(transmitido), dtype=np.uint8)
+            errores[rng.choice(len(transmitido), len(transmitido) // 200, replace=False)] = 1
+            print(f"{codigo.nombre}: longitud ≈ 8·n/tasa ✓ {abs(len(transmitido) * codigo.tasa / (8 * len(mensaje)) - 1) < 0.01}, "
+                  f"ida y vuelta ✓ {codigo.decodificar(transmitido, len(mensaje)) == mensaje}, "
+                  f"corrige errores aislados ✓ {codigo.decodificar(transmitido ^ errores, len(mensaje)) == mensaje}")
+        # Varias ventanas de Viterbi y lotes: el resultado no depende de dónde se corta el flujo
+        conv12 = convolucional.CODIGOS_CONV[index.FEC_CONV_1_2]
+        largo = bytes(i * 31 & 0xFF for i in range(3 * convolucional.BITS_POR_VENTANA))
+        print(f"Flujo de varias ventanas sin errores ✓ {conv12.decodificar(conv12.codificar(largo), len(largo)) == largo}")
+        datos = bytes(i * 7 & 0xFF for i in range(3 * index.TAMANO_FRAGMENTO // 2))
+        ge = canal.ParametrosGilbertElliott(1e-3, 0.1, 0.0, 0.1)
+        completo = convolucional.procesar_conv_lote(datos, codigo=conv12, tipo_error=index.TIPO_ERROR_GILBERT,
+                                                    semilla=11, parametros_canal=ge)
+        _, por_flujo, _ = index.procesar_flujo(
+            iter([datos[:index.TAMANO_FRAGMENTO], datos[index.TAMANO_FRAGMENTO:]]),
+            {'crc': {'total': 0}, 'ham': {'total': 0}}, threading.Lock(), tipo_error=index.TIPO_ERROR_GILBERT,
+            motor=index.MOTOR_VECTORIZADO, semilla=11, parametros_canal=ge, fec=index.FEC_CONV_1_2)
+        print(f"Gilbert–Elliott: flujo == entrada completa ✓ "
+              f"{(completo.corregidos, completo.no_corregibles) == (por_flujo.corregidos, por_flujo.no_corregibles)}, "
+              f"corrige la mayoría ✓ {completo.corregidos > completo.no_corregibles}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 27: Simulador de enlace ARQ por eventos discretos")
+    print("="*80)
+
+    if motores:
+        import numpy as np
+        import arq
+        # Resultado de cada trama por síndromes == recalcular el CRC de la trama recibida
+        poly = index.POLINOMIOS_CRC['CRC-8']
+        tramas = np.random.default_rng(27).integers(0, 256, (20000, 32), dtype=np.uint8)
+        palabras = np.concatenate((tramas, vectorizado.crc_tramas(tramas, poly)[:, None].astype(np.uint8)), axis=1)
+        canal_tramas = canal.CanalTramas(palabras.shape[1] * 8, poly, p=0.02, rng=np.random.default_rng(1))
+        posiciones = canal_tramas.posiciones(len(palabras))
+        bits = np.unpackbits(palabras.reshape(-1))
+        bits[posiciones] ^= 1
+        recibidas = np.packbits(bits).reshape(palabras.shape)
+        danadas = np.any(recibidas != palabras, axis=1)
+        pasa_crc = vectorizado.crc_tramas(recibidas[:, :-1], poly) == recibidas[:, -1]
+        esperado = np.where(~danadas, canal.TRAMA_CORRECTA, np.where(pasa_crc, canal.TRAMA_NO_DETECTADA, canal.TRAMA_DETECTADA))
+        resultados = canal_tramas.resultados(posiciones, len(palabras))
+        print(f"Síndromes == CRC recalculado ✓ {np.array_equal(resultados, esperado)} "
+              f"({int(np.count_nonzero(resultados == canal.TRAMA_NO_DETECTADA))} no detectadas)")
+        enlace = arq.ParametrosEnlace(tasa_bps=1e6, retardo_s=0.05, bytes_trama=500)
+        t_ciclo = enlace.tiempo_trama(8) + 2 * enlace.retardo_s + enlace.tiempo_ack
+        parada = arq.simular(arq.PROTOCOLO_PARADA_ESPERA, 200, enlace, semilla=1)
+        print(f"Parada y espera sin errores: una trama por ida y vuelta ✓ "
+              f"{abs(parada.tiempo_s - (199 * t_ciclo + enlace.tiempo_trama(8) + enlace.retardo_s)) < 1e-9}")
+        minima = arq.ventana_minima(enlace)
+        limpia = arq.simular(arq.PROTOCOLO_REPETICION_SELECTIVA, 5000, enlace, minima, semilla=1)
+        print(f"Ventana de un ida y vuelta sin errores: línea llena ✓ {limpia.goodput_bps / enlace.tasa_bps > 0.9}, "
+              f"latencia = trama + propagación ✓ {np.allclose(limpia.latencias, enlace.tiempo_trama(8) + enlace.retardo_s)}")
+        selectiva = arq.simular(arq.PROTOCOLO_REPETICION_SELECTIVA, 20000, enlace, minima, p=2e-5, semilla=4)
+        retroceso = arq.simular(arq.PROTOCOLO_RETROCESO_N, 20000, enlace, minima, p=2e-5, semilla=4)
+        print(f"Repetición selectiva: una retransmisión por trama descartada ✓ "
+              f"{selectiva.retransmisiones == selectiva.descartadas == selectiva.temporizadores > 0}")
+        print(f"Retroceso N reenvía más ✓ {retroceso.retransmisiones > selectiva.retransmisiones}, "
+              f"menos goodput ✓ {retroceso.goodput_bps < selectiva.goodput_bps}, todas entregadas ✓ "
+              f"{len(retroceso.latencias) == 20000 and np.all(retroceso.latencias > 0)}")
+        repetida = arq.simular(arq.PROTOCOLO_RETROCESO_N, 20000, enlace, minima, p=2e-5, semilla=4)
+        clave = lambda r: (r.transmisiones, r.descartadas, r.temporizadores, r.tiempo_s, r.latencias.tolist())
+        print(f"Misma semilla, mismo resultado ✓ {clave(repetida) == clave(retroceso)}")
+
+    print("\n" + "="*80)
+    print("PRUEBA 28: Simulación por tramas (un CRC por trama) y barrido del tamaño de trama")
+    print("="*80)
+
+    if motores:
+        import random
+        import numpy as np
+        import tramas
+        # Tramas largas y pocas filas: CRC por tramos combinados == CRC del mensaje de cada fila
+        largas = np.random.default_rng(28).integers(0, 256, (3, 5000), dtype=np.uint8)
+        for nombre in ('CRC-8', 'CRC-16-IBM', 'CRC-32'):
+            poly = index.POLINOMIOS_CRC[nombre]
+            iguales = all(int(c) == index.crc_mensaje(fila.tobytes(), poly, 7)
+                          for c, fila in zip(vectorizado.crc_tramas(largas, poly, 7), largas))
+            print(f"{nombre:12}: CRC por tramos == crc_mensaje ✓ {iguales}")
+        datos = random.Random(28).randbytes(3 * tramas.BYTES_POR_BLOQUE + 777)
+        limpio = tramas.procesar_tramas([datos], 1500, semilla=1)
+        print(f"Sin errores: {limpio.tramas} tramas (la última corta) ✓ {limpio.tramas == -(-len(datos) // 1500)}, "
+              f"goodput = 1 - overhead ✓ {abs(limpio.goodput - (1 - limpio.overhead)) < 1e-12}")
+        ge = canal.ParametrosGilbertElliott(1e-5, 0.05, 0.0, 0.2)
+        poly16 = index.POLINOMIOS_CRC['CRC-16-CCITT']
+        entero = tramas.procesar_tramas([datos], 1000, poly16, parametros_canal=ge, semilla=5)
+        trozos = tramas.procesar_tramas((datos[i:i + 70000] for i in range(0, len(datos), 70000)), 1000, poly16,
+                                        parametros_canal=ge, semilla=5)
+        clave = lambda r: (r.tramas, r.tramas_error, r.detectadas, r.no_detectadas, r.bytes_correctos)
+        print(f"Mismo resultado con la entrada por fragmentos ✓ {clave(entero) == clave(trozos)} "
+              f"({entero.tramas_error} tramas con error)")
+        bsc = tramas.procesar_tramas([datos], 512, poly16, p=1e-4, semilla=2)
+        esperado = 1 - (1 - 1e-4) ** (8 * 512 + 16)
+        print(f"BSC: FER {bsc.fer:.3f} ≈ 1-(1-p)^bits = {esperado:.3f} ✓ {abs(bsc.fer / esperado - 1) < 0.1}")
+        ruidoso = tramas.procesar_tramas([datos[:400000]], 16, index.POLINOMIOS_CRC['CRC-8'], p=0.05, semilla=3)
+        print(f"CRC-8 con ruido fuerte: no detectadas ≈ 1/256 de las erróneas ✓ "
+              f"{1 / 512 < ruidoso.no_detectadas / ruidoso.tramas_error < 1 / 128}")
+        poly32 = index.POLINOMIOS_CRC['CRC-32']
+        optimo = tramas.tamano_optimo_bsc(32, 1e-4)
+        print(f"Óptimo teórico ({optimo:.0f} B) maximiza el goodput esperado ✓ "
+              f"{all(tramas.goodput_bsc(round(optimo), 32, 1e-4) >= tramas.goodput_bsc(t, 32, 1e-4) for t in (16, 32, 64, 128, 256))}")
+        filas = tramas.barrido_tamanos(datos, [16, 32, 64, 128, 256], poly32, p=1e-4, semilla=4)
+        print(f"El barrido elige 64 bytes, el tamaño más cercano al óptimo ✓ "
+              f"{max(filas, key=lambda r: r.goodput).bytes_trama == 64}")
+
     print("\n" + "="*80)
     print("✅ TODAS LAS PRUEBAS COMPLETADAS")
     print("="*80)
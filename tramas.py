@@ -0,0 +1,212 @@
+"""
+Simulación por tramas: un CRC por trama en lugar de uno por byte, y barrido del tamaño de trama
+La entrada se parte en tramas de `bytes_trama` bytes de datos seguidas de su CRC, que se
+calcula para todas las tramas de un bloque a la vez (vectorizado.crc_tramas, o la rutina
+en C por trama si la hay y la trama es larga). El flujo de tramas pasa por el canal (BSC
+o Gilbert–Elliott) y el receptor recalcula el CRC de cada trama recibida. Con un CRC por
+trama el overhead es grado / (8·bytes_trama) y no grado / 8; a cambio, un solo bit erróneo
+hace perder toda la trama: el barrido busca el tamaño que equilibra ambas cosas
+"""
+import math
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+import canal
+import vectorizado
+from index import POLINOMIO_CRC
+
+_ID_TRAMAS = 7  # espacio de semillas propio (ver canal._IDS_CODEC)
+TAMANOS_BARRIDO = [64, 128, 256, 512, 1024, 1500, 2048, 4096, 8192, 9000]
+# Bytes de datos por bloque de trabajo (acota la memoria con entradas grandes)
+BYTES_POR_BLOQUE = 1 << 20
+
+
+@dataclass(frozen=True)
+class ResultadoTramas:
+    """Contadores de una simulación por tramas de `procesar_tramas`."""
+    bytes_trama: int
+    grado_crc: int
+    tramas: int
+    bytes_datos: int
+    tramas_error: int       # tramas con algún bit invertido por el canal
+    detectadas: int         # tramas con error que el CRC detecta (se descartan)
+    no_detectadas: int      # tramas con error que pasan el CRC
+    bytes_correctos: int    # datos de las tramas que llegan sin errores
+    bits_transmitidos: int
+    tiempo_ms: float
+
+    @property
+    def fer(self) -> float:
+        """Tasa de tramas con error."""
+        return self.tramas_error / self.tramas if self.tramas else 0.0
+
+    @property
+    def tasa_no_detectadas(self) -> float:
+        """Fracción de las tramas enviadas que se entregan corruptas."""
+        return self.no_detectadas / self.tramas if self.tramas else 0.0
+
+    @property
+    def overhead(self) -> float:
+        """Bits de CRC por bit transmitido."""
+        return 1.0 - 8 * self.bytes_datos / self.bits_transmitidos if self.bits_transmitidos else 0.0
+
+    @property
+    def goodput(self) -> float:
+        """Bits de datos entregados sin errores por bit transmitido (throughput efectivo del enlace)."""
+        return 8 * self.bytes_correctos / self.bits_transmitidos if self.bits_transmitidos else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """MB/s de datos simulados (codificar, canal y verificar)."""
+        if self.tiempo_ms == 0:
+            return 0.0
+        return (self.bytes_datos / (1024 * 1024)) / (self.tiempo_ms / 1000.0)
+
+
+def _simular_bloque(tramas: np.ndarray, poly: int, canal_tramas: canal.CanalTramas) -> tuple:
+    """Codifica, corrompe y verifica un bloque de tramas (matriz uint8, una por fila).
+
+    Returns:
+        (tramas con error, detectadas, no detectadas, bits transmitidos)
+    """
+    n, largo = tramas.shape
+    k = (poly.bit_length() - 1) // 8
+    palabras = np.empty((n, largo + k), dtype=np.uint8)
+    palabras[:, :largo] = tramas
+    crc = vectorizado.crc_tramas(tramas, poly)
+    for i in range(k):
+        palabras[:, largo + i] = (crc >> (8 * (k - 1 - i))) & 0xFF
+    # Canal: se invierten los bits del flujo de tramas (el bit 0 es el más significativo del primer byte)
+    posiciones = canal_tramas.posiciones_bits(8 * palabras.size)
+    byte, bit = np.divmod(posiciones, 8)
+    np.bitwise_xor.at(palabras.reshape(-1), byte, np.right_shift(0x80, bit).astype(np.uint8))
+    # Receptor: el CRC de datos+CRC es 0 en las tramas sin error detectable
+    detectada = vectorizado.crc_tramas(palabras, poly) != 0
+    danada = np.zeros(n, dtype=bool)
+    danada[posiciones // (8 * (largo + k))] = True
+    return (int(np.count_nonzero(danada)), int(np.count_nonzero(detectada)),
+            int(np.count_nonzero(danada & ~detectada)), 8 * palabras.size)
+
+
+def procesar_tramas(fragmentos, bytes_trama: int = 1500, poly: int = POLINOMIO_CRC, p: float = 0.0,
+                    parametros_canal: canal.ParametrosGilbertElliott = None, semilla: int = None) -> ResultadoTramas:
+    """Simula la entrada (iterable de fragmentos de bytes) en tramas de `bytes_trama` bytes con un CRC cada una.
+
+    Las tramas se procesan por bloques de BYTES_POR_BLOQUE bytes con independencia de
+    cómo lleguen los fragmentos, así que con la misma `semilla` el resultado solo
+    depende de los datos. La última trama puede ser más corta.
+
+    Args:
+        fragmentos: Datos de entrada (p. ej. index.leer_fragmentos o [datos])
+        bytes_trama: Bytes de datos por trama
+        poly: Polinomio CRC de grado 8, 16, 24 o 32 (el CRC ocupa grado/8 bytes)
+        p: BER del canal binario simétrico (si no hay `parametros_canal`)
+        parametros_canal: Canal de Gilbert–Elliott en lugar del BSC
+        semilla: Semilla del canal (None = aleatoria)
+    """
+    grado = poly.bit_length() - 1
+    if grado % 8 or not 8 <= grado <= 32:
+        raise ValueError("El modo por tramas requiere un CRC de 8, 16, 24 o 32 bits")
+    if bytes_trama < 1:
+        raise ValueError("Las tramas deben tener al menos 1 byte de datos")
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    rng = np.random.default_rng(np.random.SeedSequence(semilla, spawn_key=(_ID_TRAMAS,)))
+    canal_tramas = canal.CanalTramas(8 * bytes_trama + grado, poly, p, parametros_canal, rng)
+    bloque = max(1, BYTES_POR_BLOQUE // bytes_trama) * bytes_trama
+    inicio = time.perf_counter()
+    tramas = bytes_datos = bytes_correctos = 0
+    contadores = [0, 0, 0, 0]  # tramas con error, detectadas, no detectadas, bits transmitidos
+
+    def simular(datos: bytes):
+        nonlocal tramas, bytes_datos, bytes_correctos
+        arreglo = np.frombuffer(datos, dtype=np.uint8)
+        completas = len(arreglo) // bytes_trama * bytes_trama
+        for parte, largo in ((arreglo[:completas], bytes_trama), (arreglo[completas:], len(arreglo) - completas)):
+            if largo:
+                resultado = _simular_bloque(parte.reshape(-1, largo), poly, canal_tramas)
+                n = len(parte) // largo
+                tramas += n
+                bytes_datos += len(parte)
+                bytes_correctos += (n - resultado[0]) * largo
+                for i, valor in enumerate(resultado):
+                    contadores[i] += valor
+
+    pendiente = bytearray()
+    for fragmento in fragmentos:
+        pendiente += fragmento
+        while len(pendiente) >= bloque:
+            simular(bytes(pendiente[:bloque]))
+            del pendiente[:bloque]
+    if pendiente:
+        simular(bytes(pendiente))
+    tramas_error, detectadas, no_detectadas, bits_transmitidos = contadores
+    return ResultadoTramas(
+        bytes_trama=bytes_trama, grado_crc=grado, tramas=tramas, bytes_datos=bytes_datos,
+        tramas_error=tramas_error, detectadas=detectadas, no_detectadas=no_detectadas,
+        bytes_correctos=bytes_correctos, bits_transmitidos=bits_transmitidos,
+        tiempo_ms=(time.perf_counter() - inicio) * 1000.0)
+
+
+def barrido_tamanos(datos: bytes, tamanos=TAMANOS_BARRIDO, poly: int = POLINOMIO_CRC, p: float = 0.0,
+                    parametros_canal: canal.ParametrosGilbertElliott = None, semilla: int = None) -> list:
+    """Un `procesar_tramas` de `datos` por tamaño de trama, todos con la misma semilla."""
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    return [procesar_tramas([datos], t, poly, p, parametros_canal, semilla) for t in tamanos]
+
+
+def goodput_bsc(bytes_trama: int, grado: int, p: float) -> float:
+    """Goodput esperado en un BSC(p): fracción de datos por la probabilidad de trama intacta."""
+    bits = 8 * bytes_trama + grado
+    return 8 * bytes_trama / bits * (1.0 - p) ** bits
+
+
+def tamano_optimo_bsc(grado: int, p: float) -> float:
+    """Bytes de datos por trama que maximizan `goodput_bsc` (infinito si p = 0).
+
+    Con L bytes de datos y c = grado/8 de CRC, derivar log(L/(L+c)) + 8(L+c)·log(1-p)
+    da L² + c·L - c/a = 0, con a = -8·log(1-p).
+    """
+    if p <= 0.0:
+        return math.inf
+    if p >= 1.0:
+        return 0.0
+    c = grado / 8
+    a = -8 * math.log1p(-p)
+    return (-c + math.sqrt(c * c + 4 * c / a)) / 2
+
+
+def imprimir_barrido(resultados: list, p: float = None, tiempo_ms: float = None):
+    """Una fila por tamaño (FER, no detectadas, overhead, goodput) y el tamaño de mayor goodput.
+
+    Con `p` (canal BSC) añade el goodput esperado y el tamaño óptimo teórico.
+    """
+    print(f"{'Trama (B)':>9} {'Tramas':>9} {'Con error':>9} {'FER':>10} {'No det.':>7} {'Overhead':>8} "
+          f"{'Goodput':>8}" + (f" {'Esperado':>8}" if p is not None else "") + f" {'MB/s':>8}")
+    for r in resultados:
+        linea = (f"{r.bytes_trama:9d} {r.tramas:9d} {r.tramas_error:9d} {r.fer:10.3e} {r.no_detectadas:7d} "
+                 f"{r.overhead * 100:7.2f}% {r.goodput:8.5f}")
+        if p is not None:
+            linea += f" {goodput_bsc(r.bytes_trama, r.grado_crc, p):8.5f}"
+        print(linea + f" {r.throughput:8.1f}")
+    if resultados:
+        mejor = max(resultados, key=lambda r: r.goodput)
+        print(f"Tamaño con mayor goodput: {mejor.bytes_trama} bytes ({mejor.goodput:.5f})")
+        if p is not None:
+            optimo = tamano_optimo_bsc(resultados[0].grado_crc, p)
+            print(f"Óptimo teórico en un BSC(p={p:g}): " + ("sin límite (sin errores)" if math.isinf(optimo)
+                                                          else f"{optimo:.0f} bytes"))
+    if tiempo_ms is not None:
+        print(f"Tiempo: {tiempo_ms:.1f} ms")
+
+
+def imprimir_resultado(r: ResultadoTramas):
+    """Resumen de una simulación por tramas."""
+    print(f"Tramas:           {r.tramas} de {r.bytes_trama} bytes + CRC de {r.grado_crc} bits "
+          f"(overhead {r.overhead * 100:.2f}%)")
+    print(f"Con error:        {r.tramas_error} (FER {r.fer:.3e})")
+    print(f"Detectadas:       {r.detectadas}")
+    print(f"No detectadas:    {r.no_detectadas} ({r.tasa_no_detectadas:.3e} de las tramas)")
+    print(f"Goodput:          {r.goodput:.5f} bits de datos correctos por bit transmitido")
+    print(f"Throughput:       {r.throughput:.1f} MB/s ({r.tiempo_ms:.1f} ms)")
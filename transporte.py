@@ -0,0 +1,260 @@
+"""
+Codificación de archivos para transporte: Hamming(12,8) empaquetado o tramas con CRC
+Los archivos se leen y escriben mediante mmap y vistas NumPy, sin crear objetos
+`bytes` por byte ni enteros de Python por palabra de código
+"""
+import mmap
+import os
+import struct
+import time
+
+import numpy as np
+
+import vectorizado
+from index import Resultado, POLINOMIO_CRC
+
+# Cabecera: magia, versión, codec, tamaño de trama (CRC), polinomio, longitud original
+CABECERA = struct.Struct('<4sBBxxIQQ')
+MAGIA = b'CRHM'
+VERSION = 1
+
+CODEC_HAMMING = 'hamming'
+CODEC_CRC = 'crc'
+_IDS_CODEC = {CODEC_HAMMING: 0, CODEC_CRC: 1}
+_CODECS_POR_ID = {v: k for k, v in _IDS_CODEC.items()}
+
+TRAMA_POR_DEFECTO = 256
+# Bytes de entrada por bloque de trabajo (par, para no partir parejas de palabras Hamming)
+TAMANO_BLOQUE = 1 << 20
+
+
+def _mapear_entrada(ruta: str):
+    """Devuelve (archivo, mmap de solo lectura o None si está vacío, tamaño)."""
+    archivo = open(ruta, 'rb')
+    tamano = os.fstat(archivo.fileno()).st_size
+    mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) if tamano else None
+    return archivo, mapa, tamano
+
+
+def _crear_salida(ruta: str, tamano: int):
+    """Crea `ruta` con `tamano` bytes preasignados y la mapea para escritura."""
+    archivo = open(ruta, 'w+b')
+    archivo.truncate(tamano)
+    return archivo, mmap.mmap(archivo.fileno(), tamano)
+
+
+def empaquetar_hamming(codigos: np.ndarray, salida: np.ndarray):
+    """Escribe palabras de 12 bits de dos en dos en grupos de 3 bytes (`salida` es una vista)."""
+    pares = codigos.reshape(-1, 2)
+    a, b = pares[:, 0], pares[:, 1]
+    grupos = salida.reshape(-1, 3)
+    grupos[:, 0] = a >> 4
+    grupos[:, 1] = ((a & 0xF) << 4) | (b >> 8)
+    grupos[:, 2] = b & 0xFF
+
+
+def desempaquetar_hamming(empaquetado: np.ndarray) -> np.ndarray:
+    """Inversa de `empaquetar_hamming`: grupos de 3 bytes -> palabras de 12 bits (uint16)."""
+    grupos = empaquetado.reshape(-1, 3).astype(np.uint16)
+    codigos = np.empty(len(grupos) * 2, dtype=np.uint16)
+    codigos[0::2] = (grupos[:, 0] << 4) | (grupos[:, 1] >> 4)
+    codigos[1::2] = ((grupos[:, 1] & 0xF) << 8) | grupos[:, 2]
+    return codigos
+
+
+def tamano_codificado(longitud: int, codec: str, poly: int = POLINOMIO_CRC, trama: int = TRAMA_POR_DEFECTO) -> int:
+    """Tamaño en bytes del archivo codificado (cabecera incluida)."""
+    if codec == CODEC_HAMMING:
+        return CABECERA.size + (longitud + 1) // 2 * 3
+    n_tramas = -(-longitud // trama)
+    return CABECERA.size + longitud + n_tramas * ((poly.bit_length() - 1) // 8)
+
+
+def _cerrar(mapa):
+    """Cierra un mmap; si aún hay vistas vivas (p. ej. al propagar una excepción) lo deja al GC."""
+    if mapa is not None:
+        try:
+            mapa.close()
+        except BufferError:
+            pass
+
+
+def _validar_tramas(poly: int, trama: int):
+    """Comprueba que las tramas CRC usan un polinomio de grado 8, 16, 24 o 32 y un tamaño positivo."""
+    degree = poly.bit_length() - 1
+    if degree % 8 or not 8 <= degree <= 32:
+        raise ValueError("Las tramas CRC requieren un polinomio de grado 8, 16, 24 o 32")
+    if trama <= 0:
+        raise ValueError("El tamaño de trama debe ser positivo")
+
+
+def codificar_archivo(entrada: str, salida: str, codec: str = CODEC_HAMMING,
+                      poly: int = POLINOMIO_CRC, trama: int = TRAMA_POR_DEFECTO) -> Resultado:
+    """Codifica `entrada` en `salida` (Hamming empaquetado o tramas datos+CRC).
+
+    Args:
+        codec: CODEC_HAMMING (dos palabras de 12 bits cada 3 bytes) o CODEC_CRC
+        poly: Polinomio CRC (grado múltiplo de 8, de 8 a 32) para CODEC_CRC
+        trama: Bytes de datos por trama para CODEC_CRC
+    """
+    if codec == CODEC_CRC:
+        _validar_tramas(poly, trama)
+    inicio = time.perf_counter()
+    f_in, m_in, longitud = _mapear_entrada(entrada)
+    tamano = tamano_codificado(longitud, codec, poly, trama)
+    f_out, m_out = _crear_salida(salida, tamano)
+    try:
+        CABECERA.pack_into(m_out, 0, MAGIA, VERSION, _IDS_CODEC[codec],
+                           trama if codec == CODEC_CRC else 0, poly, longitud)
+        if longitud:
+            datos = np.frombuffer(m_in, dtype=np.uint8)
+            destino = np.frombuffer(m_out, dtype=np.uint8, offset=CABECERA.size)
+            if codec == CODEC_HAMMING:
+                _codificar_hamming(datos, destino)
+            else:
+                _codificar_tramas(datos, destino, poly, trama)
+            del datos, destino
+        m_out.flush()
+    finally:
+        _cerrar(m_out)
+        f_out.close()
+        _cerrar(m_in)
+        f_in.close()
+    fin = time.perf_counter()
+    return Resultado(
+        total=longitud,
+        procesados=longitud,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=f"{codec}: {longitud} bytes -> {tamano} bytes",
+        overhead_bits=(tamano - CABECERA.size - longitud) * 8,
+    )
+
+
+def _codificar_hamming(datos: np.ndarray, destino: np.ndarray):
+    tabla_cod, _, _ = vectorizado.tablas_hamming_np()
+    for desde in range(0, len(datos), TAMANO_BLOQUE):
+        codigos = np.take(tabla_cod, datos[desde:desde + TAMANO_BLOQUE])
+        if len(codigos) % 2:
+            codigos = np.append(codigos, np.uint16(0))
+        empaquetar_hamming(codigos, destino[desde // 2 * 3:(desde + len(codigos)) // 2 * 3])
+
+
+def _bloques_de_tramas(longitud: int, trama: int):
+    """Genera (primera trama, número de tramas, bytes de datos por trama) por bloque de trabajo."""
+    por_bloque = max(1, TAMANO_BLOQUE // trama)
+    n_completas = longitud // trama
+    for t0 in range(0, n_completas, por_bloque):
+        yield t0, min(por_bloque, n_completas - t0), trama
+    resto = longitud - n_completas * trama
+    if resto:
+        yield n_completas, 1, resto
+
+
+def _codificar_tramas(datos: np.ndarray, destino: np.ndarray, poly: int, trama: int):
+    k = (poly.bit_length() - 1) // 8
+    for t0, n, largo in _bloques_de_tramas(len(datos), trama):
+        tramas = datos[t0 * trama:t0 * trama + n * largo].reshape(n, largo)
+        salida = destino[t0 * (trama + k):t0 * (trama + k) + n * (largo + k)].reshape(n, largo + k)
+        _escribir_tramas(tramas, salida, poly, k)
+
+
+def _escribir_tramas(tramas: np.ndarray, salida: np.ndarray, poly: int, k: int):
+    """Copia las tramas a `salida` (una fila por trama) seguidas de su CRC big-endian de `k` bytes."""
+    salida[:, :-k] = tramas
+    crc = vectorizado.crc_tramas(tramas, poly)
+    for i in range(k):
+        salida[:, -k + i] = (crc >> (8 * (k - 1 - i))) & 0xFF
+
+
+def leer_cabecera(ruta: str) -> dict:
+    """Lee la cabecera de un archivo codificado con `codificar_archivo`."""
+    with open(ruta, 'rb') as f:
+        crudo = f.read(CABECERA.size)
+    if len(crudo) < CABECERA.size:
+        raise ValueError(f"{ruta}: archivo demasiado corto para ser un archivo codificado")
+    magia, version, codec, trama, poly, longitud = CABECERA.unpack(crudo)
+    if magia != MAGIA or version != VERSION:
+        raise ValueError(f"{ruta}: no es un archivo codificado por este simulador")
+    if codec not in _CODECS_POR_ID:
+        raise ValueError(f"{ruta}: codec desconocido en la cabecera ({codec})")
+    if _CODECS_POR_ID[codec] == CODEC_CRC:
+        try:
+            _validar_tramas(poly, trama)
+        except ValueError as e:
+            raise ValueError(f"{ruta}: cabecera corrupta: {e}") from None
+    return {'codec': _CODECS_POR_ID[codec], 'trama': trama, 'poly': poly, 'longitud': longitud}
+
+
+def decodificar_archivo(entrada: str, salida: str) -> Resultado:
+    """Decodifica un archivo de `codificar_archivo` y escribe los datos originales.
+
+    Hamming corrige los errores de un bit por palabra (corregidos / no_corregibles
+    cuentan palabras). CRC verifica cada trama (detectados cuenta tramas con error);
+    los datos de las tramas erróneas se copian igualmente.
+    """
+    cabecera = leer_cabecera(entrada)
+    codec, trama, poly, longitud = cabecera['codec'], cabecera['trama'], cabecera['poly'], cabecera['longitud']
+    inicio = time.perf_counter()
+    f_in, m_in, tamano = _mapear_entrada(entrada)
+    f_out = m_out = None
+    contadores = {'corregidos': 0, 'no_corregibles': 0, 'detectados': 0, 'tramas': 0}
+    try:
+        if tamano != tamano_codificado(longitud, codec, poly, trama):
+            raise ValueError(f"{entrada}: tamaño inconsistente con la cabecera")
+        if longitud == 0:
+            f_out = open(salida, 'wb')
+        else:
+            f_out, m_out = _crear_salida(salida, longitud)
+            origen = np.frombuffer(m_in, dtype=np.uint8, offset=CABECERA.size)
+            destino = np.frombuffer(m_out, dtype=np.uint8)
+            if codec == CODEC_HAMMING:
+                _decodificar_hamming(origen, destino, contadores)
+            else:
+                _decodificar_tramas(origen, destino, poly, trama, contadores)
+            del origen, destino
+            m_out.flush()
+    finally:
+        _cerrar(m_out)
+        if f_out is not None:
+            f_out.close()
+        _cerrar(m_in)
+        f_in.close()
+    corregidos, no_corregibles = contadores['corregidos'], contadores['no_corregibles']
+    detectados, n_tramas = contadores['detectados'], contadores['tramas']
+    fin = time.perf_counter()
+    if codec == CODEC_HAMMING:
+        metrica = f"corregidos: {corregidos}, no_corregibles: {no_corregibles}"
+    else:
+        metrica = f"tramas con error: {detectados}/{n_tramas}"
+    return Resultado(
+        total=longitud,
+        procesados=longitud,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=metrica,
+        detectados=detectados,
+        corregidos=corregidos,
+        no_corregibles=no_corregibles,
+        overhead_bits=(tamano - CABECERA.size - longitud) * 8,
+    )
+
+
+def _decodificar_hamming(origen: np.ndarray, destino: np.ndarray, contadores: dict):
+    _, tabla_datos, tabla_estado = vectorizado.tablas_hamming_np()
+    longitud = len(destino)
+    for desde in range(0, longitud, TAMANO_BLOQUE):
+        hasta = min(longitud, desde + TAMANO_BLOQUE)
+        codigos = desempaquetar_hamming(origen[desde // 2 * 3:(hasta + 1) // 2 * 3])[:hasta - desde]
+        destino[desde:hasta] = np.take(tabla_datos, codigos)
+        estados = np.take(tabla_estado, codigos)
+        contadores['corregidos'] += int(np.count_nonzero(estados == vectorizado.ESTADO_CORREGIDO))
+        contadores['no_corregibles'] += int(np.count_nonzero(estados == vectorizado.ESTADO_NO_CORREGIBLE))
+
+
+def _decodificar_tramas(origen: np.ndarray, destino: np.ndarray, poly: int, trama: int, contadores: dict):
+    k = (poly.bit_length() - 1) // 8
+    for t0, n, largo in _bloques_de_tramas(len(destino), trama):
+        recibidas = origen[t0 * (trama + k):t0 * (trama + k) + n * (largo + k)].reshape(n, largo + k)
+        destino[t0 * trama:t0 * trama + n * largo].reshape(n, largo)[:] = recibidas[:, :largo]
+        # El CRC de datos+CRC es 0 en las tramas sin error detectable
+        contadores['detectados'] += int(np.count_nonzero(vectorizado.crc_tramas(recibidas, poly)))
+        contadores['tramas'] += n
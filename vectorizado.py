@@ -0,0 +1,260 @@
+"""
+Pipeline vectorizado con NumPy para la simulación CRC vs Hamming
+Procesa todo `bytes_data` como un arreglo uint8: codificación, máscaras de error
+(canal.FuenteMascaras), inyección por XOR y decodificación por tabla se hacen como
+operaciones de arreglo
+"""
+import functools
+import threading
+import time
+
+import numpy as np
+
+import canal
+import index
+from canal import tipo_para_ancho
+from index import Resultado, POLINOMIO_CRC, TIPO_ERROR_UN_BIT
+import modelos_crc
+from modelos_crc import TAMANO_CACHE_TABLAS
+
+# Códigos de estado de la tabla de decodificación vectorizada
+ESTADO_OK = 0
+ESTADO_CORREGIDO = 1
+ESTADO_NO_CORREGIBLE = 2
+_CODIGOS_ESTADO = {'ok': ESTADO_OK, 'corregido': ESTADO_CORREGIDO, 'no_corregible': ESTADO_NO_CORREGIBLE}
+# Tramas desde las que `crc_tramas` usa la rutina en C por trama en lugar de recorrer columnas
+BYTES_TRAMA_KERNEL_C = 512
+# Con menos filas que FILAS_CRC_TRAMAS, `crc_tramas` parte las tramas en tramos de al menos
+# BYTES_TRAMO_MINIMO bytes (más filas, menos columnas que recorrer)
+FILAS_CRC_TRAMAS = 4096
+BYTES_TRAMO_MINIMO = 64
+
+_tablas_hamming_np = None
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def tabla_crc_np(poly: int) -> np.ndarray:
+    """Tabla de 256 entradas con el CRC de cada byte, como arreglo NumPy (caché LRU)."""
+    degree = poly.bit_length() - 1
+    valores = [index.calcular_crc(b, poly=poly) for b in range(256)]
+    return np.array(valores, dtype=tipo_para_ancho(8 + degree))
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def tabla_crc_mensaje_np(poly: int) -> np.ndarray:
+    """Tabla byte a byte de `index.crc_mensaje` (grado 8..32) como arreglo NumPy (caché LRU)."""
+    degree = poly.bit_length() - 1
+    return np.array(index.obtener_tabla_crc(poly), dtype=tipo_para_ancho(degree + 8))
+
+
+@functools.lru_cache(maxsize=TAMANO_CACHE_TABLAS)
+def tablas_desplazamiento_np(poly: int, n_bytes: int) -> np.ndarray:
+    """Tablas (bytes del CRC, 256) de r -> r·x^(8·n_bytes) mod g, una por byte de r (caché LRU).
+
+    Es el registro tras pasar `n_bytes` bytes a cero; como es lineal en r, basta
+    calcularlo para cada bit y combinar por XOR.
+    """
+    degree = poly.bit_length() - 1
+    tipo = tabla_crc_mensaje_np(poly).dtype.type
+    ceros = bytes(n_bytes)
+    base = [index.crc_mensaje(ceros, poly, crc_inicial=1 << j) for j in range(degree)]
+    valores = np.arange(256)
+    tablas = np.zeros((-(-degree // 8), 256), dtype=tipo)
+    for j, desplazado in enumerate(base):
+        tablas[j // 8] ^= np.where((valores >> (j % 8)) & 1, desplazado, 0).astype(tipo)
+    return tablas
+
+
+def _crc_columnas(tramas: np.ndarray, tabla: np.ndarray, degree: int, crc: np.ndarray) -> np.ndarray:
+    """Avanza el registro `crc` de cada fila sobre sus bytes, una columna por operación."""
+    tipo = tabla.dtype.type
+    mascara = tipo((1 << degree) - 1)
+    desplazamiento = tipo(degree - 8)
+    for columna in tramas.T:
+        crc = ((crc << tipo(8)) & mascara) ^ np.take(tabla, (crc >> desplazamiento) ^ columna)
+    return crc
+
+
+def crc_tramas(tramas: np.ndarray, poly: int, crc_inicial: int = 0) -> np.ndarray:
+    """CRC de cada fila de `tramas` (matriz uint8, una trama por fila) a la vez.
+
+    Recorre las columnas (posiciones de byte) y avanza el registro de todas las
+    tramas con una operación de arreglo por byte: el coste en Python es
+    proporcional a la longitud de trama, no al número de tramas. Mismo resultado
+    que `index.crc_mensaje` aplicado fila a fila. Con tramas largas y un polinomio
+    con rutina en C (index.backend_crc_mensaje) se calcula el CRC del mensaje de
+    cada fila, que entonces es más rápido. Con tramas largas y pocas filas cada
+    trama se parte en tramos que se calculan como filas aparte y se combinan:
+    crc(A·B) = crc(A)·x^(8|B|) mod g XOR crc(B).
+    """
+    degree = poly.bit_length() - 1
+    if not 8 <= degree <= 32:
+        raise ValueError("crc_tramas requiere un polinomio de grado 8 a 32")
+    tabla = tabla_crc_mensaje_np(poly)
+    tipo = tabla.dtype.type
+    n, largo = tramas.shape
+    if (largo >= BYTES_TRAMA_KERNEL_C and tramas.strides[1] == 1
+            and index.backend_crc_mensaje(poly) != modelos_crc.BACKEND_PYTHON):
+        return np.array([index.crc_mensaje(fila, poly, crc_inicial) for fila in tramas], dtype=tipo)
+    crc = np.full(n, crc_inicial, dtype=tipo)
+    tramos = min(largo // BYTES_TRAMO_MINIMO, FILAS_CRC_TRAMAS // max(n, 1))
+    if tramos < 2:
+        return _crc_columnas(tramas, tabla, degree, crc)
+    # Los bytes que no llenan un tramo van al principio, antes que los tramos
+    bytes_tramo = largo // tramos
+    resto = largo - tramos * bytes_tramo
+    crc = _crc_columnas(tramas[:, :resto], tabla, degree, crc)
+    parciales = _crc_columnas(tramas[:, resto:].reshape(n * tramos, bytes_tramo), tabla, degree,
+                              np.zeros(n * tramos, dtype=tipo)).reshape(n, tramos)
+    desplazar = tablas_desplazamiento_np(poly, bytes_tramo)
+    for j in range(tramos):
+        siguiente = parciales[:, j]
+        for i, tabla_byte in enumerate(desplazar):
+            siguiente = siguiente ^ np.take(tabla_byte, (crc >> tipo(8 * i)) & tipo(0xFF))
+        crc = siguiente
+    return crc
+
+
+def tablas_hamming_np() -> tuple:
+    """Tablas NumPy de Hamming(12,8): (codificación[256], datos[4096], estado[4096])."""
+    global _tablas_hamming_np
+    if _tablas_hamming_np is None:
+        cod = np.array(index.tabla_codificacion_hamming(), dtype=np.uint16)
+        dec = index.tabla_decodificacion_hamming()
+        datos = np.array([d for _, d, _ in dec], dtype=np.uint8)
+        estado = np.array([_CODIGOS_ESTADO[s] for _, _, s in dec], dtype=np.uint8)
+        _tablas_hamming_np = (cod, datos, estado)
+    return _tablas_hamming_np
+
+
+def procesar_crc_lote(bytes_data: bytes, estado: dict = None, lock: threading.Lock = None,
+                      poly: int = POLINOMIO_CRC, tipo_error: str = TIPO_ERROR_UN_BIT,
+                      semilla: int = None, parametros_canal=None, indice_inicial: int = 0,
+                      perfil: bool = False, intercalador=None, tamano_fragmento: int = None) -> Resultado:
+    """Versión vectorizada de `index.procesar_crc`: mismo modelo, mismo `Resultado`.
+
+    Con la misma `semilla` (e `indice_inicial`, el fragmento de la entrada en que
+    empieza `bytes_data`) produce los mismos contadores que el motor escalar.
+    Con `perfil` mide cada etapa por bloque (`Resultado.perfil`). `tamano_fragmento`
+    es el de la partición común (None = index.TAMANO_FRAGMENTO).
+    """
+    degree = poly.bit_length() - 1
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    tabla = tabla_crc_np(poly)
+    tipo = tabla.dtype.type
+    mascara_crc = tipo((1 << degree) - 1)
+    reportador = index.ReportadorProgreso(estado, lock, 'crc') if estado is not None else None
+    medicion = index.PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+    inicio = marca = time.perf_counter()
+    datos = np.frombuffer(bytes_data, dtype=np.uint8)
+    total = len(datos)
+    detectados = no_detectados = falsos_positivos = 0
+
+    desde = 0
+    # Los bloques de máscaras marcan el tamaño de bloque (acotan la memoria temporal y el progreso)
+    for mascaras in canal.bloques_mascaras(tipo_error, 8 + degree, total, canal.CODEC_CRC, semilla,
+                                           parametros_canal, indice_inicial, intercalador, tamano_fragmento):
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca, llamadas=0)  # generar las máscaras
+        bloque = datos[desde:desde + len(mascaras)]
+        desde += len(bloque)
+        # Codificar: datos desplazados + CRC de cada byte
+        paquetes = (bloque.astype(tipo) << tipo(degree)) | np.take(tabla, bloque)
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CODIFICAR, marca)
+        # Canal
+        recibidos = paquetes ^ mascaras
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca)
+        # Verificar: recalcular el CRC de los datos recibidos y comparar
+        crc_detecta = np.take(tabla, recibidos >> tipo(degree)) != (recibidos & mascara_crc)
+        tiene_error = mascaras != 0
+        det = int(np.count_nonzero(crc_detecta & tiene_error))
+        detectados += det
+        no_detectados += int(np.count_nonzero(tiene_error)) - det
+        falsos_positivos += int(np.count_nonzero(crc_detecta & ~tiene_error))
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_DECODIFICAR, marca)
+        if reportador is not None and desde >= reportador.proximo:
+            reportador.publicar(desde, detectados=detectados, no_detectados=no_detectados)
+            if medicion is not None:
+                marca = medicion.sumar(index.ETAPA_PROGRESO, marca)
+
+    if reportador is not None:
+        reportador.publicar(total, detectados=detectados, no_detectados=no_detectados)
+    fin = time.perf_counter()
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
+    return Resultado(
+        total=total,
+        procesados=total,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=f"detectados: {detectados}, no detectados: {no_detectados}",
+        detectados=detectados,
+        no_detectados=no_detectados,
+        falsos_positivos=falsos_positivos,
+        overhead_bits=total * degree,
+        perfil=medicion
+    )
+
+
+def procesar_hamming_lote(bytes_data: bytes, estado: dict = None, lock: threading.Lock = None,
+                          tipo_error: str = TIPO_ERROR_UN_BIT,
+                          semilla: int = None, parametros_canal=None, indice_inicial: int = 0,
+                          perfil: bool = False, intercalador=None, tamano_fragmento: int = None) -> Resultado:
+    """Versión vectorizada de `index.procesar_hamming`: mismo modelo, mismo `Resultado`."""
+    semilla = semilla if semilla is not None else canal.semilla_aleatoria()
+    tabla_cod, _, tabla_estado = tablas_hamming_np()
+    reportador = index.ReportadorProgreso(estado, lock, 'ham') if estado is not None else None
+    medicion = index.PerfilEtapas() if perfil else None
+    cpu_inicio = time.thread_time()
+    inicio = marca = time.perf_counter()
+    datos = np.frombuffer(bytes_data, dtype=np.uint8)
+    total = len(datos)
+    corregidos = no_corregibles = correctos = 0
+
+    desde = 0
+    for mascaras in canal.bloques_mascaras(tipo_error, 12, total, canal.CODEC_HAMMING, semilla, parametros_canal,
+                                           indice_inicial, intercalador, tamano_fragmento):
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca, llamadas=0)
+        bloque = datos[desde:desde + len(mascaras)]
+        desde += len(bloque)
+        codigos = np.take(tabla_cod, bloque)
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CODIFICAR, marca)
+        recibidos = codigos ^ mascaras
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_CANAL, marca)
+        estados = np.take(tabla_estado, recibidos)
+        cor = int(np.count_nonzero(estados == ESTADO_CORREGIDO))
+        no_cor = int(np.count_nonzero(estados == ESTADO_NO_CORREGIBLE))
+        corregidos += cor
+        no_corregibles += no_cor
+        correctos += len(bloque) - cor - no_cor
+        if medicion is not None:
+            marca = medicion.sumar(index.ETAPA_DECODIFICAR, marca)
+        if reportador is not None and desde >= reportador.proximo:
+            reportador.publicar(desde, corregidos=corregidos,
+                                no_corregibles=no_corregibles, correctos=correctos)
+            if medicion is not None:
+                marca = medicion.sumar(index.ETAPA_PROGRESO, marca)
+
+    if reportador is not None:
+        reportador.publicar(total, corregidos=corregidos, no_corregibles=no_corregibles, correctos=correctos)
+    fin = time.perf_counter()
+    if medicion is not None:
+        medicion.cpu_ms = (time.thread_time() - cpu_inicio) * 1000.0
+        medicion.pared_ms = (fin - inicio) * 1000.0
+    return Resultado(
+        total=total,
+        procesados=total,
+        tiempo_ms=(fin - inicio) * 1000.0,
+        metrica=f"corregidos: {corregidos}, no_corregibles: {no_corregibles}",
+        corregidos=corregidos,
+        no_corregibles=no_corregibles,
+        overhead_bits=total * 4,
+        perfil=medicion
+    )
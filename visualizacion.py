@@ -147,3 +147,54 @@ def mostrar_graficos_comparativos(parent, resultado_crc, resultado_ham):
     ventana = VentanaGraficos(parent, resultado_crc, resultado_ham)
     ventana.transient(parent)
     ventana.grab_set()
+
+
+def crear_figura_barrido(filas):
+    """Crea la figura de un barrido BER (filas de `canal.barrido_bsc` o `canal.cargar_barrido`)."""
+    p = [fila['p'] for fila in filas]
+    fig = Figure(figsize=(9, 7), dpi=100)
+    
+    # 1. Errores residuales frente a p (escala log-log; los ceros no se dibujan)
+    ax1 = fig.add_subplot(2, 1, 1)
+    ax1.loglog(p, [fila['crc_ber_residual'] or np.nan for fila in filas], 'o-',
+               color='#3498db', label='CRC: BER residual (no detectado)')
+    ax1.loglog(p, [fila['crc_tasa_no_detectado'] or np.nan for fila in filas], 's--',
+               color='#3498db', alpha=0.6, label='CRC: palabras no detectadas')
+    ax1.loglog(p, [fila['ham_ber_residual'] or np.nan for fila in filas], 'o-',
+               color='#e74c3c', label='Hamming: BER residual')
+    ax1.loglog(p, p, ':', color='gray', label='Sin codificar (BER = p)')
+    ax1.set_xlabel('Probabilidad de error de bit p', fontweight='bold')
+    ax1.set_ylabel('Tasa', fontweight='bold')
+    ax1.set_title('Errores residuales en canal BSC', fontweight='bold', pad=10)
+    ax1.grid(which='both', alpha=0.3)
+    ax1.legend(fontsize=8)
+    
+    # 2. Goodput (bits útiles entregados / bits transmitidos)
+    ax2 = fig.add_subplot(2, 1, 2)
+    ax2.semilogx(p, [fila['crc_goodput'] for fila in filas], 'o-', color='#3498db', label='CRC')
+    ax2.semilogx(p, [fila['ham_goodput'] for fila in filas], 'o-', color='#e74c3c', label='Hamming (12,8)')
+    ax2.set_xlabel('Probabilidad de error de bit p', fontweight='bold')
+    ax2.set_ylabel('Goodput', fontweight='bold')
+    ax2.set_title('Goodput', fontweight='bold', pad=10)
+    ax2.set_ylim([0, 1])
+    ax2.grid(which='both', alpha=0.3)
+    ax2.legend()
+    
+    fig.tight_layout(pad=2.0)
+    return fig
+
+
+def guardar_grafico_barrido(filas, ruta):
+    """Guarda la figura del barrido en un archivo de imagen (PNG, SVG, PDF...)."""
+    crear_figura_barrido(filas).savefig(ruta)
+
+
+def mostrar_barrido(parent, filas):
+    """Muestra la figura del barrido en una ventana secundaria."""
+    ventana = tk.Toplevel(parent)
+    ventana.title("Barrido BER - Canal BSC")
+    ventana.geometry("900x700")
+    canvas = FigureCanvasTkAgg(crear_figura_barrido(filas), master=ventana)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    ventana.transient(parent)